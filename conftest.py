@@ -0,0 +1,9 @@
+import os
+import sys
+
+# old/ and demos/ hold scripts that hit the network when imported, not tests
+collect_ignore = ["old", "demos"]
+
+# custom_magentic_one/ is run from its own directory (python main.py), so its modules import
+# each other by top-level name; appended so they never shadow the modules at the root
+sys.path.append(os.path.join(os.path.dirname(__file__), "custom_magentic_one"))
@@ -0,0 +1,130 @@
+import logging
+from typing import List
+
+from autogen_core import CancellationToken, TRACE_LOGGER_NAME
+from autogen_core.models import ChatCompletionClient, LLMMessage, UserMessage
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+DEFAULT_MAX_CONTEXT_TOKENS = 24000
+DEFAULT_KEEP_RECENT_MESSAGES = 8
+# A summary brings the context down to this fraction of the budget, so the next one is not
+# due again one message later
+DEFAULT_LOW_WATER = 0.75
+
+SUMMARY_PROMPT = """We are working on the following task with a team of agents. Below is a summary of the earlier conversation, followed by the messages that came after it.
+
+Write an updated summary of the whole conversation so far. Keep every fact, decision, user preference and open question (places, dates, spots, surf conditions, numbers), and drop pleasantries and repetition. Answer with the summary only.
+
+Summary so far:
+{summary}
+
+Later messages:
+{messages}
+"""
+
+
+class ContextBudget:
+    """Keeps a growing model context under a token budget with a rolling summary.
+
+    The context passed to :meth:`fit` must only grow between calls (as the orchestrator's cached
+    context does) until :meth:`reset`. Each message is counted once, when first seen. Once the
+    context is over budget, the messages between the pinned head (the task ledger) and the latest
+    ones are folded into a summary, bringing it down to ``low_water`` of the budget: up to
+    ``keep_recent`` latest messages are kept, fewer if they do not fit, and always the last one.
+    The summary is only ever extended with newly folded messages, never rebuilt.
+
+    A summary is only requested when it frees at least the gap between the budget and the
+    low-water mark. When the head, the summary and the last message alone are over budget, the
+    context stays over it instead of costing a summary on every step.
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        name: str,
+        max_tokens: int = DEFAULT_MAX_CONTEXT_TOKENS,
+        keep_recent: int = DEFAULT_KEEP_RECENT_MESSAGES,
+        pinned: int = 1,
+        low_water: float = DEFAULT_LOW_WATER,
+    ):
+        self._model_client = model_client
+        self._name = name
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.pinned = pinned
+        self.low_water = low_water
+        self.summaries = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the counted messages and the summary, e.g. when the context was rebuilt."""
+        self._counts: List[int] = []
+        self._total_tokens = 0
+        self._folded_tokens = 0
+        self._summarized = self.pinned
+        self._summary = ""
+        self._summary_tokens = 0
+
+    @property
+    def tokens(self) -> int:
+        """Tokens of the context as returned by the last :meth:`fit`."""
+        return self._total_tokens - self._folded_tokens + self._summary_tokens
+
+    def _count(self, message: LLMMessage) -> int:
+        try:
+            return self._model_client.count_tokens([message])
+        except Exception:
+            # Clients without a tokenizer: about four characters per token
+            return len(str(message.content)) // 4 + 1
+
+    async def fit(
+        self, context: List[LLMMessage], cancellation_token: CancellationToken | None = None
+    ) -> List[LLMMessage]:
+        """Return the context with older turns replaced by the rolling summary if it is over budget."""
+        for message in context[len(self._counts) :]:
+            count = self._count(message)
+            self._counts.append(count)
+            self._total_tokens += count
+
+        low_water_tokens = int(self.max_tokens * self.low_water)
+        cut = self._cut(len(context), low_water_tokens)
+        if (
+            self.tokens > self.max_tokens
+            and cut > self._summarized
+            and sum(self._counts[self._summarized : cut]) >= self.max_tokens - low_water_tokens
+        ):
+            folded = context[self._summarized : cut]
+            self._summary = await self._summarize(folded, cancellation_token)
+            self._summary_tokens = self._count(UserMessage(content=self._summary, source=self._name))
+            self._folded_tokens += sum(self._counts[self._summarized : cut])
+            self._summarized = cut
+            self.summaries += 1
+            trace_logger.debug(f"Folded {len(folded)} messages into the summary; context is now {self.tokens} tokens.")
+
+        if not self._summary:
+            return context
+        summary = UserMessage(content=f"Summary of the earlier conversation:\n{self._summary}", source=self._name)
+        return [*context[: self.pinned], summary, *context[self._summarized :]]
+
+    def _cut(self, length: int, low_water_tokens: int) -> int:
+        # Start of the latest messages that fit under the low-water mark next to the head and
+        # the summary; the last message is kept even if it does not
+        if length <= self._summarized:
+            return self._summarized
+        budget = low_water_tokens - sum(self._counts[: self.pinned]) - self._summary_tokens
+        cut = length - 1
+        budget -= self._counts[cut]
+        while cut > self._summarized and length - cut < self.keep_recent and self._counts[cut - 1] <= budget:
+            cut -= 1
+            budget -= self._counts[cut]
+        return cut
+
+    async def _summarize(self, messages: List[LLMMessage], cancellation_token: CancellationToken | None) -> str:
+        transcript = "\n\n".join(f"{getattr(m, 'source', 'user')}: {m.content}" for m in messages)
+        prompt = SUMMARY_PROMPT.format(summary=self._summary or "(none)", messages=transcript)
+        response = await self._model_client.create(
+            [UserMessage(content=prompt, source=self._name)], cancellation_token=cancellation_token
+        )
+        assert isinstance(response.content, str)
+        return response.content
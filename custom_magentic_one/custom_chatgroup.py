@@ -12,7 +12,9 @@ from autogen_agentchat.base import ChatAgent, TerminationCondition
 from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, MessageFactory
 from autogen_agentchat.teams._group_chat._base_group_chat import BaseGroupChat
 from autogen_agentchat.teams._group_chat._events import GroupChatTermination
+from context_budget import DEFAULT_KEEP_RECENT_MESSAGES, DEFAULT_MAX_CONTEXT_TOKENS
 from custom_orchaster import MagenticOneOrchestrator
+from speaker_selection import RuleBasedSpeakerSelector
 from autogen_agentchat.teams._group_chat._magentic_one._prompts import ORCHESTRATOR_FINAL_ANSWER_PROMPT
 
 trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
@@ -28,6 +30,9 @@ class MagenticOneGroupChatConfig(BaseModel):
     max_turns: int | None = None
     max_stalls: int
     final_answer_prompt: str
+    max_context_tokens: int | None = DEFAULT_MAX_CONTEXT_TOKENS
+    keep_recent_messages: int = DEFAULT_KEEP_RECENT_MESSAGES
+    parallel_planning: bool = False
 
 
 class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig]):
@@ -46,6 +51,10 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
         max_turns (int, optional): The maximum number of turns in the group chat before stopping. Defaults to 20.
         max_stalls (int, optional): The maximum number of stalls allowed before re-planning. Defaults to 3.
         final_answer_prompt (str, optional): The LLM prompt used to generate the final answer or response from the team's transcript. A default (sensible for GPT-4o class models) is provided.
+        max_context_tokens (int, optional): Token budget for the conversation sent to the orchestrator's model. Above it, older turns are replaced with a rolling summary. None disables the budget. Defaults to 24000.
+        keep_recent_messages (int, optional): Number of latest messages always sent verbatim. Defaults to 8.
+        speaker_selector (RuleBasedSpeakerSelector, optional): Decides the next speaker and instruction without the progress-ledger model call when one of its rules is confident. Not part of the declarative config. Defaults to None.
+        parallel_planning (bool, optional): Draft the plan from the task alone while the facts are gathered, then keep it unless the facts change it. Defaults to False.
 
     Raises:
         ValueError: In orchestration logic if progress ledger does not have required keys or if next speaker is not valid.
@@ -103,6 +112,10 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
         runtime: AgentRuntime | None = None,
         max_stalls: int = 3,
         final_answer_prompt: str = ORCHESTRATOR_FINAL_ANSWER_PROMPT,
+        max_context_tokens: int | None = DEFAULT_MAX_CONTEXT_TOKENS,
+        keep_recent_messages: int = DEFAULT_KEEP_RECENT_MESSAGES,
+        speaker_selector: RuleBasedSpeakerSelector | None = None,
+        parallel_planning: bool = False,
     ):
         super().__init__(
             participants,
@@ -119,6 +132,10 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
         self._model_client = model_client
         self._max_stalls = max_stalls
         self._final_answer_prompt = final_answer_prompt
+        self._max_context_tokens = max_context_tokens
+        self._keep_recent_messages = keep_recent_messages
+        self._speaker_selector = speaker_selector
+        self._parallel_planning = parallel_planning
 
     def _create_group_chat_manager_factory(
         self,
@@ -147,6 +164,10 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
             self._final_answer_prompt,
             output_message_queue,
             termination_condition,
+            self._max_context_tokens,
+            self._keep_recent_messages,
+            self._speaker_selector,
+            self._parallel_planning,
         )
 
     def _to_config(self) -> MagenticOneGroupChatConfig:
@@ -159,6 +180,9 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
             max_turns=self._max_turns,
             max_stalls=self._max_stalls,
             final_answer_prompt=self._final_answer_prompt,
+            max_context_tokens=self._max_context_tokens,
+            keep_recent_messages=self._keep_recent_messages,
+            parallel_planning=self._parallel_planning,
         )
 
     @classmethod
@@ -175,4 +199,7 @@ class MagenticOneGroupChat(BaseGroupChat, Component[MagenticOneGroupChatConfig])
             max_turns=config.max_turns,
             max_stalls=config.max_stalls,
             final_answer_prompt=config.final_answer_prompt,
+            max_context_tokens=config.max_context_tokens,
+            keep_recent_messages=config.keep_recent_messages,
+            parallel_planning=config.parallel_planning,
         )
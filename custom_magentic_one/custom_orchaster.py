@@ -1,7 +1,7 @@
 import asyncio
-import json
 import logging
 import re
+import time
 from typing import Any, Dict, List, Mapping
 
 from autogen_core import AgentId, CancellationToken, DefaultTopicId, MessageContext, event, rpc
@@ -12,7 +12,7 @@ from autogen_core.models import (
     UserMessage,
 )
 
-from autogen_core import TRACE_LOGGER_NAME
+from autogen_core import EVENT_LOGGER_NAME, TRACE_LOGGER_NAME
 from autogen_agentchat.base import Response, TerminationCondition
 from autogen_agentchat.messages import (
     BaseAgentEvent,
@@ -47,7 +47,13 @@ from autogen_agentchat.teams._group_chat._magentic_one._prompts import (
     ORCHESTRATOR_TASK_LEDGER_PLAN_UPDATE_PROMPT,
 )
 
+from context_budget import DEFAULT_KEEP_RECENT_MESSAGES, DEFAULT_MAX_CONTEXT_TOKENS, ContextBudget
+from progress_ledger import LedgerBool, LedgerParseError, LedgerStr, ProgressLedger, parse_progress_ledger
+from speaker_selection import RuleBasedSpeakerSelector
+from speculative_planning import KEEP_PLAN, PLAN_CHECK_PROMPT, SPECULATIVE_PLAN_PROMPT, plan_needs_check, revised_plan
+
 trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+event_logger = logging.getLogger(EVENT_LOGGER_NAME)
 
 
 class MagenticOneOrchestrator(BaseGroupChatManager):
@@ -68,6 +74,10 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
         final_answer_prompt: str,
         output_message_queue: asyncio.Queue[BaseAgentEvent | BaseChatMessage | GroupChatTermination],
         termination_condition: TerminationCondition | None,
+        max_context_tokens: int | None = DEFAULT_MAX_CONTEXT_TOKENS,
+        keep_recent_messages: int = DEFAULT_KEEP_RECENT_MESSAGES,
+        speaker_selector: RuleBasedSpeakerSelector | None = None,
+        parallel_planning: bool = False,
     ):
         super().__init__(
             name,
@@ -85,11 +95,34 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
         self._max_stalls = max_stalls
         self._final_answer_prompt = final_answer_prompt
         self._max_json_retries = 10
+        # Progress-ledger model calls, and how many of them were retries after an unusable reply
+        self._ledger_calls = 0
+        self._ledger_retries = 0
+        # Progress ledgers the speaker selector decided locally, each one model call saved
+        self._speaker_selector = speaker_selector
+        self._ledger_calls_saved = 0
+        # Draft the plan alongside the facts instead of after them; see _reconcile_plan
+        self._parallel_planning = parallel_planning
+        self._plans_speculated = 0
+        self._plans_revised = 0
+        self._plan_checks_skipped = 0
+        # Wall time spent creating and updating the task ledger, either way, to compare the two
+        self._planning_seconds = 0.0
         self._task = ""
         self._facts = ""
         self._plan = ""
         self._n_rounds = 0
         self._n_stalls = 0
+        # Model context converted from the first _context_length messages of _message_thread,
+        # extended as the thread grows and dropped when it is cleared.
+        self._context: List[LLMMessage] = []
+        self._context_length = 0
+        # Folds older turns into a rolling summary once the context exceeds max_context_tokens
+        self._context_budget = (
+            None
+            if max_context_tokens is None
+            else ContextBudget(model_client, name, max_context_tokens, keep_recent_messages)
+        )
 
         # Produce a team description. Each agent sould appear on a single line.
         self._team_description = ""
@@ -121,6 +154,22 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
         else:
             return self._final_answer_prompt
 
+    @property
+    def ledger_metrics(self) -> Dict[str, int]:
+        """Progress-ledger model calls, retries, and calls saved by the speaker selector, since creation."""
+        return {"calls": self._ledger_calls, "retries": self._ledger_retries, "saved": self._ledger_calls_saved}
+
+    @property
+    def planning_metrics(self) -> Dict[str, int | float]:
+        """Plans drafted in parallel with the facts, how many the facts changed, how many were kept
+        without a check, and the seconds spent on task ledgers, since creation."""
+        return {
+            "speculated": self._plans_speculated,
+            "revised": self._plans_revised,
+            "checks_skipped": self._plan_checks_skipped,
+            "seconds": self._planning_seconds,
+        }
+
     async def _log_message(self, log_message: str) -> None:
         trace_logger.debug(log_message)
 
@@ -151,6 +200,19 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
         #################################
         # Combine all message contents for task
         self._task = " ".join([msg.to_model_text() for msg in message.messages])
+        started = time.perf_counter()
+        if self._parallel_planning:
+            await self._create_task_ledger_in_parallel(ctx.cancellation_token)
+        else:
+            await self._create_task_ledger(ctx.cancellation_token)
+        self._log_planning_latency("create", started)
+
+        # Kick things off
+        self._n_stalls = 0
+        await self._reenter_outer_loop(ctx.cancellation_token)
+
+    async def _create_task_ledger(self, cancellation_token: CancellationToken) -> None:
+        """Gather the facts, then plan based on them."""
         planning_conversation: List[LLMMessage] = []
 
         # 1. GATHER FACTS
@@ -159,7 +221,7 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
             UserMessage(content=self._get_task_ledger_facts_prompt(self._task), source=self._name)
         )
         response = await self._model_client.create(
-            self._get_compatible_context(planning_conversation), cancellation_token=ctx.cancellation_token
+            self._get_compatible_context(planning_conversation), cancellation_token=cancellation_token
         )
 
         assert isinstance(response.content, str)
@@ -172,16 +234,12 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
             UserMessage(content=self._get_task_ledger_plan_prompt(self._team_description), source=self._name)
         )
         response = await self._model_client.create(
-            self._get_compatible_context(planning_conversation), cancellation_token=ctx.cancellation_token
+            self._get_compatible_context(planning_conversation), cancellation_token=cancellation_token
         )
 
         assert isinstance(response.content, str)
         self._plan = response.content
 
-        # Kick things off
-        self._n_stalls = 0
-        await self._reenter_outer_loop(ctx.cancellation_token)
-
     @event
     async def handle_agent_response(self, message: GroupChatAgentResponse, ctx: MessageContext) -> None:  # type: ignore
         delta: List[BaseAgentEvent | BaseChatMessage] = []
@@ -225,6 +283,7 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
         self._plan = orchestrator_state.plan
         self._n_rounds = orchestrator_state.n_rounds
         self._n_stalls = orchestrator_state.n_stalls
+        self._invalidate_context()
 
     async def select_speaker(self, thread: List[BaseAgentEvent | BaseChatMessage]) -> str:
         """Not used in this orchestrator, we select next speaker in _orchestrate_step."""
@@ -233,6 +292,9 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
     async def reset(self) -> None:
         """Reset the group chat manager."""
         self._message_thread.clear()
+        self._invalidate_context()
+        if self._speaker_selector is not None:
+            self._speaker_selector.reset()
         if self._termination_condition is not None:
             await self._termination_condition.reset()
         self._n_rounds = 0
@@ -252,6 +314,10 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
             )
         # Reset partially the group chat manager
         self._message_thread.clear()
+        self._invalidate_context()
+        # A new plan starts a new streak of locally decided steps
+        if self._speaker_selector is not None:
+            self._speaker_selector.reset()
 
         # Prepare the ledger
         ledger_message = TextMessage(
@@ -287,67 +353,11 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
             return
         self._n_rounds += 1
 
-        # Update the progress ledger
-        context = self._thread_to_context()
-
-        progress_ledger_prompt = self._get_progress_ledger_prompt(
-            self._task, self._team_description, self._participant_names
-        )
-        context.append(UserMessage(content=progress_ledger_prompt, source=self._name))
-        progress_ledger: Dict[str, Any] = {}
-        assert self._max_json_retries > 0
-        key_error: bool = False
-        for _ in range(self._max_json_retries):
-            response = await self._model_client.create(self._get_compatible_context(context), json_output=True)
-            ledger_str = response.content
-            try:
-                assert isinstance(ledger_str, str)
-                progress_ledger = json.loads(ledger_str)
-
-                # If the team consists of a single agent, deterministically set the next speaker
-                if len(self._participant_names) == 1:
-                    progress_ledger["next_speaker"] = {
-                        "reason": "The team consists of only one agent.",
-                        "answer": self._participant_names[0],
-                    }
-
-                # Validate the structure
-                required_keys = [
-                    "is_request_satisfied",
-                    "is_progress_being_made",
-                    "is_in_loop",
-                    "instruction_or_question",
-                    "next_speaker",
-                ]
-
-                key_error = False
-                for key in required_keys:
-                    if (
-                        key not in progress_ledger
-                        or not isinstance(progress_ledger[key], dict)
-                        or "answer" not in progress_ledger[key]
-                        or "reason" not in progress_ledger[key]
-                    ):
-                        key_error = True
-                        break
-
-                # Validate the next speaker if the task is not yet complete
-                if (
-                    not progress_ledger["is_request_satisfied"]["answer"]
-                    and progress_ledger["next_speaker"]["answer"] not in self._participant_names
-                ):
-                    key_error = True
-                    break
-
-                if not key_error:
-                    break
-                await self._log_message(f"Failed to parse ledger information, retrying: {ledger_str}")
-            except (json.JSONDecodeError, TypeError):
-                key_error = True
-                await self._log_message("Invalid ledger format encountered, retrying...")
-                continue
-        if key_error:
-            raise ValueError("Failed to parse ledger information after multiple retries.")
+        # Update the progress ledger, locally when the speaker selector is confident
+        progress_ledger = self._preselected_ledger()
+        preselected = progress_ledger is not None
+        if progress_ledger is None:
+            progress_ledger = await self._progress_ledger(cancellation_token)
         await self._log_message(f"Progress Ledger: {progress_ledger}")
 
         # Check for task completion
@@ -356,13 +366,16 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
             await self._prepare_final_answer(progress_ledger["is_request_satisfied"]["reason"], cancellation_token)
             return
 
-        # Check for stalling
-        if not progress_ledger["is_progress_being_made"]["answer"]:
-            self._n_stalls += 1
-        elif progress_ledger["is_in_loop"]["answer"]:
-            self._n_stalls += 1
-        else:
-            self._n_stalls = max(0, self._n_stalls - 1)
+        # Check for stalling. A locally decided step says nothing about progress, so only the
+        # model's assessments move the stall count; otherwise the selector's streaks would keep
+        # it from ever reaching max_stalls
+        if not preselected:
+            if not progress_ledger["is_progress_being_made"]["answer"]:
+                self._n_stalls += 1
+            elif progress_ledger["is_in_loop"]["answer"]:
+                self._n_stalls += 1
+            else:
+                self._n_stalls = max(0, self._n_stalls - 1)
 
         # Too much stalling
         if self._n_stalls >= self._max_stalls:
@@ -405,44 +418,172 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
             cancellation_token=cancellation_token,
         )
 
+    def _preselected_ledger(self) -> Dict[str, Any] | None:
+        """Progress ledger decided by the speaker selector without a model call, or None."""
+        if self._speaker_selector is None:
+            return None
+        decision = self._speaker_selector.select(self._message_thread, self._participant_names)
+        if decision is None:
+            return None
+        self._ledger_calls_saved += 1
+        event_logger.info(
+            {"type": "SpeakerPreselected", "speaker": decision.speaker, "saved": self._ledger_calls_saved}
+        )
+        reason = f"Decided locally: {decision.reason}"
+        return ProgressLedger(
+            is_request_satisfied=LedgerBool(reason=reason, answer=False),
+            is_in_loop=LedgerBool(reason=reason, answer=False),
+            is_progress_being_made=LedgerBool(reason=reason, answer=True),
+            next_speaker=LedgerStr(reason=decision.reason, answer=decision.speaker),
+            instruction_or_question=LedgerStr(reason=decision.reason, answer=decision.instruction),
+        ).model_dump()
+
+    async def _progress_ledger(self, cancellation_token: CancellationToken) -> Dict[str, Any]:
+        """Ask the model for the progress ledger, retrying replies that cannot be repaired."""
+        context = await self._model_context(cancellation_token)
+
+        progress_ledger_prompt = self._get_progress_ledger_prompt(
+            self._task, self._team_description, self._participant_names
+        )
+        context.append(UserMessage(content=progress_ledger_prompt, source=self._name))
+        # Constrain the reply to the ledger schema when the model supports it; either way the
+        # reply goes through the repair parser first, and only an unrepairable one is retried.
+        json_output = ProgressLedger if self._model_client.model_info.get("structured_output") else True
+        progress_ledger: Dict[str, Any] = {}
+        assert self._max_json_retries > 0
+        for attempt in range(self._max_json_retries):
+            if attempt > 0:
+                self._ledger_retries += 1
+                event_logger.info({"type": "ProgressLedgerRetry", "attempt": attempt, "retries": self._ledger_retries})
+            response = await self._model_client.create(
+                context, json_output=json_output, cancellation_token=cancellation_token
+            )
+            self._ledger_calls += 1
+            ledger_str = response.content
+            try:
+                assert isinstance(ledger_str, str)
+                ledger = parse_progress_ledger(ledger_str, self._participant_names)
+            except (LedgerParseError, AssertionError) as e:
+                await self._log_message(f"Failed to parse ledger information, retrying: {e}")
+                continue
+            progress_ledger = ledger.model_dump()
+            break
+        if not progress_ledger:
+            raise ValueError("Failed to parse ledger information after multiple retries.")
+        return progress_ledger
+
     async def _update_task_ledger(self, cancellation_token: CancellationToken) -> None:
         """Update the task ledger (outer loop) with the latest facts and plan."""
-        context = self._thread_to_context()
+        started = time.perf_counter()
+        context = await self._model_context(cancellation_token)
 
         # Update the facts
         update_facts_prompt = self._get_task_ledger_facts_update_prompt(self._task, self._facts)
+        update_plan_prompt = self._get_task_ledger_plan_update_prompt(self._team_description)
+        if self._parallel_planning:
+            facts, plan = await asyncio.gather(
+                self._model_client.create(
+                    [*context, UserMessage(content=update_facts_prompt, source=self._name)],
+                    cancellation_token=cancellation_token,
+                ),
+                self._model_client.create(
+                    [*context, UserMessage(content=update_plan_prompt, source=self._name)],
+                    cancellation_token=cancellation_token,
+                ),
+            )
+            assert isinstance(facts.content, str) and isinstance(plan.content, str)
+            # The plan was drafted from the previous fact sheet, so only what is new can change it
+            previous_facts, self._facts = self._facts, facts.content
+            self._plan = await self._reconcile_plan(plan.content, cancellation_token, previous_facts)
+            self._log_planning_latency("update", started)
+            return
+
         context.append(UserMessage(content=update_facts_prompt, source=self._name))
 
-        response = await self._model_client.create(
-            self._get_compatible_context(context), cancellation_token=cancellation_token
-        )
+        response = await self._model_client.create(context, cancellation_token=cancellation_token)
 
         assert isinstance(response.content, str)
         self._facts = response.content
         context.append(AssistantMessage(content=self._facts, source=self._name))
 
         # Update the plan
-        update_plan_prompt = self._get_task_ledger_plan_update_prompt(self._team_description)
         context.append(UserMessage(content=update_plan_prompt, source=self._name))
 
-        response = await self._model_client.create(
-            self._get_compatible_context(context), cancellation_token=cancellation_token
-        )
+        response = await self._model_client.create(context, cancellation_token=cancellation_token)
 
         assert isinstance(response.content, str)
         self._plan = response.content
+        self._log_planning_latency("update", started)
+
+    async def _create_task_ledger_in_parallel(self, cancellation_token: CancellationToken) -> None:
+        """Gather the facts and draft a plan from the task text alone at the same time."""
+        facts_prompt = self._get_task_ledger_facts_prompt(self._task)
+        plan_prompt = SPECULATIVE_PLAN_PROMPT.format(
+            task=self._task, plan_prompt=self._get_task_ledger_plan_prompt(self._team_description)
+        )
+        facts, plan = await asyncio.gather(
+            self._model_client.create(
+                self._get_compatible_context([UserMessage(content=facts_prompt, source=self._name)]),
+                cancellation_token=cancellation_token,
+            ),
+            self._model_client.create(
+                self._get_compatible_context([UserMessage(content=plan_prompt, source=self._name)]),
+                cancellation_token=cancellation_token,
+            ),
+        )
+        assert isinstance(facts.content, str) and isinstance(plan.content, str)
+        self._facts = facts.content
+        self._plan = await self._reconcile_plan(plan.content, cancellation_token)
+
+    async def _reconcile_plan(self, plan: str, cancellation_token: CancellationToken, *known: str) -> str:
+        """Check a plan drafted without the current facts against them, keeping it unless they change it.
+
+        The check usually answers with a single word, so gathering facts and planning in parallel
+        costs one long model call plus a short one instead of two long ones. It is skipped when the
+        facts name next to nothing that the task, the plan or ``known`` (what the plan was drafted
+        from) do not already mention.
+        """
+        self._plans_speculated += 1
+        if not plan_needs_check(self._facts, plan, self._task, *known):
+            self._plan_checks_skipped += 1
+            event_logger.info(
+                {"type": "SpeculativePlan", "checked": False, "revised": False, "speculated": self._plans_speculated}
+            )
+            return plan
+        prompt = PLAN_CHECK_PROMPT.format(task=self._task, facts=self._facts, plan=plan, keep=KEEP_PLAN)
+        response = await self._model_client.create(
+            [UserMessage(content=prompt, source=self._name)], cancellation_token=cancellation_token
+        )
+        assert isinstance(response.content, str)
+        revision = revised_plan(response.content)
+        if revision is not None:
+            self._plans_revised += 1
+        event_logger.info(
+            {
+                "type": "SpeculativePlan",
+                "checked": True,
+                "revised": revision is not None,
+                "speculated": self._plans_speculated,
+            }
+        )
+        return plan if revision is None else revision
+
+    def _log_planning_latency(self, phase: str, started: float) -> None:
+        seconds = time.perf_counter() - started
+        self._planning_seconds += seconds
+        event_logger.info(
+            {"type": "TaskLedgerLatency", "phase": phase, "parallel": self._parallel_planning, "seconds": seconds}
+        )
 
     async def _prepare_final_answer(self, reason: str, cancellation_token: CancellationToken) -> None:
         """Prepare the final answer for the task."""
-        context = self._thread_to_context()
+        context = await self._model_context(cancellation_token)
 
         # Get the final answer
         final_answer_prompt = self._get_final_answer_prompt(self._task)
         context.append(UserMessage(content=final_answer_prompt, source=self._name))
 
-        response = await self._model_client.create(
-            self._get_compatible_context(context), cancellation_token=cancellation_token
-        )
+        response = await self._model_client.create(context, cancellation_token=cancellation_token)
         assert isinstance(response.content, str)
         message = TextMessage(content=response.content, source=self._name)
 
@@ -468,22 +609,46 @@ class MagenticOneOrchestrator(BaseGroupChatManager):
         # Signal termination
         await self._signal_termination(StopMessage(content=reason, source=self._name))
 
+    def _invalidate_context(self) -> None:
+        """Drop the converted context, e.g. after the message thread was cleared."""
+        self._context = []
+        self._context_length = 0
+        if self._context_budget is not None:
+            self._context_budget.reset()
+
+    async def _model_context(self, cancellation_token: CancellationToken | None = None) -> List[LLMMessage]:
+        """Return the thread as model context, kept under the token budget if one is set."""
+        context = self._thread_to_context()
+        if self._context_budget is not None:
+            context = await self._context_budget.fit(context, cancellation_token)
+        return context
+
     def _thread_to_context(self) -> List[LLMMessage]:
-        """Convert the message thread to a context for the model."""
-        context: List[LLMMessage] = []
-        for m in self._message_thread:
+        """Convert the message thread to a context for the model.
+
+        Only the messages added since the previous call are converted (and stripped of images
+        if the model has no vision); earlier ones are reused. The result is a fresh list the
+        caller may append prompts to.
+        """
+        if len(self._message_thread) < self._context_length:
+            # The thread was cleared without going through _invalidate_context
+            self._invalidate_context()
+        new_messages: List[LLMMessage] = []
+        for m in self._message_thread[self._context_length :]:
             if isinstance(m, ToolCallRequestEvent | ToolCallExecutionEvent):
                 # Ignore tool call messages.
                 continue
             elif isinstance(m, StopMessage | HandoffMessage):
-                context.append(UserMessage(content=m.content, source=m.source))
+                new_messages.append(UserMessage(content=m.content, source=m.source))
             elif m.source == self._name:
                 assert isinstance(m, TextMessage | ToolCallSummaryMessage)
-                context.append(AssistantMessage(content=m.content, source=m.source))
+                new_messages.append(AssistantMessage(content=m.content, source=m.source))
             else:
                 assert isinstance(m, (TextMessage, MultiModalMessage, ToolCallSummaryMessage))
-                context.append(UserMessage(content=m.content, source=m.source))
-        return context
+                new_messages.append(UserMessage(content=m.content, source=m.source))
+        self._context.extend(self._get_compatible_context(new_messages))
+        self._context_length = len(self._message_thread)
+        return list(self._context)
 
     def _get_compatible_context(self, messages: List[LLMMessage]) -> List[LLMMessage]:
         """Ensure that the messages are compatible with the underlying client, by removing images if needed."""
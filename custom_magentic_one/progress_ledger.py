@@ -0,0 +1,97 @@
+import json
+import re
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, ValidationError
+
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+class LedgerBool(BaseModel):
+    reason: str
+    answer: bool
+
+
+class LedgerStr(BaseModel):
+    reason: str
+    answer: str
+
+
+class ProgressLedger(BaseModel):
+    """The progress ledger the orchestrator asks the model for at every step."""
+
+    is_request_satisfied: LedgerBool
+    is_in_loop: LedgerBool
+    is_progress_being_made: LedgerBool
+    next_speaker: LedgerStr
+    instruction_or_question: LedgerStr
+
+
+# Fill-ins for a single omitted key: the answers that keep the inner loop going unchanged
+DEFAULT_ANSWERS: Dict[str, Any] = {
+    "is_in_loop": False,
+    "is_progress_being_made": True,
+}
+
+
+class LedgerParseError(ValueError):
+    """The model's reply could not be turned into a valid progress ledger."""
+
+
+def parse_progress_ledger(text: str, participant_names: List[str]) -> ProgressLedger:
+    """Parse a progress ledger reply, repairing the common ways models get it slightly wrong.
+
+    Repairs, in order: code fences and text around the JSON object are ignored; entries given
+    as a bare value instead of ``{"reason": ..., "answer": ...}`` are wrapped; a single
+    omitted ``is_in_loop`` or ``is_progress_being_made`` is filled in from DEFAULT_ANSWERS;
+    and the next speaker is matched to a participant name case-insensitively. A team of one
+    always gets its only participant as the next speaker.
+
+    Raises:
+        LedgerParseError: If the reply cannot be repaired into a valid ledger.
+    """
+    ledger = _load_json_object(text)
+
+    for key, value in list(ledger.items()):
+        if key in ProgressLedger.model_fields and not isinstance(value, dict):
+            ledger[key] = {"reason": "", "answer": value}
+        elif isinstance(value, dict) and "answer" in value and "reason" not in value:
+            value["reason"] = ""
+
+    # If the team consists of a single agent, deterministically set the next speaker
+    if len(participant_names) == 1:
+        ledger["next_speaker"] = {"reason": "The team consists of only one agent.", "answer": participant_names[0]}
+
+    missing = [key for key in ProgressLedger.model_fields if key not in ledger]
+    if len(missing) == 1 and missing[0] in DEFAULT_ANSWERS:
+        ledger[missing[0]] = {"reason": "Not given.", "answer": DEFAULT_ANSWERS[missing[0]]}
+
+    try:
+        progress_ledger = ProgressLedger.model_validate(ledger)
+    except ValidationError as e:
+        raise LedgerParseError(str(e)) from e
+
+    if not progress_ledger.is_request_satisfied.answer:
+        names = {name.lower(): name for name in participant_names}
+        speaker = names.get(progress_ledger.next_speaker.answer.strip().lower())
+        if speaker is None:
+            raise LedgerParseError(f"Invalid next speaker: {progress_ledger.next_speaker.answer}")
+        progress_ledger.next_speaker.answer = speaker
+    return progress_ledger
+
+
+def _load_json_object(text: str) -> Dict[str, Any]:
+    fenced = CODE_FENCE_PATTERN.search(text)
+    if fenced is not None:
+        text = fenced.group(1)
+    start = text.find("{")
+    if start < 0:
+        raise LedgerParseError("No JSON object in the reply.")
+    try:
+        # raw_decode stops at the end of the first object, ignoring any trailing text
+        ledger, _ = json.JSONDecoder().raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        raise LedgerParseError(str(e)) from e
+    if not isinstance(ledger, dict):
+        raise LedgerParseError("The reply is not a JSON object.")
+    return ledger
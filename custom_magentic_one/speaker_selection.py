@@ -0,0 +1,117 @@
+from typing import Callable, List, NamedTuple, Sequence
+
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+
+DEFAULT_MIN_CONFIDENCE = 0.9
+# Local decisions in a row before the LLM ledger is consulted again, so a satisfied
+# request or a loop is still noticed
+DEFAULT_MAX_CONSECUTIVE = 3
+
+
+class SpeakerDecision(NamedTuple):
+    speaker: str
+    instruction: str
+    reason: str
+    confidence: float
+
+
+# A rule looks at the message thread and the participant names and either decides the next
+# step or returns None.
+SpeakerRule = Callable[[Sequence[BaseAgentEvent | BaseChatMessage], List[str]], SpeakerDecision | None]
+
+
+class RuleBasedSpeakerSelector:
+    """Picks the next speaker and instruction without the progress-ledger LLM call when a rule is sure.
+
+    Rules are tried in order; the first decision with at least ``min_confidence`` is used. After
+    ``max_consecutive`` local decisions the selector abstains once, so the orchestrator's LLM
+    ledger can still check whether the request is satisfied or the team is looping.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[SpeakerRule],
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        max_consecutive: int = DEFAULT_MAX_CONSECUTIVE,
+    ):
+        self.rules = list(rules)
+        self.min_confidence = min_confidence
+        self.max_consecutive = max_consecutive
+        self._consecutive = 0
+
+    def reset(self) -> None:
+        self._consecutive = 0
+
+    def select(
+        self, thread: Sequence[BaseAgentEvent | BaseChatMessage], participant_names: List[str]
+    ) -> SpeakerDecision | None:
+        """Return the next step if a rule decides it confidently, else None to fall back to the LLM."""
+        if self._consecutive >= self.max_consecutive:
+            self._consecutive = 0
+            return None
+        for rule in self.rules:
+            decision = rule(thread, participant_names)
+            if decision is not None and decision.speaker in participant_names:
+                if decision.confidence >= self.min_confidence:
+                    self._consecutive += 1
+                    return decision
+        self._consecutive = 0
+        return None
+
+
+def user_and_agent_selector(
+    user_name: str, agent_name: str, matcher: Callable[[str], object] | None = None
+) -> RuleBasedSpeakerSelector:
+    """Selector for a user proxy and one agent, e.g. the UserProxy + SurflineAgent team.
+
+    The agent's answers go back to the user; user messages that ``matcher`` recognizes (such
+    as surfline_intents.parse_intent) go straight to the agent.
+    """
+    rules = [agent_answered_rule(user_name, [agent_name])]
+    if matcher is not None:
+        rules.append(user_request_rule(user_name, agent_name, matcher))
+    return RuleBasedSpeakerSelector(rules)
+
+
+def _last_chat_messages(thread: Sequence[BaseAgentEvent | BaseChatMessage], n: int) -> List[BaseChatMessage]:
+    messages: List[BaseChatMessage] = []
+    for message in reversed(thread):
+        if isinstance(message, BaseChatMessage):
+            messages.append(message)
+            if len(messages) == n:
+                break
+    return messages[::-1]
+
+
+def agent_answered_rule(user_name: str, agent_names: Sequence[str]) -> SpeakerRule:
+    """After one of ``agent_names`` answered an instruction, hand the answer to the user."""
+
+    def rule(thread: Sequence[BaseAgentEvent | BaseChatMessage], participant_names: List[str]) -> SpeakerDecision | None:
+        last = _last_chat_messages(thread, 2)
+        if len(last) < 2 or last[1].source not in agent_names or last[0].source in participant_names:
+            return None
+        if not last[1].to_model_text().strip():
+            return None
+        return SpeakerDecision(
+            user_name,
+            f"Please review {last[1].source}'s answer above and reply with any follow-up question.",
+            f"{last[1].source} answered the previous instruction.",
+            0.95,
+        )
+
+    return rule
+
+
+def user_request_rule(user_name: str, agent_name: str, matcher: Callable[[str], object]) -> SpeakerRule:
+    """Send a user message that ``matcher`` recognizes straight to ``agent_name``, verbatim."""
+
+    def rule(thread: Sequence[BaseAgentEvent | BaseChatMessage], participant_names: List[str]) -> SpeakerDecision | None:
+        last = _last_chat_messages(thread, 1)
+        if not last or last[0].source != user_name:
+            return None
+        text = last[0].to_model_text().strip()
+        if not text or not matcher(text):
+            return None
+        return SpeakerDecision(agent_name, text, f"{agent_name} handles this kind of request directly.", 0.95)
+
+    return rule
@@ -0,0 +1,56 @@
+import re
+
+KEEP_PLAN = "KEEP"
+# Names and numbers the fact sheet must add beyond the task and the draft plan before the
+# draft is checked against it; with fewer, the facts cannot have changed what to do
+MATERIAL_NEW_TERMS = 3
+TERM_PATTERN = re.compile(r"\b(?:[A-Z][\w'-]{2,}|\w*\d[\w.:/-]*)")
+WORD_PATTERN = re.compile(r"[\w'.:/-]+")
+LIST_NUMBER_PATTERN = re.compile(r"^\s*\d+\.\s", re.MULTILINE)
+# Headings and filler of the Magentic-One fact sheet, present in every sheet
+FACT_SHEET_WORDS = {"given", "verified", "facts", "look", "derive", "educated", "guesses", "none"}
+
+SPECULATIVE_PLAN_PROMPT = """We are working to address the following user request:
+
+{task}
+
+{plan_prompt}
+"""
+
+PLAN_CHECK_PROMPT = """We are working to address the following user request:
+
+{task}
+
+The plan below was drafted before the fact sheet was ready.
+
+Fact sheet:
+
+{facts}
+
+Plan:
+
+{plan}
+
+If the fact sheet does not change what the team should do, answer with exactly {keep}. Otherwise answer with the revised plan only, in the same short bullet-point form.
+"""
+
+
+def revised_plan(reply: str) -> str | None:
+    """The revised plan from a plan check reply, or None if the speculative plan is kept."""
+    reply = reply.strip()
+    if not reply or reply.strip(".`*\"' ").upper() == KEEP_PLAN:
+        return None
+    return reply
+
+
+def new_terms(facts: str, *known: str) -> set[str]:
+    """Names and numbers in the fact sheet that none of the ``known`` texts mention, lowercased."""
+    seen = {word.lower().strip(".:") for text in known for word in WORD_PATTERN.findall(text)}
+    facts = LIST_NUMBER_PATTERN.sub("", facts)
+    terms = {term.lower().strip(".:") for term in TERM_PATTERN.findall(facts)}
+    return terms - seen - FACT_SHEET_WORDS
+
+
+def plan_needs_check(facts: str, plan: str, *known: str) -> bool:
+    """Whether the fact sheet adds enough to the draft plan's inputs to be worth a plan check."""
+    return len(new_terms(facts, plan, *known)) >= MATERIAL_NEW_TERMS
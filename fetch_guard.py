@@ -0,0 +1,66 @@
+import random
+
+PAGE_OK = "ok"
+PAGE_CHALLENGE = "challenge"
+PAGE_BLOCKED = "blocked"
+
+# Only the start of the body is inspected; every marker below appears in the <head>
+# of Cloudflare's interstitial and error pages.
+SNIFF_BYTES = 4096
+CHALLENGE_MARKERS = (
+    b"<title>Just a moment...</title>",
+    b"_cf_chl_opt",
+    b"/cdn-cgi/challenge-platform/",
+    b"Enable JavaScript and cookies to continue",
+)
+BLOCKED_MARKERS = (
+    b"<title>Attention Required! | Cloudflare</title>",
+    b"cf-error-details",
+    b"<title>Access denied",
+)
+BLOCKED_STATUS_CODES = (403, 429, 451)
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 2.0
+
+
+class RejectedPageError(Exception):
+    """Raised when a response is a challenge or block page instead of real content."""
+
+    def __init__(self, url: str, verdict: str):
+        super().__init__(f"{url} returned a {verdict} page")
+        self.url = url
+        self.verdict = verdict
+
+
+def classify_response(status_code: int, headers, head: bytes = b"") -> str:
+    """
+    Classify a response from its status, headers and the first bytes of its body.
+
+    Args:
+        status_code (int): The HTTP status code.
+        headers (Mapping[str, str]): The response headers (case-insensitive mapping).
+        head (bytes): The first bytes of the body; only SNIFF_BYTES are looked at.
+
+    Returns:
+        str: PAGE_OK, PAGE_CHALLENGE or PAGE_BLOCKED.
+    """
+    if headers.get("cf-mitigated", "").lower() == "challenge":
+        return PAGE_CHALLENGE
+    head = head[:SNIFF_BYTES]
+    if any(marker in head for marker in CHALLENGE_MARKERS):
+        return PAGE_CHALLENGE
+    if status_code in BLOCKED_STATUS_CODES or any(marker in head for marker in BLOCKED_MARKERS):
+        return PAGE_BLOCKED
+    return PAGE_OK
+
+
+def check_response(url: str, status_code: int, headers, head: bytes = b"") -> None:
+    """Raise RejectedPageError unless the response classifies as PAGE_OK."""
+    verdict = classify_response(status_code, headers, head)
+    if verdict != PAGE_OK:
+        raise RejectedPageError(url, verdict)
+
+
+def backoff_delay(attempt: int, backoff: float = DEFAULT_BACKOFF) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, backoff * 2 ** attempt)
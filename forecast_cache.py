@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+# Surfline's forecast models (LOTUS, GFS wind) are re-run every 6 hours.
+MODEL_RUN_INTERVAL = 6 * 3600
+# Runs are published some time after their initialization hour.
+MODEL_RUN_DELAY = 30 * 60
+
+
+def next_model_run(now: float | None = None) -> float:
+    """Return when the next model run is expected to be published, as a Unix timestamp."""
+    now = time.time() if now is None else now
+    current = (now - MODEL_RUN_DELAY) // MODEL_RUN_INTERVAL * MODEL_RUN_INTERVAL + MODEL_RUN_DELAY
+    return current + MODEL_RUN_INTERVAL
+
+
+class ForecastCache:
+    """
+    Async LRU cache for forecasts with request coalescing.
+
+    Entries expire when the next model run is published (or after a fixed ``ttl``).
+    While a key is being fetched, every other caller asking for it awaits the same
+    in-flight fetch instead of starting its own.
+
+    Args:
+        maxsize (int): Maximum number of cached entries.
+        ttl (float, optional): Fixed time-to-live in seconds. Defaults to expiring at the
+            next model run.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._in_flight: dict = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expires_at(self, now: float) -> float:
+        return now + self.ttl if self.ttl is not None else next_model_run(now)
+
+    async def get(self, key, fetch):
+        """
+        Return the cached value for ``key``, fetching it if missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+            fetch (Callable[[], Awaitable]): Coroutine function producing the value.
+
+        Returns:
+            Any: The cached or freshly fetched value.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._store(key, done))
+        # Shielded so that a cancelled caller does not cancel the fetch the others wait on.
+        return await asyncio.shield(task)
+
+    def _store(self, key, task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._entries[key] = (self._expires_at(time.time()), task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
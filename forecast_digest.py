@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from forecast_rollups import best_window
+from spot_ranking import score_forecasts, to_scoring_units
+from surfline_fetch import forecast_to_dataframe
+
+# Days listed one per line; anything past that is folded into a single line so the
+# digest stays the same size whatever the forecast horizon.
+MAX_DIGEST_DAYS = 5
+DIGEST_COLUMNS = ["timestamp", "surf_min", "surf_max", "swell_period", "wind_speed", "wind_direction", "tide_height"]
+
+
+def local_date(utc_offset=0, day_offset=0, now=None):
+    """
+    Return the spot-local calendar date ``day_offset`` days from now.
+
+    Args:
+        utc_offset (float): Hours to add to UTC to get the spot's local time.
+        day_offset (int): 0 for today, 1 for tomorrow, ...
+        now (datetime, optional): Current time (timezone-aware), for testing.
+
+    Returns:
+        date: The local date.
+    """
+    now = datetime.now(timezone.utc) if now is None else now
+    return (now + timedelta(hours=utc_offset)).date() + timedelta(days=day_offset)
+
+
+def local_day_window(day, utc_offset=0):
+    """Return the UTC (start, end) of a spot-local calendar day."""
+    start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) - timedelta(hours=utc_offset)
+    return start, start + timedelta(days=1)
+
+
+def summarize_forecast(
+    df, utc_offset=0, orientation=None, max_days=MAX_DIGEST_DAYS, day=None, height_unit="ft", speed_unit="kts"
+):
+    """
+    Reduce an hourly forecast to a short per-day summary.
+
+    Args:
+        df (pd.DataFrame): One spot's forecast, as returned by surfline_fetch.forecast_to_dataframe.
+        utc_offset (float): Hours to add to UTC to get the spot's local time.
+        orientation (float, optional): Degrees the beach faces, for the wind term of the score.
+        max_days (int): Number of days summarized individually.
+        day (date, optional): Only summarize this local calendar day.
+        height_unit, speed_unit (str): Units of the wave heights and wind speeds, which
+            are converted to feet and knots for scoring.
+
+    Returns:
+        list[dict]: One entry per day (``date``, surf/wind ranges, ``best_window`` in
+            local time, ``best_score``), plus at most one trailing entry with
+            ``date`` set to 'later' covering the remaining days.
+    """
+    df = df.reindex(columns=DIGEST_COLUMNS).dropna(subset=["timestamp"]).sort_values("timestamp")
+    if df.empty:
+        return []
+    wave_height, wind_speed = to_scoring_units(df["surf_max"], df["wind_speed"], height_unit, speed_unit)
+    df = df.assign(
+        local=df["timestamp"] + pd.Timedelta(hours=utc_offset),
+        score=score_forecasts(
+            wave_height[None, :],
+            df["swell_period"].to_numpy(dtype=float)[None, :],
+            wind_speed[None, :],
+            df["wind_direction"].to_numpy(dtype=float)[None, :],
+            df["tide_height"].to_numpy(dtype=float)[None, :],
+            None if orientation is None else [orientation],
+        )[0],
+    )
+    df["date"] = df["local"].dt.date
+    if day is not None:
+        df = df[df["date"] == day]
+
+    groups = [day for _, day in df.groupby("date", sort=True)]
+    days = [_summarize(day, day["date"].iloc[0].isoformat(), "%H:00") for day in groups[:max_days]]
+    if len(groups) > max_days:
+        days.append(_summarize(pd.concat(groups[max_days:]), "later", "%m-%d %H:00"))
+    return days
+
+
+def _summarize(rows, date, time_format):
+    first, last, score = best_window(rows["score"].to_numpy())
+    start = rows["local"].iloc[first]
+    end = rows["local"].iloc[last] + pd.Timedelta(hours=1)
+    return {
+        "date": date,
+        "surf_min": _round(rows["surf_min"].min()),
+        "surf_max": _round(rows["surf_max"].max()),
+        "period_max": _round(rows["swell_period"].max()),
+        "wind_min": _round(rows["wind_speed"].min()),
+        "wind_max": _round(rows["wind_speed"].max()),
+        "best_window": f"{start.strftime(time_format)}-{end.strftime(time_format)}",
+        "best_score": _round(score, 2),
+    }
+
+
+def _round(value, digits=1):
+    return None if pd.isna(value) else round(float(value), digits)
+
+
+def format_digest(name, days, height_unit="ft", speed_unit="kts"):
+    """
+    Render a summary from summarize_forecast as a few lines of text for the chat.
+
+    Args:
+        name (str): The spot name.
+        days (list[dict]): The summary.
+        height_unit (str): Unit label for wave heights.
+        speed_unit (str): Unit label for wind speeds.
+
+    Returns:
+        str: One line per summarized day.
+    """
+    if not days:
+        return f"No forecast data for {name}."
+    lines = [f"Forecast digest for {name}:"]
+    for day in days:
+        lines.append(
+            f"- {day['date']}: surf {day['surf_min']}-{day['surf_max']} {height_unit}, "
+            f"period up to {day['period_max']} s, wind {day['wind_min']}-{day['wind_max']} {speed_unit}, "
+            f"best {day['best_window']} (score {day['best_score']})"
+        )
+    return "\n".join(lines)
+
+
+def digest_forecast(name, spot_id, payload, orientation=None, max_days=MAX_DIGEST_DAYS, day_offset=None):
+    """
+    Summarize a raw kbyg forecast response as bounded-size text.
+
+    Args:
+        name (str): The spot name.
+        spot_id (str): The Surfline spotId.
+        payload (dict): The JSON body returned by the forecasts endpoint.
+        orientation (float, optional): Degrees the beach faces.
+        max_days (int): Number of days summarized individually.
+        day_offset (int, optional): Only summarize this day (0 for today, 1 for
+            tomorrow, ...), in the spot's local time.
+
+    Returns:
+        str: The digest, as rendered by format_digest.
+    """
+    associated = payload.get("associated") or {}
+    units = associated.get("units") or {}
+    utc_offset = associated.get("utcOffset") or 0
+    height_unit = units.get("waveHeight", "FT").lower()
+    speed_unit = units.get("windSpeed", "KTS").lower()
+    days = summarize_forecast(
+        forecast_to_dataframe(spot_id, payload),
+        utc_offset=utc_offset,
+        orientation=orientation,
+        max_days=max_days,
+        day=None if day_offset is None else local_date(utc_offset, day_offset),
+        height_unit=height_unit,
+        speed_unit=speed_unit,
+    )
+    return format_digest(name, days, height_unit=height_unit, speed_unit=speed_unit)
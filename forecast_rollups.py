@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+from spot_ranking import score_forecasts
+
+# Granularities kept pre-aggregated by the forecast store, in hours. Each divides the
+# next, so buckets nest and coarser summaries can be built from finer ones. Buckets are
+# aligned to the spot's local midnight, so a daily bucket is a local calendar day.
+ROLLUP_HOURS = (3, 6, 24)
+ROLLUP_COLUMNS = (
+    "surf_min",
+    "surf_max",
+    "swell_height",
+    "swell_period",
+    "wind_speed",
+    "wind_gust",
+    "tide_height",
+    "temperature",
+)
+BEST_WINDOW_HOURS = 3
+BEST_COLUMNS = ["best_start", "best_end", "best_score"]
+
+
+def bucket_start(timestamps: pd.Series, hours: int, utc_offset=0) -> pd.Series:
+    """
+    Floor UTC timestamps to the start of their ``hours``-long bucket in local time.
+
+    Args:
+        timestamps (pd.Series): UTC timestamps.
+        hours (int): Bucket size in hours.
+        utc_offset (float | pd.Series): Hours to add to UTC to get local time, per row or
+            for all of them. Missing values are taken as UTC.
+
+    Returns:
+        pd.Series: The UTC time at which each timestamp's local bucket starts.
+    """
+    if isinstance(utc_offset, pd.Series):
+        utc_offset = utc_offset.fillna(0)
+    offset = pd.to_timedelta(utc_offset, unit="h")
+    return (timestamps + offset).dt.floor(f"{hours}h") - offset
+
+
+def utc_offsets(df: pd.DataFrame) -> pd.Series | int:
+    """The ``utc_offset`` column of forecast or rollup rows, or 0 (UTC) if they have none."""
+    return df["utc_offset"] if "utc_offset" in df.columns else 0
+
+
+def rollup(df: pd.DataFrame, hours: int) -> pd.DataFrame:
+    """
+    Aggregate hourly forecast rows into fixed-size time buckets.
+
+    Args:
+        df (pd.DataFrame): Hourly rows with ``spotId`` and ``timestamp`` columns, as
+            stored by forecast_store.ForecastStore.
+        hours (int): Bucket size in hours.
+
+    Returns:
+        pd.DataFrame: One row per spot and bucket, with ``bucket`` (UTC start time of the
+            bucket in the spot's local time, see bucket_start), ``utc_offset``, ``hours``
+            (number of hourly rows) and ``<column>_min``/``_mean``/``_max`` for each of
+            ROLLUP_COLUMNS. Daily (and longer) buckets also carry the best
+            BEST_WINDOW_HOURS window: ``best_start``, ``best_end`` and ``best_score``.
+    """
+    df = df.reindex(columns=["spotId", "timestamp", "utc_offset", *ROLLUP_COLUMNS, "wind_direction"])
+    df = df.dropna(subset=["timestamp"]).sort_values(["spotId", "timestamp"])
+    if df.empty:
+        return pd.DataFrame(columns=_rollup_columns(hours))
+    df["utc_offset"] = df["utc_offset"].fillna(0.0)
+    df["bucket"] = bucket_start(df["timestamp"], hours, df["utc_offset"])
+
+    grouped = df.groupby(["spotId", "bucket"], sort=True)
+    stats = grouped[list(ROLLUP_COLUMNS)].agg(["min", "mean", "max"])
+    stats.columns = [f"{column}_{stat}" for column, stat in stats.columns]
+    stats.insert(0, "hours", grouped.size())
+    stats.insert(0, "utc_offset", grouped["utc_offset"].first())
+    stats = stats.reset_index()
+    if hours >= 24:
+        stats = stats.merge(best_windows(df), on=["spotId", "bucket"], how="left")
+    return stats
+
+
+def best_window(scores: np.ndarray) -> tuple[int, int, float]:
+    """
+    Find the best-scoring run of BEST_WINDOW_HOURS consecutive hourly scores.
+
+    Only full-length windows compete, so a short run at the edge of a day cannot win;
+    a day with fewer rows than that is taken whole.
+
+    Args:
+        scores (np.ndarray): Hourly scores, in time order.
+
+    Returns:
+        tuple: Positions of the first and last hour of the window, and its mean score.
+    """
+    size = min(BEST_WINDOW_HOURS, len(scores))
+    means = np.convolve(scores, np.ones(size) / size, mode="valid")
+    first = int(means.argmax())
+    return first, first + size - 1, float(means[first])
+
+
+def best_windows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Find the best-scoring BEST_WINDOW_HOURS window of each bucket.
+
+    Args:
+        df (pd.DataFrame): Hourly rows sorted by spot and time, with a ``bucket`` column.
+
+    Returns:
+        pd.DataFrame: ``spotId``, ``bucket``, ``best_start``, ``best_end`` and ``best_score``.
+    """
+    df = df.assign(score=score_forecasts(
+        df["surf_max"].to_numpy(dtype=float)[None, :],
+        df["swell_period"].to_numpy(dtype=float)[None, :],
+        df["wind_speed"].to_numpy(dtype=float)[None, :],
+        df["wind_direction"].to_numpy(dtype=float)[None, :],
+    )[0])
+    rows = []
+    for (spot_id, bucket), hourly in df.groupby(["spotId", "bucket"], sort=True):
+        first, last, score = best_window(hourly["score"].to_numpy())
+        rows.append({
+            "spotId": spot_id,
+            "bucket": bucket,
+            "best_start": hourly["timestamp"].iloc[first],
+            "best_end": hourly["timestamp"].iloc[last] + pd.Timedelta(hours=1),
+            "best_score": score,
+        })
+    return pd.DataFrame(rows, columns=["spotId", "bucket", *BEST_COLUMNS])
+
+
+def coarsen(rollups: pd.DataFrame, hours: int) -> pd.DataFrame:
+    """
+    Merge rollup buckets into larger ones, e.g. 6-hour buckets into 12-hour ones.
+
+    Means are weighted by the number of hourly rows in each bucket; when the input has
+    best windows, the best window of the merged bucket is that of its best input bucket.
+
+    Args:
+        rollups (pd.DataFrame): Rows as returned by rollup, with a bucket size dividing ``hours``.
+        hours (int): New bucket size in hours.
+
+    Returns:
+        pd.DataFrame: The coarser rollup, with the same columns.
+    """
+    if rollups.empty:
+        return rollups
+    rollups = rollups.assign(bucket=bucket_start(rollups["bucket"], hours, utc_offsets(rollups)))
+    keys = [rollups["spotId"], rollups["bucket"]]
+    weights = rollups["hours"]
+    merged = {"utc_offset": pd.Series(utc_offsets(rollups), index=rollups.index).groupby(keys).first()}
+    merged["hours"] = weights.groupby(keys).sum()
+    for column in ROLLUP_COLUMNS:
+        merged[f"{column}_min"] = rollups[f"{column}_min"].groupby(keys).min()
+        weighted = (rollups[f"{column}_mean"] * weights).groupby(keys).sum(min_count=1)
+        counted = weights.where(rollups[f"{column}_mean"].notna()).groupby(keys).sum()
+        merged[f"{column}_mean"] = weighted / counted.replace(0, np.nan)
+        merged[f"{column}_max"] = rollups[f"{column}_max"].groupby(keys).max()
+    result = pd.DataFrame(merged).reset_index()
+    if "best_score" in rollups.columns:
+        best = rollups.loc[rollups["best_score"].fillna(-1.0).groupby(keys).idxmax()]
+        result = result.merge(best[["spotId", "bucket", *BEST_COLUMNS]], on=["spotId", "bucket"], how="left")
+    return result
+
+
+def _rollup_columns(hours: int) -> list[str]:
+    columns = ["spotId", "bucket", "utc_offset", "hours"]
+    columns += [f"{column}_{stat}" for column in ROLLUP_COLUMNS for stat in ("min", "mean", "max")]
+    return columns + (BEST_COLUMNS if hours >= 24 else [])
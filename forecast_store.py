@@ -0,0 +1,359 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from forecast_rollups import ROLLUP_HOURS, bucket_start, coarsen, rollup, utc_offsets
+
+DEFAULT_STORE_DIR = "forecast_store"
+RUN_FILE_PATTERN = re.compile(r"^run=(\d+)\.arrow$")
+# Run files kept per spot before they are folded into one
+MAX_RUN_FILES = 8
+KEY_COLUMNS = ("spotId", "run", "timestamp")
+
+
+class ForecastStore:
+    """
+    Columnar on-disk store for spot forecasts.
+
+    Each forecast run of each spot is one uncompressed Arrow IPC file, laid out as
+    ``<root>/spotId=<spot_id>/run=<run>.arrow``. Files are memory-mapped on read, so
+    loading many spots at once costs little more than touching the pages actually used.
+    Numeric value columns are stored as float64 in a fixed column order, so runs and
+    spots always combine into one table whatever dtypes the forecasts came with.
+
+    A run file may hold only the rows that changed since the previous run (see merge);
+    reads combine the runs of a spot so that, for each timestamp, the newest run wins.
+    Once a spot has more than ``MAX_RUN_FILES`` run files they are folded into one.
+
+    Every write also refreshes the spot's rollups (``rollup=<hours>h.arrow``, see
+    forecast_rollups) for the days it touched, so summaries are read without scanning
+    hourly rows. Rollup buckets follow the spot's local days when the forecasts carry a
+    ``utc_offset`` column, and UTC days otherwise.
+
+    Args:
+        root (str): Root directory of the store.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _spot_dir(self, spot_id: str) -> str:
+        return os.path.join(self.root, f"spotId={spot_id}")
+
+    def _run_path(self, spot_id: str, run: int) -> str:
+        return os.path.join(self._spot_dir(spot_id), f"run={run}.arrow")
+
+    def _rollup_path(self, spot_id: str, hours: int) -> str:
+        return os.path.join(self._spot_dir(spot_id), f"rollup={hours}h.arrow")
+
+    def spot_ids(self) -> list[str]:
+        """Return the spotIds that have at least one stored run."""
+        return sorted(
+            name.split("=", 1)[1]
+            for name in os.listdir(self.root)
+            if name.startswith("spotId=") and self.runs(name.split("=", 1)[1])
+        )
+
+    def runs(self, spot_id: str) -> list[int]:
+        """Return the stored forecast runs of a spot, oldest first."""
+        spot_dir = self._spot_dir(spot_id)
+        if not os.path.isdir(spot_dir):
+            return []
+        runs = []
+        for name in os.listdir(spot_dir):
+            match = RUN_FILE_PATTERN.match(name)
+            if match:
+                runs.append(int(match.group(1)))
+        return sorted(runs)
+
+    def latest_run(self, spot_id: str) -> int | None:
+        """Return the most recent stored run of a spot, or None."""
+        runs = self.runs(spot_id)
+        return runs[-1] if runs else None
+
+    def write(self, spot_id: str, df: pd.DataFrame, run: int | None = None) -> str:
+        """
+        Store one forecast run of a spot.
+
+        Args:
+            spot_id (str): The Surfline spotId.
+            df (pd.DataFrame): The forecast rows.
+            run (int, optional): The model run, as a Unix timestamp. Defaults to the
+                ``run`` column of ``df``.
+
+        Returns:
+            str: Path of the written file.
+
+        Raises:
+            ValueError: If no model run is given and ``df`` does not name one.
+        """
+        run = _model_run(df, run)
+        table = _to_table(df.assign(spotId=spot_id, run=run))
+
+        # A run that does not combine with the stored ones must not reach the disk, or
+        # every later read of the spot would fail
+        stored = self.read_table([spot_id], latest_only=False)
+        if stored.num_columns:
+            pa.concat_tables([stored, table], promote_options="permissive")
+
+        path = self._run_path(spot_id, run)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_table(path, table)
+        self._maybe_compact(spot_id)
+        if "timestamp" in df.columns:
+            self._update_rollups(spot_id, df)
+        return path
+
+    def merge(self, spot_id: str, df: pd.DataFrame, run: int | None = None) -> int:
+        """
+        Store a new forecast run of a spot, keeping only the rows that changed.
+
+        Rows whose timestamp is new, or whose values differ from the stored forecast for
+        that timestamp, are written as the run's file. The run is recorded even when no
+        row changed, so latest_run advances. A run that is not newer than the latest
+        stored one is ignored, since model runs never change once published.
+
+        Args:
+            spot_id (str): The Surfline spotId.
+            df (pd.DataFrame): The full forecast of the new run, with a ``timestamp`` column.
+            run (int, optional): The model run, as a Unix timestamp. Defaults to the
+                ``run`` column of ``df``.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            ValueError: If no model run is given and ``df`` does not name one.
+        """
+        run = _model_run(df, run)
+        latest = self.latest_run(spot_id)
+        if latest is not None and run <= latest:
+            return 0
+        current = self.read([spot_id])
+        if current.empty:
+            self.write(spot_id, df, run)
+            return len(df)
+
+        values = [column for column in df.columns if column not in KEY_COLUMNS]
+        old = current.reindex(columns=["timestamp", *values]).drop_duplicates("timestamp")
+        joined = df[["timestamp", *values]].merge(old, on="timestamp", how="left", suffixes=("", "_old"), indicator=True)
+        changed = (joined["_merge"] == "left_only").to_numpy(copy=True)
+        for column in values:
+            new, previous = joined[column], joined[column + "_old"]
+            changed |= ~((new == previous) | (new.isna() & previous.isna())).to_numpy()
+
+        delta = df[changed]
+        self.write(spot_id, delta, run)
+        return len(delta)
+
+    def compact(self, spot_id: str) -> None:
+        """Fold every run file of a spot into a single file holding its merged forecast."""
+        runs = self.runs(spot_id)
+        if len(runs) < 2:
+            return
+        table = self.read_table([spot_id])
+        # The merged table replaces the newest run file; it covers every timestamp of
+        # the older files, so a crash before they are removed leaves reads unchanged.
+        _write_table(self._run_path(spot_id, runs[-1]), table)
+        for run in runs[:-1]:
+            os.remove(self._run_path(spot_id, run))
+
+    def _maybe_compact(self, spot_id: str) -> None:
+        if len(self.runs(spot_id)) > MAX_RUN_FILES:
+            self.compact(spot_id)
+
+    def _update_rollups(self, spot_id: str, rows: pd.DataFrame | None = None) -> None:
+        # Only the local days holding the new rows are recomputed; None rebuilds every rollup.
+        # So do rollups written before buckets followed local days, which lack utc_offset.
+        paths = {hours: self._rollup_path(spot_id, hours) for hours in ROLLUP_HOURS}
+        if not all(os.path.exists(path) and "utc_offset" in _read_schema(path).names for path in paths.values()):
+            rows = None
+        days = None
+        if rows is None:
+            hourly = self.read([spot_id])
+        else:
+            timestamps = pd.Series(pd.to_datetime(rows["timestamp"], utc=True), index=rows.index)
+            days = bucket_start(timestamps, 24, utc_offsets(rows)).unique()
+            if len(days) == 0:
+                return
+            # Rows outside the touched days are filtered out of each run file before the
+            # runs are merged, so the cost follows the update, not the spot's history
+            hourly = self.read([spot_id], start=days.min(), end=days.max() + pd.Timedelta(days=1))
+            if not hourly.empty:
+                hourly = hourly[bucket_start(hourly["timestamp"], 24, utc_offsets(hourly)).isin(days)]
+        if hourly.empty:
+            return
+
+        for hours, path in paths.items():
+            table = rollup(hourly, hours)
+            if days is not None:
+                kept = _read_table(path).to_pandas()
+                kept = kept[~bucket_start(kept["bucket"], 24, utc_offsets(kept)).isin(days)]
+                table = pd.concat([kept, table], ignore_index=True).sort_values("bucket", ignore_index=True)
+            _write_table(path, pa.Table.from_pandas(table, preserve_index=False))
+
+    def read_rollup(self, spot_ids=None, hours: int = 24) -> pd.DataFrame:
+        """
+        Read a pre-aggregated rollup.
+
+        Args:
+            spot_ids (Iterable[str], optional): The spots to read. Defaults to every spot.
+            hours (int): One of forecast_rollups.ROLLUP_HOURS.
+
+        Returns:
+            pd.DataFrame: The rollup rows of every spot, as returned by forecast_rollups.rollup.
+        """
+        if hours not in ROLLUP_HOURS:
+            raise ValueError(f"No {hours}h rollup; available: {ROLLUP_HOURS}")
+        tables = []
+        for spot_id in (self.spot_ids() if spot_ids is None else spot_ids):
+            path = self._rollup_path(spot_id, hours)
+            if not os.path.exists(path):
+                # Written before rollups existed
+                self._update_rollups(spot_id)
+            if os.path.exists(path):
+                tables.append(_read_table(path))
+        if not tables:
+            return rollup(pd.DataFrame(), hours)
+        return pa.concat_tables(tables, promote_options="permissive").to_pandas()
+
+    def summary(self, spot_ids=None, hours: int = 24, start=None, end=None) -> pd.DataFrame:
+        """
+        Summarize stored forecasts in ``hours``-long buckets.
+
+        The answer is built from the coarsest rollup whose buckets divide ``hours``
+        (merging its buckets when they are smaller); hourly rows are only aggregated
+        when no rollup fits, e.g. for 2-hour buckets.
+
+        Args:
+            spot_ids (Iterable[str], optional): The spots to summarize. Defaults to every spot.
+            hours (int): Bucket size in hours.
+            start, end (datetime-like, optional): Only return buckets overlapping [start, end).
+                Naive values are taken to be UTC.
+
+        Returns:
+            pd.DataFrame: One row per spot and bucket, as returned by forecast_rollups.rollup.
+        """
+        granularity = max((size for size in ROLLUP_HOURS if hours % size == 0), default=None)
+        if granularity is None:
+            df = rollup(self.read(spot_ids), hours)
+        else:
+            df = self.read_rollup(spot_ids, granularity)
+            if granularity < hours:
+                df = coarsen(df, hours)
+        if start is not None:
+            df = df[df["bucket"] + pd.Timedelta(hours=hours) > _utc(start)]
+        if end is not None:
+            df = df[df["bucket"] < _utc(end)]
+        return df.reset_index(drop=True)
+
+    def read_table(self, spot_ids=None, latest_only: bool = True, columns=None, start=None, end=None) -> pa.Table:
+        """
+        Memory-map stored forecasts into a single Arrow table.
+
+        Args:
+            spot_ids (Iterable[str], optional): The spots to read. Defaults to every spot.
+            latest_only (bool): Merge the runs of each spot into its current forecast, the
+                newest run winning for each timestamp. Otherwise every stored row of every
+                run is returned.
+            columns (list[str], optional): Columns to keep besides ``spotId``, ``run`` and
+                ``timestamp``.
+            start, end (datetime-like, optional): Only return rows with timestamps in
+                [start, end). Naive values are taken to be UTC.
+
+        Returns:
+            pa.Table: The concatenated forecasts, with ``spotId`` and ``run`` columns.
+        """
+        tables = []
+        for spot_id in (self.spot_ids() if spot_ids is None else spot_ids):
+            runs = []
+            for run in self.runs(spot_id):
+                table = _read_table(self._run_path(spot_id, run))
+                if columns is not None:
+                    table = table.select([c for c in dict.fromkeys([*KEY_COLUMNS, *columns]) if c in table.column_names])
+                if start is not None or end is not None:
+                    table = _between(table, start, end)
+                runs.append(table)
+            if latest_only and len(runs) > 1:
+                runs = [_latest_rows(pa.concat_tables(runs, promote_options="permissive"))]
+            tables.extend(runs)
+        if not tables:
+            return pa.table({})
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def read(self, spot_ids=None, latest_only: bool = True, columns=None, start=None, end=None) -> pd.DataFrame:
+        """Like read_table, but returns a pandas DataFrame."""
+        return self.read_table(spot_ids, latest_only, columns, start, end).to_pandas()
+
+
+def _model_run(df: pd.DataFrame, run) -> int:
+    # Runs order the stored forecasts, so they must come from the forecast itself: a clock
+    # time here would shadow, or cause the rejection of, a real run published later
+    if run is None and "run" in df.columns:
+        runs = df["run"].dropna().unique()
+        if len(runs) == 1:
+            run = runs[0]
+    if run is None or pd.isna(run):
+        raise ValueError("The forecast does not name its model run.")
+    return int(run)
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    # Key columns first, then the value columns by name; numeric values as float64 so that,
+    # e.g., whole-number wave heights parsed as int64 still combine with fractional ones
+    keys = [column for column in KEY_COLUMNS if column in df.columns]
+    values = sorted(column for column in df.columns if column not in KEY_COLUMNS)
+    df = df[[*keys, *values]].astype({
+        column: "float64"
+        for column in values
+        if pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column])
+    })
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _latest_rows(table: pa.Table) -> pa.Table:
+    # One spot's rows from several runs: keep the newest run's row for each timestamp
+    table = table.take(pc.sort_indices(table, [("timestamp", "ascending"), ("run", "descending")]))
+    timestamps = table["timestamp"].to_numpy()
+    first = np.ones(len(timestamps), dtype=bool)
+    first[1:] = timestamps[1:] != timestamps[:-1]
+    return table.filter(pa.array(first))
+
+
+def _between(table: pa.Table, start, end) -> pa.Table:
+    timestamps = table["timestamp"]
+    mask = None
+    if start is not None:
+        mask = pc.greater_equal(timestamps, pa.scalar(_utc(start), type=timestamps.type))
+    if end is not None:
+        before = pc.less(timestamps, pa.scalar(_utc(end), type=timestamps.type))
+        mask = before if mask is None else pc.and_(mask, before)
+    return table.filter(mask)
+
+
+def _read_table(path: str) -> pa.Table:
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def _read_schema(path: str) -> pa.Schema:
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).schema
+
+
+def _write_table(path: str, table: pa.Table) -> None:
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _utc(value) -> pd.Timestamp:
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tz is None else value
@@ -1,5 +1,12 @@
-import requests
+import os
 import re
+import sys
+
+import httpx
+
+import surfline_http
+from fetch_guard import RejectedPageError
+from page_cache import PageCache
 
 url = "https://www.surfline.com/surf-reports-forecasts-cams/algeria/2589581?__cf_chl_rt_tk=PrhUj.o55upwtM2BwiFkmPa3j25pj8bEdZH6SEj7oy8-1746135910-1.0.1.1-j1t5VOaOo5_7DqISubPnadkHghBO6vNfI.lzry4N2v0"
 
@@ -10,11 +17,17 @@ if match:
 else:
     file_name = "page.html"  # Fallback file name if the pattern doesn't match
 
-# Fetch the page
-response = requests.get(url)
+# Fetch the page, revalidating the cached copy if there is one
+try:
+    page = surfline_http.run(PageCache().fetch(url))
+except (RejectedPageError, httpx.HTTPError) as e:
+    print(f"❌ {e}; nothing saved.")
+    sys.exit(1)
 
-# Save the HTML to the dynamically generated file name
-with open(file_name, "w", encoding="utf-8") as f:
-    f.write(response.text)
-
-print(f"✅ HTML saved to {file_name}")
+# Save the HTML to the dynamically generated file name, unless it is unchanged
+if page.changed or not os.path.exists(file_name):
+    with open(file_name, "wb") as f:
+        f.write(page.content)
+    print(f"✅ HTML saved to {file_name}")
+else:
+    print(f"✅ {file_name} is up to date (HTTP {page.status_code}).")
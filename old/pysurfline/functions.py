@@ -1,10 +1,14 @@
 import pysurfline
 
-def get_forecast_dataframe(spot_id):
+def get_forecast_dataframe(spot_id, store=None, run=None):
     # Fetch the surf forecast
     forecasts = pysurfline.get_spot_forecasts(spot_id)
     # Convert to DataFrame
     df = forecasts.get_dataframe()
+    # Keep a copy in the columnar forecast store (see forecast_store.ForecastStore);
+    # the store needs the model run the forecast came from
+    if store is not None:
+        store.write(spot_id, df, run)
     return df
 
 if __name__ == "__main__":
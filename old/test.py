@@ -1,6 +1,13 @@
-import requests
+import os
+import sys
+
+# Also runnable as a plain script (python old/test.py): make the repo-root modules importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import json
 
+import surfline_http
+
 # Replace this with a real spot ID — you can get these from Surfline's site (they're in the URL)
 spot_id = "5842041f4e65fad6a7708805"  # Example: Steamer Lane, Santa Cruz
 
@@ -16,11 +23,8 @@ params = {
     "unit": "us"  # 'us' for feet, 'uk' for meters
 }
 
-response = requests.get(url, params=params)
-
-# Raise an error if the request failed
-response.raise_for_status()
+# Fetch over the shared pooled client (raises if the request failed)
+forecast_data = surfline_http.run(surfline_http.get_json(url, params=params))
 
 # Pretty print the full JSON response
-forecast_data = response.json()
 print(json.dumps(forecast_data, indent=2))
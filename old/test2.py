@@ -1,34 +1,24 @@
-import requests
-import getpass
-import json
+import os
+import sys
 
-def get_surfline_token(email: str, password: str) -> str:
-    url = "https://services.surfline.com/trusted/token"
-    payload = {
-        "username": email,
-        "password": password,
-        "grant_type": "password"
-    }
+# Also runnable as a plain script (python old/test2.py): make the repo-root modules importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-    headers = {
-        "Content-Type": "application/json"
-    }
+import getpass
 
-    response = requests.post(url, data=json.dumps(payload), headers=headers)
-    response.raise_for_status()
-    
-    token = response.json().get("access_token")
-    if not token:
-        raise Exception("No access token found in response.")
+import surfline_http
+from surfline_auth import SurflineAuth
 
-    return token
+async def get_surfline_token(email: str, password: str) -> str:
+    # Reuses the token saved in .surfline_token.json until it expires
+    return await SurflineAuth(email, password).get_token()
 
 if __name__ == "__main__":
     email = input("Enter your Surfline email: ")
     password = getpass.getpass("Enter your Surfline password: ")
 
     try:
-        token = get_surfline_token(email, password)
+        token = surfline_http.run(get_surfline_token(email, password))
         print("\n✅ Access token:")
         print(token)
     except Exception as e:
@@ -1,6 +1,14 @@
-import requests
+import os
+import sys
+
+# Also runnable as a plain script (python old/test3.py): make the repo-root modules importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import json
 
+import surfline_http
+from surfline_auth import SurflineAuth
+
 spot_id = "5842041f4e65fad6a7708805"
 url = "https://services.surfline.com/kbyg/spots/forecasts"
 
@@ -12,13 +20,11 @@ params = {
     "unit": "us"
 }
 
-# Paste your token here
-headers = {
-    "Authorization": "Bearer YOUR_TOKEN_HERE"
-}
+# Logs in with $SURFLINE_EMAIL / $SURFLINE_PASSWORD, or reuses the saved token
+auth = SurflineAuth()
 
-response = requests.get(url, params=params, headers=headers)
-response.raise_for_status()
+async def fetch():
+    return await surfline_http.get_json(url, params=params, headers=await auth.headers())
 
-forecast_data = response.json()
+forecast_data = surfline_http.run(fetch())
 print(json.dumps(forecast_data, indent=2))
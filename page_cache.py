@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import time
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+import surfline_http
+from fetch_guard import DEFAULT_BACKOFF, DEFAULT_RETRIES, SNIFF_BYTES, RejectedPageError, check_response
+
+DEFAULT_CACHE_DIR = ".page_cache"
+# Query parameters that change on every visit without changing the page
+# (Cloudflare challenge tokens, campaign tags).
+VOLATILE_QUERY_PREFIXES = ("__cf_chl_", "utm_")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+
+    Volatile query parameters such as ``__cf_chl_rt_tk`` and the fragment are removed,
+    the host is lowercased and the remaining parameters are sorted.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.startswith(VOLATILE_QUERY_PREFIXES)
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+class CachedPage(NamedTuple):
+    url: str
+    content: bytes
+    status_code: int
+    changed: bool  # False when the server answered 304 or sent identical bytes
+
+
+class PageCache:
+    """
+    On-disk HTTP cache for region pages, keyed by the normalized URL.
+
+    Each entry stores the body and its validators (ETag, Last-Modified and a SHA-256 of
+    the content). Fetches are conditional, and the body is only rewritten when its hash
+    changes.
+
+    Args:
+        directory (str): Directory holding the cache entries.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def _read_meta(self, meta_path: str) -> dict | None:
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return None
+
+    def _write_meta(self, meta_path: str, meta: dict) -> None:
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+    def get(self, url: str) -> bytes | None:
+        """Return the cached body for ``url`` without touching the network, or None."""
+        body_path, meta_path = self._paths(url)
+        if self._read_meta(meta_path) is None or not os.path.exists(body_path):
+            return None
+        with open(body_path, "rb") as f:
+            return f.read()
+
+    async def fetch(
+        self,
+        url: str,
+        client: httpx.AsyncClient | None = None,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> CachedPage:
+        """
+        Fetch ``url``, revalidating any cached copy.
+
+        Challenge and block pages are never written to the cache; they are retried with
+        jittered exponential backoff, as are timeouts, connection errors and 5xx responses
+        (see surfline_http.retrying).
+
+        Args:
+            url (str): The page URL.
+            client (httpx.AsyncClient, optional): Client to send the request with. Defaults
+                to the shared client from surfline_http.
+            retries (int): Retries after a challenge or block page, timeout, connection error
+                or 5xx response.
+            backoff (float): Base backoff delay in seconds.
+
+        Returns:
+            CachedPage: The current body and whether it differs from the cached copy.
+
+        Raises:
+            RejectedPageError: If every attempt returned a challenge or block page.
+            httpx.HTTPError: If the last attempt failed at the HTTP level.
+        """
+        client = client or surfline_http.get_client()
+        return await surfline_http.retrying(lambda: self._fetch_once(url, client), retries, backoff, retry_on=_retryable)
+
+    async def _fetch_once(self, url: str, client: httpx.AsyncClient) -> CachedPage:
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        if meta is not None and not os.path.exists(body_path):
+            meta = None
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        async with surfline_http.get_host_limiter().limit(url), client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and meta is not None:
+                meta["fetched_at"] = time.time()
+                self._write_meta(meta_path, meta)
+                with open(body_path, "rb") as f:
+                    return CachedPage(url, f.read(), 304, False)
+            # Classify from the first few KB so a rejected page is not downloaded in full
+            chunks = []
+            size = 0
+            head = None
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if head is None and size >= SNIFF_BYTES:
+                    head = b"".join(chunks)
+                    check_response(url, response.status_code, response.headers, head)
+                    response.raise_for_status()
+            if head is None:
+                # The whole body was shorter than SNIFF_BYTES
+                check_response(url, response.status_code, response.headers, b"".join(chunks))
+                response.raise_for_status()
+            content = b"".join(chunks)
+
+        digest = hashlib.sha256(content).hexdigest()
+        changed = meta is None or meta.get("sha256") != digest
+        if changed:
+            tmp_path = body_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, body_path)
+        self._write_meta(meta_path, {
+            "url": normalize_url(url),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest,
+            "fetched_at": time.time(),
+        })
+        return CachedPage(url, content, response.status_code, changed)
+
+
+def _retryable(error):
+    return isinstance(error, RejectedPageError) or surfline_http.is_retryable(error)
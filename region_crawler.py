@@ -0,0 +1,150 @@
+import argparse
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+import surfline_http
+from fetch_guard import DEFAULT_BACKOFF, DEFAULT_RETRIES, SNIFF_BYTES, RejectedPageError, check_response
+from spot_lookup import import_urls, load_spots
+from spots import extract_spot_links, fetch_spot_links
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_PER_HOST = 4
+
+
+async def crawl_regions(
+    region_urls,
+    spots=None,
+    max_connections=DEFAULT_MAX_CONNECTIONS,
+    per_host=DEFAULT_PER_HOST,
+    parse_workers=None,
+    timeout=surfline_http.DEFAULT_TIMEOUT,
+    streaming=True,
+    retries=DEFAULT_RETRIES,
+    backoff=DEFAULT_BACKOFF,
+    client=None,
+):
+    """
+    Fetch many Surfline region pages concurrently and register the spots they link to.
+
+    Pages are fetched over one pooled keep-alive client, with at most ``per_host``
+    requests in flight per host. By default links are scanned from the body as it
+    streams in; with ``streaming=False`` whole pages are parsed with BeautifulSoup in a
+    process pool instead. Each region's links are added to the registry as soon as
+    that region is done. Challenge and block pages are detected from the first few KB
+    and never parsed; they are retried with backoff, like timeouts, connection errors
+    and 5xx responses, before the region is marked failed.
+
+    Args:
+        region_urls (Iterable[str]): The region page URLs.
+        spots (SpotRegistry, optional): Registry to stream discovered spots into.
+            Defaults to the spots.json registry.
+        max_connections (int): Size of the connection pool.
+        per_host (int): Maximum concurrent requests per host.
+        parse_workers (int, optional): Number of parser processes when not streaming.
+            Defaults to the CPU count.
+        timeout (float | httpx.Timeout): Per-request timeout in seconds.
+        streaming (bool): Scan pages incrementally instead of building a DOM.
+        retries (int): Retries after a challenge or block page or a transient failure.
+        backoff (float): Base backoff delay in seconds.
+        client (httpx.AsyncClient, optional): Client to fetch with, e.g. one on a local
+            stand-in transport. Defaults to a new pooled client built from
+            ``max_connections`` and ``timeout``, closed when the crawl ends.
+
+    Returns:
+        tuple: A dict mapping each crawled region URL to the number of spot links found,
+            and a dict mapping each failed region URL to its error message.
+    """
+    if spots is None:
+        spots = load_spots()
+    loop = asyncio.get_running_loop()
+    host_limiter = surfline_http.HostLimiter(per_host)
+    found = {}
+    failed = {}
+
+    pool = None if streaming else ProcessPoolExecutor(max_workers=parse_workers)
+    owned = client is None
+    if owned:
+        client = surfline_http.create_client(max_connections, timeout)
+    try:
+
+        async def fetch_and_parse(url):
+            response = await client.get(url)
+            check_response(url, response.status_code, response.headers, response.content[:SNIFF_BYTES])
+            response.raise_for_status()
+            return await loop.run_in_executor(pool, extract_spot_links, response.text)
+
+        async def crawl(url):
+            async def attempt():
+                async with host_limiter.limit(url):
+                    return await (fetch_spot_links(url, client) if streaming else fetch_and_parse(url))
+
+            try:
+                links = await surfline_http.retrying(attempt, retries, backoff, retry_on=_retryable)
+            except (httpx.HTTPError, RejectedPageError) as e:
+                return url, None, str(e)
+            return url, links, None
+
+        for task in asyncio.as_completed([crawl(url) for url in dict.fromkeys(region_urls)]):
+            url, links, error = await task
+            if error is not None:
+                failed[url] = error
+                continue
+            found[url] = len(links)
+            # The journal write and fsync block; keep them off the event loop so the
+            # other regions keep streaming in meanwhile
+            added, _, _ = await asyncio.to_thread(import_urls, links, spots)
+            print(f"✅ {url}: {len(links)} links, {added} new spots.", file=sys.stderr)
+    finally:
+        if owned:
+            await client.aclose()
+        if pool is not None:
+            pool.shutdown()
+
+    return found, failed
+
+
+def _retryable(error):
+    return isinstance(error, RejectedPageError) or surfline_http.is_retryable(error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl Surfline region pages into spots.json.")
+    parser.add_argument("urls", nargs="*", help="Region page URLs.")
+    parser.add_argument("--file", help="Read region URLs from FILE, one per line ('-' reads stdin).")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS)
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--no-streaming", dest="streaming", action="store_false",
+                        help="Parse whole pages with BeautifulSoup in a process pool.")
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.file:
+        f = sys.stdin if args.file == "-" else open(args.file, "r", encoding="utf-8")
+        with f:
+            urls.extend(line.strip() for line in f if line.strip())
+
+    spots = load_spots()
+    found, failed = surfline_http.run(
+        crawl_regions(
+            urls,
+            spots,
+            max_connections=args.max_connections,
+            per_host=args.per_host,
+            parse_workers=args.parse_workers,
+            streaming=args.streaming,
+        )
+    )
+    spots.close()
+
+    for url, message in failed.items():
+        print(f"Error crawling {url}: {message}", file=sys.stderr)
+    print(f"✅ Crawled {len(found)} regions, {sum(found.values())} links, {len(failed)} failures.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
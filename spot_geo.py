@@ -0,0 +1,153 @@
+import heapq
+import math
+from typing import NamedTuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vector(lat: float, lon: float) -> tuple[float, float, float]:
+    """Convert latitude/longitude in degrees to a point on the unit sphere."""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def chord_to_km(chord: float) -> float:
+    """Convert a straight-line distance on the unit sphere to a great-circle distance in km."""
+    return 2 * math.asin(min(1.0, chord / 2)) * EARTH_RADIUS_KM
+
+
+def km_to_chord(km: float) -> float:
+    """Inverse of chord_to_km."""
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class NearbySpot(NamedTuple):
+    spot: dict
+    distance_km: float
+
+
+class _Node(NamedTuple):
+    point: tuple[float, float, float]
+    position: int
+    axis: int
+    left: "_Node | None"
+    right: "_Node | None"
+
+
+class SpotGeoIndex:
+    """
+    k-d tree over spot locations for nearest-spot and radius queries.
+
+    Spots are placed on the unit sphere, where straight-line (chord) distance orders
+    points exactly like great-circle distance, so the tree works in 3-D Euclidean space
+    and results are converted back to haversine kilometres. Spots without ``lat``/``lon``
+    are skipped.
+
+    Args:
+        spots (Iterable[dict]): Spot records, with ``lat`` and ``lon`` in degrees.
+    """
+
+    def __init__(self, spots):
+        self._spots = [spot for spot in spots if spot.get("lat") is not None and spot.get("lon") is not None]
+        points = [(to_unit_vector(spot["lat"], spot["lon"]), position) for position, spot in enumerate(self._spots)]
+        self._root = self._build(points, 0)
+
+    def __len__(self) -> int:
+        return len(self._spots)
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda item: item[0][axis])
+        median = len(points) // 2
+        point, position = points[median]
+        return _Node(
+            point,
+            position,
+            axis,
+            self._build(points[:median], depth + 1),
+            self._build(points[median + 1:], depth + 1),
+        )
+
+    def nearest(self, lat: float, lon: float, k: int = 5) -> list[NearbySpot]:
+        """
+        Find the ``k`` spots closest to a location.
+
+        Args:
+            lat (float): Latitude in degrees.
+            lon (float): Longitude in degrees.
+            k (int): Number of spots to return.
+
+        Returns:
+            list[NearbySpot]: The closest spots, nearest first.
+        """
+        target = to_unit_vector(lat, lon)
+        best = []  # max-heap of (-squared distance, position)
+
+        def visit(node):
+            if node is None:
+                return
+            distance = _squared_distance(target, node.point)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, node.position))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, node.position))
+            delta = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if delta < 0 else (node.right, node.left)
+            visit(near)
+            if len(best) < k or delta * delta < -best[0][0]:
+                visit(far)
+
+        if k > 0:
+            visit(self._root)
+        return [
+            NearbySpot(self._spots[position], chord_to_km(math.sqrt(-distance)))
+            for distance, position in sorted(best, reverse=True)
+        ]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list[NearbySpot]:
+        """
+        Find every spot within ``radius_km`` of a location.
+
+        Args:
+            lat (float): Latitude in degrees.
+            lon (float): Longitude in degrees.
+            radius_km (float): Search radius in km.
+
+        Returns:
+            list[NearbySpot]: The spots in range, nearest first.
+        """
+        target = to_unit_vector(lat, lon)
+        limit = km_to_chord(radius_km) ** 2
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            distance = _squared_distance(target, node.point)
+            if distance <= limit:
+                found.append((distance, node.position))
+            delta = target[node.axis] - node.point[node.axis]
+            if delta < 0 or delta * delta <= limit:
+                stack.append(node.left)
+            if delta >= 0 or delta * delta <= limit:
+                stack.append(node.right)
+        found.sort()
+        return [NearbySpot(self._spots[position], chord_to_km(math.sqrt(distance))) for distance, position in found]
+
+
+def _squared_distance(a, b) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
@@ -1,34 +1,40 @@
-import json
-import os
+import argparse
 import re
+import sys
+from typing import NamedTuple
+
+from spot_registry import SpotRegistry, canonical_url
 
 FILENAME = "spots.json"
 
 def load_spots():
-    if os.path.exists(FILENAME):
-        with open(FILENAME, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
+    return SpotRegistry(FILENAME)
 
 def save_spots(spots):
-    with open(FILENAME, "w") as f:
-        json.dump(spots, f, indent=2)
-        print(f"✅ Saved {len(spots)} spots to {FILENAME}.")
+    spots.compact()
+    print(f"✅ Saved {len(spots)} spots to {FILENAME}.")
+
+# Matches absolute spot URLs as well as the site-relative hrefs found on region pages.
+SPOT_URL_PATTERN = re.compile(r"(?:https?://(?:www\.)?surfline\.com)?/surf-report/([^/?#\s]+)/([^/?#\s]+)")
+
+class ParsedSpotUrls(NamedTuple):
+    """Columnar result of parse_spot_urls."""
+    names: list[str]
+    spot_ids: list[str]
+    urls: list[str]
+    rejected: list[tuple[int, str]]  # (position in the input, url)
 
 def extract_name_and_id_from_url(url):
     """
     Extract the spot name and ID from the given Surfline URL.
 
     Args:
-        url (str): The Surfline URL.
+        url (str): The Surfline URL, or a relative '/surf-report/...' href.
 
     Returns:
         tuple: A tuple containing the spot name and spot ID.
     """
-    match = re.match(r"https://www\.surfline\.com/surf-report/([^/]+)/([^/]+)", url)
+    match = SPOT_URL_PATTERN.match(url)
     if match:
         spot_name = match.group(1)  # Extract the spot name
         spot_id = match.group(2)    # Extract the spot ID
@@ -36,6 +42,91 @@ def extract_name_and_id_from_url(url):
     else:
         raise ValueError("Invalid Surfline URL format.")
 
+def parse_spot_urls(urls):
+    """
+    Parse many Surfline URLs in one pass without raising on bad input.
+
+    Args:
+        urls (Iterable[str]): Absolute URLs or relative '/surf-report/...' hrefs.
+
+    Returns:
+        ParsedSpotUrls: The names, spot IDs and input URLs of the valid rows, as
+            parallel lists, plus the (position, url) pairs that did not match.
+    """
+    names = []
+    spot_ids = []
+    parsed_urls = []
+    rejected = []
+    match = SPOT_URL_PATTERN.match
+    for position, url in enumerate(urls):
+        m = match(url)
+        if m is None:
+            rejected.append((position, url))
+            continue
+        names.append(m.group(1))
+        spot_ids.append(m.group(2))
+        parsed_urls.append(url)
+    return ParsedSpotUrls(names, spot_ids, parsed_urls, rejected)
+
+def import_urls(lines, spots):
+    """
+    Validate, deduplicate and register many spot URLs at once.
+
+    All new spots are committed with a single journal write, so an interrupted
+    import leaves the registry unchanged.
+
+    Args:
+        lines (Iterable[str]): URLs or relative hrefs, one per item. Blank lines and
+            lines starting with '#' are ignored.
+        spots (SpotRegistry): The registry to add the spots to.
+
+    Returns:
+        tuple: The number of spots added, the number of duplicates skipped, and a
+            list of (line number, url, error message) tuples for rejected URLs.
+    """
+    line_numbers = []
+    urls = []
+    for line_number, line in enumerate(lines, start=1):
+        url = line.strip()
+        if url and not url.startswith("#"):
+            line_numbers.append(line_number)
+            urls.append(url)
+
+    parsed = parse_spot_urls(urls)
+    errors = [(line_numbers[position], url, "Invalid Surfline URL format.") for position, url in parsed.rejected]
+
+    new_spots = []
+    seen = set()
+    duplicates = 0
+    for spot_name, spot_id, url in zip(parsed.names, parsed.spot_ids, parsed.urls):
+        key = spot_id.lower()
+        if key in seen or spots.contains(spot_id=spot_id, url=url):
+            duplicates += 1
+            continue
+        seen.add(key)
+        new_spots.append({
+            "name": spot_name,
+            "spotId": spot_id,
+            "url": canonical_url(url)
+        })
+
+    added = spots.add_many(new_spots)
+    return added, duplicates, errors
+
+def run_import(path):
+    spots = load_spots()
+    if path == "-":
+        added, duplicates, errors = import_urls(sys.stdin, spots)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            added, duplicates, errors = import_urls(f, spots)
+
+    for line_number, url, message in errors:
+        print(f"Error on line {line_number} ({url}): {message}", file=sys.stderr)
+    print(f"✅ Imported {added} spots ({duplicates} duplicates, {len(errors)} errors).")
+    spots.close()
+    return 1 if errors else 0
+
 def main():
     spots = load_spots()
     
@@ -46,7 +137,7 @@ def main():
             break
 
         # Check if the URL already exists in the spots list
-        if any(spot["url"] == url for spot in spots):
+        if spots.contains(url=url):
             print("⚠️ This spot is already in the list. Skipping...")
             continue
 
@@ -57,14 +148,29 @@ def main():
             print(f"Error: {e}")
             continue
 
+        if spots.contains(spot_id=spot_id):
+            print("⚠️ This spot is already in the list. Skipping...")
+            continue
+
         new_spot = {
             "name": spot_name,
             "spotId": spot_id,
-            "url": url
+            "url": canonical_url(url)
         }
 
-        spots.append(new_spot)
-        save_spots(spots)
+        spots.add(new_spot)
+        print(f"✅ Added {spot_name} ({len(spots)} spots).")
+
+    save_spots(spots)
+    spots.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add Surfline spots to spots.json.")
+    parser.add_argument(
+        "--import", dest="import_path", metavar="FILE",
+        help="Import spot URLs from FILE, one per line ('-' reads stdin, e.g. 'python spots.py | python spot_lookup.py --import -')."
+    )
+    args = parser.parse_args()
+    if args.import_path:
+        sys.exit(run_import(args.import_path))
     main()
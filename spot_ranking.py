@@ -0,0 +1,208 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Defaults are in Surfline's 'us' units: feet and knots.
+DEFAULT_MIN_HEIGHT = 1.5
+DEFAULT_IDEAL_HEIGHT = (3.0, 6.0)
+DEFAULT_MAX_HEIGHT = 12.0
+DEFAULT_MIN_PERIOD = 6.0
+DEFAULT_GOOD_PERIOD = 14.0
+DEFAULT_STRONG_WIND = 25.0
+# Factors from the unit labels Surfline reports (lowercased) to feet and knots
+FEET_PER_UNIT = {"ft": 1.0, "m": 3.28084}
+KNOTS_PER_UNIT = {"kts": 1.0, "kph": 0.539957, "mph": 0.868976}
+
+
+class ForecastArrays(NamedTuple):
+    """A batched forecast table as dense (spots, hours) arrays."""
+    spot_ids: np.ndarray  # (spots,)
+    timestamps: np.ndarray  # (hours,)
+    wave_height: np.ndarray  # (spots, hours)
+    period: np.ndarray
+    wind_speed: np.ndarray
+    wind_direction: np.ndarray  # Degrees the wind blows from
+    tide: np.ndarray
+    orientation: np.ndarray  # (spots,) degrees the beach faces, NaN if unknown
+
+
+def forecast_arrays(df, spots=None):
+    """
+    Pivot a batched forecast table into dense (spots, hours) arrays.
+
+    Args:
+        df (pd.DataFrame): Rows as returned by surfline_fetch.fetch_forecasts, with
+            ``spotId``, ``timestamp``, ``surf_max``, ``swell_period``, ``wind_speed``,
+            ``wind_direction`` and ``tide_height`` columns. Missing columns become NaN.
+        spots (Iterable[dict], optional): Spot records; an ``orientation`` field (degrees
+            the beach faces) enables the offshore-wind term.
+
+    Returns:
+        ForecastArrays: The forecast, with NaN where a spot has no row for an hour.
+    """
+    columns = {
+        "wave_height": "surf_max",
+        "period": "swell_period",
+        "wind_speed": "wind_speed",
+        "wind_direction": "wind_direction",
+        "tide": "tide_height",
+    }
+    df = df.drop_duplicates(["spotId", "timestamp"], keep="last")
+    df = df.reindex(columns=["spotId", "timestamp", *columns.values()])
+    wide = df.set_index(["spotId", "timestamp"]).unstack("timestamp")
+    spot_ids = wide.index.to_numpy()
+    timestamps = wide[columns["wave_height"]].columns.to_numpy()
+
+    orientations = {spot["spotId"]: spot.get("orientation") for spot in spots or ()}
+    orientation = np.array([orientations.get(spot_id, np.nan) for spot_id in spot_ids], dtype=float)
+
+    return ForecastArrays(
+        spot_ids,
+        timestamps,
+        orientation=orientation,
+        **{name: wide[column].to_numpy(dtype=float) for name, column in columns.items()},
+    )
+
+
+def to_scoring_units(wave_height, wind_speed, height_unit="ft", speed_unit="kts"):
+    """
+    Convert wave heights and wind speeds into the feet and knots the scoring defaults assume.
+
+    Args:
+        wave_height, wind_speed (np.ndarray): Values in ``height_unit`` and ``speed_unit``.
+        height_unit (str): One of FEET_PER_UNIT, case-insensitive.
+        speed_unit (str): One of KNOTS_PER_UNIT, case-insensitive.
+
+    Returns:
+        tuple: The wave heights in feet and the wind speeds in knots.
+
+    Raises:
+        ValueError: If a unit is not known.
+    """
+    height_unit, speed_unit = height_unit.lower(), speed_unit.lower()
+    if height_unit not in FEET_PER_UNIT or speed_unit not in KNOTS_PER_UNIT:
+        raise ValueError(f"Cannot score forecasts in {height_unit} and {speed_unit}.")
+    return (
+        np.asarray(wave_height, dtype=float) * FEET_PER_UNIT[height_unit],
+        np.asarray(wind_speed, dtype=float) * KNOTS_PER_UNIT[speed_unit],
+    )
+
+
+def score_forecasts(
+    wave_height,
+    period,
+    wind_speed,
+    wind_direction,
+    tide=None,
+    orientation=None,
+    min_height=DEFAULT_MIN_HEIGHT,
+    ideal_height=DEFAULT_IDEAL_HEIGHT,
+    max_height=DEFAULT_MAX_HEIGHT,
+    min_period=DEFAULT_MIN_PERIOD,
+    good_period=DEFAULT_GOOD_PERIOD,
+    strong_wind=DEFAULT_STRONG_WIND,
+):
+    """
+    Score every spot and hour in one vectorized pass.
+
+    The score is the product of a size term (ramping up to the ideal height range and
+    down again towards ``max_height``), a period term, a wind term (strong onshore wind
+    is penalized, offshore is not) and a tide term (mild penalty at the extremes of each
+    spot's own tide range). Hours with missing wave data score 0.
+
+    Args:
+        wave_height, period, wind_speed, wind_direction (np.ndarray): (spots, hours) arrays.
+        tide (np.ndarray, optional): (spots, hours) tide heights.
+        orientation (np.ndarray, optional): (spots,) degrees each beach faces, NaN if unknown.
+        min_height, ideal_height, max_height (float): Wave height thresholds.
+        min_period, good_period (float): Period below which waves score nothing, and at
+            which they score fully.
+        strong_wind (float): Onshore wind speed at which the wind term reaches 0.
+
+    Returns:
+        np.ndarray: (spots, hours) scores between 0 and 1.
+    """
+    wave_height = np.asarray(wave_height, dtype=float)
+    ideal_low, ideal_high = ideal_height
+    size = np.minimum(
+        (wave_height - min_height) / (ideal_low - min_height),
+        (max_height - wave_height) / (max_height - ideal_high),
+    )
+    size = np.clip(size, 0.0, 1.0)
+
+    period_score = np.clip((np.asarray(period, dtype=float) - min_period) / (good_period - min_period), 0.0, 1.0)
+    period_score = 0.5 + 0.5 * np.nan_to_num(period_score, nan=0.5)
+
+    # Alignment with the offshore direction: 1 offshore, -1 onshore, 0 cross-shore or unknown
+    if orientation is None:
+        alignment = np.zeros_like(wave_height)
+    else:
+        offshore = np.asarray(orientation, dtype=float)[:, None] + 180.0
+        alignment = np.nan_to_num(np.cos(np.radians(np.asarray(wind_direction, dtype=float) - offshore)))
+    strength = np.nan_to_num(np.clip(np.asarray(wind_speed, dtype=float) / strong_wind, 0.0, 1.0))
+    wind_score = 1.0 - strength * (1.0 - alignment) / 2.0
+
+    tide_score = 1.0
+    if tide is not None:
+        tide = np.asarray(tide, dtype=float)
+        low = np.min(tide, axis=1, keepdims=True, initial=np.inf, where=~np.isnan(tide))
+        high = np.max(tide, axis=1, keepdims=True, initial=-np.inf, where=~np.isnan(tide))
+        position = (tide - low) / np.where(high > low, high - low, 1.0)
+        tide_score = np.nan_to_num(1.0 - 0.25 * np.abs(2.0 * position - 1.0), nan=1.0)
+
+    return np.nan_to_num(size, nan=0.0) * period_score * wind_score * tide_score
+
+
+class RankedSpot(NamedTuple):
+    spot_id: str
+    timestamp: object  # Start of the best hour
+    score: float
+
+
+def rank_spots(arrays, top_n=10, start=None, end=None, **score_options):
+    """
+    Rank spots by their best forecast hour.
+
+    Args:
+        arrays (ForecastArrays): The batched forecast, e.g. from forecast_arrays.
+        top_n (int): Number of spots to return.
+        start, end (datetime-like, optional): Only consider hours in [start, end).
+        **score_options: Thresholds forwarded to score_forecasts.
+
+    Returns:
+        list[RankedSpot]: The best ``top_n`` spots with their best hour, best first.
+    """
+    scores = score_forecasts(
+        arrays.wave_height,
+        arrays.period,
+        arrays.wind_speed,
+        arrays.wind_direction,
+        arrays.tide,
+        arrays.orientation,
+        **score_options,
+    )
+    timestamps = pd.DatetimeIndex(arrays.timestamps)
+    window = np.ones(len(timestamps), dtype=bool)
+    if start is not None:
+        window &= timestamps >= _align_timezone(start, timestamps)
+    if end is not None:
+        window &= timestamps < _align_timezone(end, timestamps)
+    scores = np.where(window[None, :], scores, -1.0)
+    if scores.size == 0 or not window.any():
+        return []
+
+    best_hour = scores.argmax(axis=1)
+    best_score = scores[np.arange(len(scores)), best_hour]
+    top_n = min(top_n, len(best_score))
+    top = np.argpartition(-best_score, top_n - 1)[:top_n]
+    top = top[np.argsort(-best_score[top], kind="stable")]
+    return [RankedSpot(arrays.spot_ids[i], timestamps[best_hour[i]], float(best_score[i])) for i in top]
+
+
+def _align_timezone(value, timestamps):
+    # Naive bounds are taken to be in the timezone of the forecast (UTC for fetched data)
+    value = pd.Timestamp(value)
+    if timestamps.tz is not None and value.tz is None:
+        return value.tz_localize(timestamps.tz)
+    return value
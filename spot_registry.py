@@ -0,0 +1,290 @@
+import json
+import os
+import shutil
+import threading
+from urllib.parse import urlsplit
+
+DEFAULT_FILENAME = "spots.json"
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".compacting"
+DEFAULT_COMPACT_THRESHOLD = 1000
+SURFLINE_HOST = "www.surfline.com"
+
+
+def normalize_spot_id(spot_id: str) -> str:
+    """Normalize a spotId for comparisons (Surfline ids are case-insensitive hex)."""
+    return spot_id.strip().lower()
+
+
+def canonical_url(url: str) -> str:
+    """
+    Reduce a spot URL to a canonical form for duplicate detection.
+
+    The scheme and host are normalized, query strings and fragments are dropped, and
+    trailing slashes are removed, so ``.../annaba/584204214e65fad6a7709ce5/?view=cam``
+    and ``.../annaba/584204214e65fad6a7709ce5`` map to the same key.
+
+    Args:
+        url (str): An absolute or site-relative Surfline URL.
+
+    Returns:
+        str: The canonical URL.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or SURFLINE_HOST).lower()
+    if host == "surfline.com":
+        host = SURFLINE_HOST
+    path = parts.path.rstrip("/")
+    return f"https://{host}{path}"
+
+
+class SpotRegistry:
+    """
+    Append-only store for surf spots.
+
+    The registry keeps a JSON snapshot (``spots.json``, same format as before) plus a
+    journal of JSON lines next to it. Inserts append a single record to the journal, so
+    their cost does not depend on the size of the snapshot. Once the journal grows past
+    ``compact_threshold`` records it is folded back into the snapshot on a background
+    thread.
+
+    Args:
+        filename (str): Path of the JSON snapshot.
+        compact_threshold (int): Number of journal records that triggers a compaction.
+    """
+
+    def __init__(self, filename: str = DEFAULT_FILENAME, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        self.filename = filename
+        self.journal_filename = filename + JOURNAL_SUFFIX
+        self.compact_threshold = compact_threshold
+        self._spots: list[dict] = []
+        self._index: dict[str, int] = {}
+        self._url_index: dict[str, int] = {}
+        self._journal = None
+        self._journal_records = 0
+        self._lock = threading.Lock()
+        self._compactor: threading.Thread | None = None
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._spots)
+
+    def __iter__(self):
+        return iter(list(self._spots))
+
+    def __getitem__(self, position: int) -> dict:
+        return self._spots[position]
+
+    def get(self, spot_id: str) -> dict | None:
+        """Return the spot stored under ``spot_id``, or None."""
+        position = self._index.get(normalize_spot_id(spot_id))
+        return None if position is None else self._spots[position]
+
+    def find_url(self, url: str) -> dict | None:
+        """Return the spot whose canonical URL matches ``url``, or None."""
+        position = self._url_index.get(canonical_url(url))
+        return None if position is None else self._spots[position]
+
+    def contains(self, spot_id: str | None = None, url: str | None = None) -> bool:
+        """Check whether a spot is registered, by spotId and/or URL."""
+        if spot_id is not None and normalize_spot_id(spot_id) in self._index:
+            return True
+        return url is not None and canonical_url(url) in self._url_index
+
+    def load(self) -> None:
+        """Load the snapshot and replay any journal records on top of it."""
+        with self._lock:
+            self._spots = []
+            self._index = {}
+            self._url_index = {}
+            if os.path.exists(self.filename):
+                with open(self.filename, "r") as f:
+                    try:
+                        snapshot = json.load(f)
+                    except json.JSONDecodeError:
+                        snapshot = []
+                for spot in snapshot:
+                    self._upsert(spot)
+            # A leftover ``.compacting`` file means a compaction was interrupted
+            # before the new snapshot replaced the old one.
+            self._journal_records = 0
+            compacting = self.journal_filename + COMPACTING_SUFFIX
+            for path in (compacting, self.journal_filename):
+                for spot in _read_journal(path):
+                    self._upsert(spot)
+                    self._journal_records += 1
+            if os.path.exists(compacting):
+                # Finish it now, so a later compaction never has to rotate over its records.
+                self._write_snapshot(list(self._spots))
+
+    def add(self, spot: dict) -> bool:
+        """
+        Insert a spot unless its spotId or canonical URL is already registered.
+
+        Args:
+            spot (dict): The spot record, with at least ``spotId``.
+
+        Returns:
+            bool: True if the spot was added.
+        """
+        return self.add_many([spot]) == 1
+
+    def add_many(self, spots) -> int:
+        """
+        Insert several spots with a single atomic journal write and fsync.
+
+        Args:
+            spots (Iterable[dict]): The spot records.
+
+        Returns:
+            int: The number of spots that were actually added.
+        """
+        with self._lock:
+            added = []
+            for spot in spots:
+                if self.contains(spot["spotId"], spot.get("url")):
+                    continue
+                self._upsert(spot)
+                added.append(spot)
+            self._append(added)
+        self._maybe_compact()
+        return len(added)
+
+    def update(self, spot: dict) -> None:
+        """Insert or replace the spot with the same spotId."""
+        self.update_many([spot])
+
+    def update_many(self, spots) -> None:
+        """Insert or replace several spots with a single atomic journal write and fsync."""
+        with self._lock:
+            spots = list(spots)
+            for spot in spots:
+                self._upsert(spot)
+            self._append(spots)
+        self._maybe_compact()
+
+    def compact(self, wait: bool = True) -> None:
+        """
+        Fold the journal into the snapshot.
+
+        Args:
+            wait (bool): Block until the new snapshot is written. When False the
+                snapshot is written on a background thread.
+        """
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                compactor = self._compactor
+            else:
+                compactor = self._start_compaction()
+        if wait and compactor is not None:
+            compactor.join()
+
+    def close(self) -> None:
+        """Wait for a running compaction and close the journal."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _upsert(self, spot: dict) -> None:
+        key = normalize_spot_id(spot["spotId"])
+        position = self._index.get(key)
+        if position is None:
+            position = len(self._spots)
+            self._index[key] = position
+            self._spots.append(spot)
+        else:
+            old_url = self._spots[position].get("url")
+            if old_url and self._url_index.get(canonical_url(old_url)) == position:
+                del self._url_index[canonical_url(old_url)]
+            self._spots[position] = spot
+        if spot.get("url"):
+            self._url_index.setdefault(canonical_url(spot["url"]), position)
+
+    def _append(self, spots: list[dict]) -> None:
+        if not spots:
+            return
+        if self._journal is None:
+            self._journal = open(self.journal_filename, "a", encoding="utf-8")
+            if not _ends_with_newline(self.journal_filename):
+                # End a torn last line left by a crash, or this record would be read as part of it.
+                self._journal.write("\n")
+        # A batch is journaled as one line, so a torn write drops the whole batch
+        # instead of leaving half of it behind.
+        record = spots[0] if len(spots) == 1 else spots
+        self._journal.write(json.dumps(record) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_records += len(spots)
+
+    def _maybe_compact(self) -> None:
+        if self._journal_records >= self.compact_threshold:
+            self.compact(wait=False)
+
+    def _start_compaction(self) -> threading.Thread | None:
+        # Called with the lock held: rotate the journal so new inserts keep going
+        # to a fresh file while the snapshot is rewritten from a copy.
+        if self._journal_records == 0 and not os.path.exists(self.journal_filename + COMPACTING_SUFFIX):
+            return None
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        compacting = self.journal_filename + COMPACTING_SUFFIX
+        if os.path.exists(self.journal_filename):
+            if os.path.exists(compacting):
+                # An earlier compaction failed before its snapshot was written, so its
+                # records are only in the ``.compacting`` file: add to it, never replace it.
+                with open(self.journal_filename, "rb") as src, open(compacting, "ab") as dst:
+                    # The newline ends a torn last line, which is then skipped on replay.
+                    dst.write(b"\n")
+                    shutil.copyfileobj(src, dst)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_filename)
+            else:
+                os.replace(self.journal_filename, compacting)
+        self._journal_records = 0
+        snapshot = list(self._spots)
+        self._compactor = threading.Thread(target=self._write_snapshot, args=(snapshot,), daemon=True)
+        self._compactor.start()
+        return self._compactor
+
+    def _write_snapshot(self, snapshot: list[dict]) -> None:
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, "w") as f:
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+        if os.path.exists(self.journal_filename + COMPACTING_SUFFIX):
+            os.remove(self.journal_filename + COMPACTING_SUFFIX)
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _read_journal(path: str):
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn last line from a crash mid-append; everything before it is intact.
+                continue
+            if isinstance(record, list):
+                yield from record
+            else:
+                yield record
@@ -0,0 +1,121 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import NamedTuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Words that show up in chat queries but never identify a spot.
+STOPWORDS = frozenset("""
+    a an and any at best beach break by conditions for forecast how i in is it like look
+    looking me near of on or please report s show spot spots surf surfing swell tell the
+    there to today tomorrow waves weather what whats where will with
+""".split())
+MIN_SIMILARITY = 0.5
+MAX_FUZZY_TOKENS = 8
+
+
+def tokenize(text: str) -> list[str]:
+    """Split free text or a spot slug into lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(token: str) -> set[str]:
+    """Return the character trigrams of a token, padded so short tokens still have some."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SpotMatch(NamedTuple):
+    spot: dict
+    score: float  # Fraction of the spot name matched, 0..1
+
+
+class SpotResolver:
+    """
+    Maps free text to spots using inverted indexes over the spot names.
+
+    Spot names are split into tokens; an index maps each token to the spots whose name
+    contains it, and a trigram index over the token vocabulary finds misspelt tokens.
+    Candidates are ranked by how much of their name the query covers.
+
+    Args:
+        spots (Iterable[dict]): Spot records with ``name`` and ``spotId``.
+    """
+
+    def __init__(self, spots):
+        self._spots: list[dict] = []
+        self._name_lengths: list[int] = []
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        self._trigram_postings: dict[str, list[str]] = defaultdict(list)
+        self._token_trigrams: dict[str, frozenset[str]] = {}
+        for spot in spots:
+            self.add(spot)
+
+    def __len__(self) -> int:
+        return len(self._spots)
+
+    def add(self, spot: dict) -> None:
+        """Index one more spot."""
+        position = len(self._spots)
+        tokens = set(tokenize(spot["name"]))
+        self._spots.append(spot)
+        self._name_lengths.append(len(tokens))
+        for token in tokens:
+            if token not in self._postings:
+                grams = frozenset(trigrams(token))
+                self._token_trigrams[token] = grams
+                for gram in grams:
+                    self._trigram_postings[gram].append(token)
+            self._postings[token].append(position)
+
+    def _similar_tokens(self, token: str) -> list[tuple[str, float]]:
+        if token in self._postings:
+            return [(token, 1.0)]
+        grams = trigrams(token)
+        # A token can only reach MIN_SIMILARITY if it shares at least min_shared trigrams,
+        # so it must appear in the postings of the rarest len(grams) - min_shared + 1 of them.
+        # Scanning only those skips the very common padded prefix trigrams.
+        min_candidate_size = MIN_SIMILARITY * len(grams) / (2 - MIN_SIMILARITY)
+        min_shared = max(1, math.ceil(MIN_SIMILARITY * (len(grams) + min_candidate_size) / 2))
+        rarest = sorted(grams, key=lambda gram: len(self._trigram_postings.get(gram, ())))
+        candidates = set()
+        for gram in rarest[:len(grams) - min_shared + 1]:
+            candidates.update(self._trigram_postings.get(gram, ()))
+        similar = []
+        for candidate in candidates:
+            candidate_grams = self._token_trigrams[candidate]
+            # Dice coefficient over trigram sets
+            similarity = 2 * len(grams & candidate_grams) / (len(grams) + len(candidate_grams))
+            if similarity >= MIN_SIMILARITY:
+                similar.append((candidate, similarity))
+        similar.sort(key=lambda item: item[1], reverse=True)
+        return similar[:MAX_FUZZY_TOKENS]
+
+    def resolve(self, text: str, k: int = 5) -> list[SpotMatch]:
+        """
+        Find the spots the text most likely refers to.
+
+        Args:
+            text (str): Free text, e.g. a chat message.
+            k (int): Maximum number of candidates to return.
+
+        Returns:
+            list[SpotMatch]: Up to ``k`` candidates, best first.
+        """
+        # For each spot, the best similarity reached by each of its name tokens
+        matched: dict[int, dict[str, float]] = defaultdict(dict)
+        for query_token in dict.fromkeys(tokenize(text)):
+            if query_token in STOPWORDS:
+                continue
+            for token, similarity in self._similar_tokens(query_token):
+                for position in self._postings[token]:
+                    best = matched[position]
+                    if similarity > best.get(token, 0.0):
+                        best[token] = similarity
+
+        ranked = []
+        for position, tokens in matched.items():
+            total = sum(tokens.values())
+            ranked.append((total / self._name_lengths[position], total, position))
+        return [SpotMatch(self._spots[position], score) for score, _, position in heapq.nlargest(k, ranked)]
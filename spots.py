@@ -1,25 +1,136 @@
-import requests
 from bs4 import BeautifulSoup
 import re
+import sys
 
-url = "https://www.surfline.com/surf-reports-forecasts-cams/algeria/2589581"
-response = requests.get(url)
-soup = BeautifulSoup(response.text, 'html.parser')
+import surfline_http
+from fetch_guard import SNIFF_BYTES, check_response
 
-links = []
-for a in soup.find_all('a', href=True):
-    href = a['href']
-    # Match surf spot links
-    if re.match(r"^/surf-report/[^/]+/\d+", href):
-        full_url = "https://www.surfline.com" + href
-        links.append(full_url)
+REGION_URL = "https://www.surfline.com/surf-reports-forecasts-cams/algeria/2589581"
+SURFLINE_BASE_URL = "https://www.surfline.com"
+SPOT_HREF_PATTERN = re.compile(r"^/surf-report/[^/]+/\d+")
+# Same links as SPOT_HREF_PATTERN, matched directly on the raw bytes of the page.
+# The closing quote is required so a match cut off at a chunk boundary is never reported.
+SPOT_HREF_BYTES_PATTERN = re.compile(rb"""href\s*=\s*["'](/surf-report/[^/"']+/\d[^"']*)["']""")
+MAX_HREF_BYTES = 2048
+CHUNK_SIZE = 64 * 1024
 
-print(f"Found {len(links)} links to surf spots in Algeria.")
+def extract_spot_links(html):
+    """
+    Collect the surf spot links from a Surfline region page.
 
-# Print or save to a text file
-for link in links:
-    print(link)
+    Args:
+        html (str): The region page HTML.
 
-# Optional: save to text
-# with open("algeria_links.txt", "w") as f:
-#     f.write("\n".join(links))
+    Returns:
+        list: Absolute URLs of the surf spots linked from the page.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    links = []
+    for a in soup.find_all('a', href=True):
+        href = a['href']
+        # Match surf spot links
+        if SPOT_HREF_PATTERN.match(href):
+            full_url = SURFLINE_BASE_URL + href
+            links.append(full_url)
+    return links
+
+class SpotLinkScanner:
+    """
+    Incrementally extracts surf spot links from a region page as its bytes arrive.
+
+    Unlike extract_spot_links, no DOM is built: each chunk is scanned with a compiled
+    regex and only a short tail is carried over to catch links split across chunks.
+    """
+
+    def __init__(self):
+        self._tail = b""
+
+    def feed(self, chunk):
+        """
+        Scan the next chunk of the page.
+
+        Args:
+            chunk (bytes): The next bytes of the response body.
+
+        Returns:
+            list: Absolute URLs of the spot links completed by this chunk.
+        """
+        buffer = self._tail + chunk
+        links = []
+        end = 0
+        for match in SPOT_HREF_BYTES_PATTERN.finditer(buffer):
+            links.append(SURFLINE_BASE_URL + match.group(1).decode("utf-8", "replace"))
+            end = match.end()
+        self._tail = buffer[max(end, len(buffer) - MAX_HREF_BYTES):]
+        return links
+
+def iter_spot_links(chunks):
+    """
+    Yield surf spot links from an iterable of response body chunks.
+
+    Args:
+        chunks (Iterable[bytes]): The page body, split into chunks.
+
+    Yields:
+        str: Absolute URLs of the surf spots, in page order.
+    """
+    scanner = SpotLinkScanner()
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+
+async def fetch_spot_links(url, client=None):
+    """
+    Stream a region page and scan it for surf spot links as it arrives.
+
+    Challenge and block pages are refused from their first few KB instead of being
+    scanned (and reported as having no links).
+
+    Args:
+        url (str): The region page URL.
+        client (httpx.AsyncClient, optional): Client to send the request with. Defaults
+            to the shared client from surfline_http.
+
+    Returns:
+        list: Absolute URLs of the surf spots, in page order.
+
+    Raises:
+        RejectedPageError: If the server answered with a challenge or block page.
+        httpx.HTTPError: If the request failed.
+    """
+    client = client or surfline_http.get_client()
+    scanner = SpotLinkScanner()
+    links = []
+    head = b""
+    async with client.stream("GET", url) as response:
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            if head is not None:
+                head += chunk
+                if len(head) < SNIFF_BYTES:
+                    continue
+                check_response(url, response.status_code, response.headers, head)
+                response.raise_for_status()
+                chunk, head = head, None
+            links.extend(scanner.feed(chunk))
+        if head is not None:
+            # The whole body was shorter than SNIFF_BYTES
+            check_response(url, response.status_code, response.headers, head)
+            response.raise_for_status()
+            links.extend(scanner.feed(head))
+    return links
+
+def main():
+    links = surfline_http.run(fetch_spot_links(REGION_URL))
+
+    print(f"Found {len(links)} links to surf spots in Algeria.", file=sys.stderr)
+
+    # Print or save to a text file
+    for link in links:
+        print(link)
+
+    # Optional: save to text
+    # with open("algeria_links.txt", "w") as f:
+    #     f.write("\n".join(links))
+
+if __name__ == "__main__":
+    main()
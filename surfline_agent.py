@@ -1,29 +1,109 @@
+import asyncio
 from typing import Sequence
+import httpx
+import pandas as pd
 from pydantic import BaseModel
 from autogen_agentchat.agents import BaseChatAgent
 from autogen_agentchat.base import Response
 from autogen_agentchat.messages import BaseChatMessage, TextMessage
 from autogen_core import CancellationToken
 from autogen_core.tools import BaseTool
+from forecast_cache import ForecastCache
+from forecast_digest import digest_forecast, local_date, local_day_window
+from spot_lookup import load_spots
+from spot_geo import SpotGeoIndex
+from spot_ranking import forecast_arrays, rank_spots
+from spot_resolver import SpotResolver
+from surfline_auth import AuthError, default_auth
+from surfline_fetch import fetch_forecast, forecast_orientation, forecast_to_dataframe
+from surfline_intents import INTENT_CONDITIONS, Intent, parse_intent
+
+# Nearby spots compared when answering "best spot near X"
+NEARBY_CANDIDATES = 8
+
+# Shared by every SurflineQueryTool so concurrent chat sessions reuse each other's fetches
+FORECAST_CACHE = ForecastCache()
+_SPOTS: list[dict] | None = None
+_SPOT_RESOLVER: SpotResolver | None = None
+_SPOT_GEO_INDEX: SpotGeoIndex | None = None
+
+def _shared_spots() -> list[dict]:
+    global _SPOTS
+    if _SPOTS is None:
+        spots = load_spots()
+        _SPOTS = list(spots)
+        spots.close()
+    return _SPOTS
+
+def get_spot_resolver() -> SpotResolver:
+    """Return the shared spot-name resolver, building it from spots.json on first use."""
+    global _SPOT_RESOLVER
+    if _SPOT_RESOLVER is None:
+        _SPOT_RESOLVER = SpotResolver(_shared_spots())
+    return _SPOT_RESOLVER
+
+def get_spot_geo_index() -> SpotGeoIndex:
+    """Return the shared spot location index, building it from spots.json on first use."""
+    global _SPOT_GEO_INDEX
+    if _SPOT_GEO_INDEX is None:
+        _SPOT_GEO_INDEX = SpotGeoIndex(_shared_spots())
+    return _SPOT_GEO_INDEX
 
 # Tool Argument and Return Types
 class SurflineQueryArgs(BaseModel):
     query: str  # The query to send to Surfline (e.g., location or surf conditions)
+    spot_id: str | None = None  # Surfline spotId, when already known
+    days: int = 1  # Number of forecast days
+    interval_hours: int = 1  # Forecast interval
+    unit: str = "us"  # 'us' for feet, 'uk' for meters
+    day_offset: int | None = None  # Only report this day (0 for today, 1 for tomorrow, ...), in the spot's local time
+
+class SurflineNearbyArgs(BaseModel):
+    lat: float | None = None  # Latitude of the user, in degrees
+    lon: float | None = None  # Longitude of the user, in degrees
+    place: str | None = None  # Or the name of a known spot to search around
+    k: int = 5  # Number of spots to return
+    radius_km: float | None = None  # Return every spot within this radius instead of the k nearest
 
 class SurflineQueryReturn(BaseModel):
     success: bool
-    message: str  # The response message
-    data: dict | None = None  # Optional: Store additional data from Surfline
+    message: str  # The response message, kept short since it goes into the chat
+    data: dict | None = None  # Optional: Store additional data from Surfline (e.g. the full forecast)
 
 # SurflineQuery Tool
 class SurflineQueryTool(BaseTool[SurflineQueryArgs, SurflineQueryReturn]):
-    def __init__(self):
+    def __init__(self, cache: ForecastCache | None = None, resolver: SpotResolver | None = None):
         super().__init__(
             args_type=SurflineQueryArgs,
             return_type=SurflineQueryReturn,
             name="SurflineQuery",
             description="Queries Surfline for surf conditions or recommendations."
         )
+        self._cache = cache if cache is not None else FORECAST_CACHE
+        self._resolver = resolver
+
+    @property
+    def resolver(self) -> SpotResolver:
+        return self._resolver if self._resolver is not None else get_spot_resolver()
+
+    async def get_forecast(self, spot_id: str, days: int = 1, interval_hours: int = 1, unit: str = "us") -> dict:
+        """
+        Return the forecast of a spot, from the cache when a fresh copy exists.
+
+        Args:
+            spot_id (str): The Surfline spotId.
+            days (int): Number of forecast days.
+            interval_hours (int): Forecast interval in hours.
+            unit (str): 'us' for feet, 'uk' for meters.
+
+        Returns:
+            dict: The raw forecast response.
+        """
+        async def fetch() -> dict:
+            # Shared keep-alive client: no TLS handshake per tool call
+            return await fetch_forecast(None, spot_id, days, interval_hours, unit, auth=default_auth())
+
+        return await self._cache.get((spot_id, days, interval_hours, unit), fetch)
 
     async def run(self, args: SurflineQueryArgs, cancellation_token: CancellationToken = None) -> SurflineQueryReturn:
         """
@@ -36,30 +116,111 @@ class SurflineQueryTool(BaseTool[SurflineQueryArgs, SurflineQueryReturn]):
         Returns:
             SurflineQueryReturn: The result of the query.
         """
-        # Placeholder for custom logic to query Surfline
-        # Replace this with actual API calls or scraping logic
         query = args.query
         print(f"[DEBUG] Querying Surfline with: {query}")
 
-        # Simulate a successful response
-        response_data = {
-            "location": "San Diego",
-            "wave_height": "3-4 ft",
-            "wind": "Light offshore",
-            "water_temp": "58°F"
-        }
+        # Map the free text to a spot locally instead of asking the model which spot was meant
+        candidates = []
+        spot_id = args.spot_id
+        spot_name = query
+        orientation = None
+        if spot_id is None:
+            matches = self.resolver.resolve(query, k=5)
+            if not matches:
+                return SurflineQueryReturn(success=False, message=f"No Surfline spot matches '{query}'.")
+            spot_id = matches[0].spot["spotId"]
+            spot_name = matches[0].spot["name"]
+            orientation = matches[0].spot.get("orientation")
+            candidates = [{"name": m.spot["name"], "spotId": m.spot["spotId"], "score": m.score} for m in matches]
+
+        try:
+            forecast = await self.get_forecast(spot_id, args.days, args.interval_hours, args.unit)
+        except (httpx.HTTPError, AuthError, ValueError) as e:
+            # ValueError: a 200 whose body is not JSON, e.g. a challenge or HTML error page
+            return SurflineQueryReturn(success=False, message=f"Could not fetch the forecast for {spot_name}: {e}")
 
+        if orientation is None:
+            # Spots not yet located with surfline_fetch --locate
+            orientation = forecast_orientation(forecast)
+
+        # Only a bounded digest goes into the chat; the full forecast stays in data
+        message = digest_forecast(spot_name, spot_id, forecast, orientation, day_offset=args.day_offset)
+        if len(candidates) > 1:
+            message += "\nOther matching spots: " + ", ".join(c["name"] for c in candidates[1:])
         return SurflineQueryReturn(
             success=True,
-            message=f"Surf conditions for {query}: {response_data}",
-            data=response_data
+            message=message,
+            data={"spotId": spot_id, "name": spot_name, "candidates": candidates, "forecast": forecast}
+        )
+
+# SurflineNearby Tool
+class SurflineNearbyTool(BaseTool[SurflineNearbyArgs, SurflineQueryReturn]):
+    def __init__(self, geo_index: SpotGeoIndex | None = None, resolver: SpotResolver | None = None):
+        super().__init__(
+            args_type=SurflineNearbyArgs,
+            return_type=SurflineQueryReturn,
+            name="SurflineNearby",
+            description="Finds the surf spots closest to a location (lat/lon or a spot name)."
+        )
+        self._geo_index = geo_index
+        self._resolver = resolver
+
+    @property
+    def geo_index(self) -> SpotGeoIndex:
+        return self._geo_index if self._geo_index is not None else get_spot_geo_index()
+
+    @property
+    def resolver(self) -> SpotResolver:
+        return self._resolver if self._resolver is not None else get_spot_resolver()
+
+    async def run(self, args: SurflineNearbyArgs, cancellation_token: CancellationToken = None) -> SurflineQueryReturn:
+        """
+        Finds the surf spots closest to a location.
+
+        Args:
+            args (SurflineNearbyArgs): The location and how many spots to return.
+            cancellation_token (CancellationToken): The cancellation token for the operation.
+
+        Returns:
+            SurflineQueryReturn: The nearby spots, nearest first.
+        """
+        lat, lon, origin = args.lat, args.lon, f"{args.lat}, {args.lon}"
+        if lat is None or lon is None:
+            if not args.place:
+                return SurflineQueryReturn(success=False, message="A location (lat/lon or place) is required.")
+            located = [m.spot for m in self.resolver.resolve(args.place, k=5) if m.spot.get("lat") is not None]
+            if not located:
+                return SurflineQueryReturn(success=False, message=f"No located Surfline spot matches '{args.place}'.")
+            lat, lon, origin = located[0]["lat"], located[0]["lon"], located[0]["name"]
+
+        if args.radius_km is not None:
+            nearby = self.geo_index.within(lat, lon, args.radius_km)
+        else:
+            nearby = self.geo_index.nearest(lat, lon, args.k)
+        if not nearby:
+            return SurflineQueryReturn(success=False, message=f"No surf spots found near {origin}.")
+
+        spots = [
+            {
+                "name": n.spot["name"],
+                "spotId": n.spot["spotId"],
+                "distance_km": round(n.distance_km, 1),
+                "orientation": n.spot.get("orientation"),
+            }
+            for n in nearby
+        ]
+        listing = ", ".join(f"{spot['name']} ({spot['distance_km']} km)" for spot in spots)
+        return SurflineQueryReturn(
+            success=True,
+            message=f"Surf spots near {origin}: {listing}",
+            data={"lat": lat, "lon": lon, "spots": spots}
         )
 
 # Surfline Agent
 class SurflineAgent(BaseChatAgent):
     def __init__(self, name: str):
         super().__init__(name, "An agent that queries Surfline for surf conditions and recommendations.")
-        self.tools = [SurflineQueryTool()]
+        self.tools = [SurflineQueryTool(), SurflineNearbyTool()]
 
     @property
     def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
@@ -79,13 +240,92 @@ class SurflineAgent(BaseChatAgent):
         last_message = messages[-1].content
         print(f"[DEBUG] Received message: {last_message}")
 
-        # Always invoke the Surfline query tool
+        # Fast path: structured requests are answered from the forecast cache and the
+        # local spot indexes, without handing the whole message to the query tool
+        intent = parse_intent(last_message)
+        if intent is not None:
+            result_obj = await self._answer_intent(intent, cancellation_token)
+            # A failed fetch is reported as is: retrying it through the query tool would only
+            # repeat the same requests
+            if result_obj is not None:
+                return Response(chat_message=TextMessage(content=result_obj.message, source=self.name))
+
+        # Open-ended request, or no known spot matched: invoke the Surfline query tool with the whole message
         query_tool: SurflineQueryTool = self.tools[0]
         result_obj = await query_tool.run(SurflineQueryArgs(query=last_message), cancellation_token)
         reply = result_obj.message
 
         return Response(chat_message=TextMessage(content=reply, source=self.name))
 
+    async def _answer_intent(
+        self, intent: Intent, cancellation_token: CancellationToken
+    ) -> SurflineQueryReturn | None:
+        """
+        Answer a structured request parsed by parse_intent.
+
+        Args:
+            intent (Intent): The parsed request.
+            cancellation_token (CancellationToken): The cancellation token for the operation.
+
+        Returns:
+            SurflineQueryReturn | None: The answer, which may report a failed fetch, or None
+                if no known spot or location matches the request.
+        """
+        query_tool: SurflineQueryTool = self.tools[0]
+        nearby_tool: SurflineNearbyTool = self.tools[1]
+        if intent.kind == INTENT_CONDITIONS:
+            if not query_tool.resolver.resolve(intent.place, k=1):
+                return None
+            return await query_tool.run(
+                SurflineQueryArgs(query=intent.place, days=intent.day_offset + 1, day_offset=intent.day_offset),
+                cancellation_token,
+            )
+
+        nearby = await nearby_tool.run(
+            SurflineNearbyArgs(lat=intent.lat, lon=intent.lon, place=intent.place, k=NEARBY_CANDIDATES),
+            cancellation_token,
+        )
+        if not nearby.success:
+            return None
+
+        # Rank the nearby spots on the requested day with the scoring engine
+        spots = nearby.data["spots"]
+        forecasts = await asyncio.gather(
+            *(query_tool.get_forecast(spot["spotId"], days=intent.day_offset + 1) for spot in spots),
+            return_exceptions=True,
+        )
+        fetched = [(spot, forecast) for spot, forecast in zip(spots, forecasts) if not isinstance(forecast, BaseException)]
+        if not fetched:
+            return nearby
+        frames = [forecast_to_dataframe(spot["spotId"], forecast) for spot, forecast in fetched]
+        spots = [
+            {**spot, "orientation": forecast_orientation(forecast)} if spot.get("orientation") is None else spot
+            for spot, forecast in fetched
+        ]
+        # Nearby spots share a time zone; take the day in the nearest fetched spot's local time
+        utc_offset = (fetched[0][1].get("associated") or {}).get("utcOffset") or 0
+        day = local_date(utc_offset, intent.day_offset)
+        start, end = local_day_window(day, utc_offset)
+        ranked = rank_spots(forecast_arrays(pd.concat(frames), spots), top_n=3, start=start, end=end)
+        if not ranked:
+            return nearby
+
+        names = {spot["spotId"]: spot for spot in spots}
+        when = {0: "today", 1: "tomorrow"}.get(intent.day_offset, f"on {day:%Y-%m-%d}")
+        lines = [f"Best spots near {intent.place} {when}:"]
+        for ranked_spot in ranked:
+            spot = names[ranked_spot.spot_id]
+            local = ranked_spot.timestamp + pd.Timedelta(hours=utc_offset)
+            lines.append(
+                f"- {spot['name']} ({spot['distance_km']} km): best around {local:%H:00} local time, "
+                f"score {ranked_spot.score:.2f}"
+            )
+        return SurflineQueryReturn(
+            success=True,
+            message="\n".join(lines),
+            data={**nearby.data, "ranking": [ranked_spot._asdict() for ranked_spot in ranked]}
+        )
+
     async def on_reset(self, cancellation_token: CancellationToken) -> None:
         """
         Reset the agent's state.
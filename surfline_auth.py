@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import time
+from typing import NamedTuple
+
+import httpx
+
+import surfline_http
+
+TOKEN_URL = "https://services.surfline.com/trusted/token"
+DEFAULT_TOKEN_FILE = ".surfline_token.json"
+# Refresh in the background once a token has less than this many seconds left,
+# so requests never wait on a login while the current token is still usable.
+REFRESH_MARGIN = 300.0
+# Fallback lifetime when the token response carries no expires_in
+DEFAULT_TOKEN_LIFETIME = 3600.0
+EMAIL_ENV = "SURFLINE_EMAIL"
+PASSWORD_ENV = "SURFLINE_PASSWORD"
+
+
+class AuthError(Exception):
+    """A login was needed but could not be attempted, or its response carried no token."""
+
+
+class Token(NamedTuple):
+    access_token: str
+    expires_at: float  # Unix time
+    refresh_token: str | None = None
+
+
+class SurflineAuth:
+    """
+    Bearer tokens for authenticated Surfline requests, cached in memory and on disk.
+
+    A valid token is returned without touching the network. Once it comes within
+    ``refresh_margin`` of its expiry, a single background refresh is started while the
+    current token keeps being served; only a missing or expired token makes callers
+    wait. Concurrent callers share one login.
+
+    Args:
+        email (str, optional): Account email. Defaults to $SURFLINE_EMAIL.
+        password (str, optional): Account password. Defaults to $SURFLINE_PASSWORD.
+        token_file (str, optional): File the token is persisted in. None keeps it in memory only.
+        refresh_margin (float): Seconds before expiry at which the token is refreshed.
+    """
+
+    def __init__(
+        self,
+        email: str | None = None,
+        password: str | None = None,
+        token_file: str | None = DEFAULT_TOKEN_FILE,
+        refresh_margin: float = REFRESH_MARGIN,
+    ):
+        self.email = email or os.environ.get(EMAIL_ENV)
+        self.password = password or os.environ.get(PASSWORD_ENV)
+        self.token_file = token_file
+        self.refresh_margin = refresh_margin
+        self.logins = 0
+        self._token = self._load()
+        self._refresh: asyncio.Task | None = None
+
+    def _load(self) -> Token | None:
+        if self.token_file is None or not os.path.exists(self.token_file):
+            return None
+        with open(self.token_file, "r") as f:
+            try:
+                return Token(**json.load(f))
+            except (json.JSONDecodeError, TypeError):
+                return None
+
+    def _save(self, token: Token) -> None:
+        if self.token_file is None:
+            return
+        tmp_path = self.token_file + ".tmp"
+        # Owner-only: the file holds a live credential
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(token._asdict(), f)
+        os.replace(tmp_path, self.token_file)
+
+    @property
+    def token(self) -> Token | None:
+        """The cached token, which may be expired."""
+        return self._token
+
+    def invalidate(self, failed_token: str) -> None:
+        """
+        Expire the cached token after the API rejected it with a 401.
+
+        Only the token that was actually sent is expired: a late 401 for a token that has
+        already been replaced must not throw away its replacement and log in again. The
+        refresh token is kept for the next login.
+
+        Args:
+            failed_token (str): The access token the rejected request carried.
+        """
+        token = self._token
+        if token is not None and token.access_token == failed_token:
+            self._token = token._replace(expires_at=0.0)
+
+    async def get_token(self) -> str:
+        """
+        Return a valid access token, logging in only if none is cached.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            httpx.HTTPError: If the login request failed.
+            AuthError: If a login is needed and no credentials are configured, or the
+                login response carried no token.
+        """
+        now = time.time()
+        token = self._token
+        if token is not None and token.expires_at > now:
+            if token.expires_at - now < self.refresh_margin:
+                self._start_refresh()
+            return token.access_token
+        return await asyncio.shield(self._start_refresh())
+
+    async def headers(self) -> dict:
+        """Return the Authorization header for an authenticated request."""
+        return {"Authorization": f"Bearer {await self.get_token()}"}
+
+    def _start_refresh(self) -> asyncio.Task:
+        # Single flight: every caller during a refresh awaits the same task
+        refresh = self._refresh
+        if refresh is None or refresh.done() or refresh.get_loop() is not asyncio.get_running_loop():
+            refresh = self._refresh = asyncio.get_running_loop().create_task(self._login())
+            # A failed background refresh is retried by the next caller; don't log it as unretrieved
+            refresh.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return refresh
+
+    async def _login(self) -> str:
+        payload = None
+        if self._token is not None and self._token.refresh_token:
+            payload = {"grant_type": "refresh_token", "refresh_token": self._token.refresh_token}
+        elif self.email and self.password:
+            payload = {"grant_type": "password", "username": self.email, "password": self.password}
+        if payload is None:
+            raise AuthError(f"No Surfline credentials; set {EMAIL_ENV} and {PASSWORD_ENV}.")
+
+        try:
+            # No retries: repeated failed logins can lock the account
+            response = await surfline_http.request("POST", TOKEN_URL, json=payload, retries=0)
+        except httpx.HTTPStatusError:
+            if payload["grant_type"] != "refresh_token" or not (self.email and self.password):
+                raise
+            # Expired or revoked refresh token: fall back to the password
+            payload = {"grant_type": "password", "username": self.email, "password": self.password}
+            response = await surfline_http.request("POST", TOKEN_URL, json=payload, retries=0)
+        self.logins += 1
+
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise AuthError(f"The login response is not JSON: {e}") from e
+        if not isinstance(body, dict) or not body.get("access_token"):
+            raise AuthError("No access token found in response.")
+        token = Token(
+            body["access_token"],
+            time.time() + float(body.get("expires_in") or DEFAULT_TOKEN_LIFETIME),
+            body.get("refresh_token") or payload.get("refresh_token"),
+        )
+        self._token = token
+        self._save(token)
+        return token.access_token
+
+
+_DEFAULT_AUTH: SurflineAuth | None = None
+
+
+def default_auth() -> SurflineAuth | None:
+    """
+    Return the shared token manager, or None when there is nothing to log in with.
+
+    The manager is created on first use from $SURFLINE_EMAIL / $SURFLINE_PASSWORD or a
+    previously saved token file.
+    """
+    global _DEFAULT_AUTH
+    if _DEFAULT_AUTH is None:
+        auth = SurflineAuth()
+        if auth.token is None and not (auth.email and auth.password):
+            return None
+        _DEFAULT_AUTH = auth
+    return _DEFAULT_AUTH
@@ -0,0 +1,432 @@
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+import surfline_http
+from forecast_cache import MODEL_RUN_DELAY, MODEL_RUN_INTERVAL
+from forecast_store import ForecastStore
+from spot_lookup import load_spots
+from surfline_auth import AuthError, default_auth
+
+FORECAST_URL = "https://services.surfline.com/kbyg/spots/forecasts"
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+
+def forecast_to_dataframe(spot_id, payload):
+    """
+    Flatten a kbyg forecast response into one row per forecast timestamp.
+
+    Args:
+        spot_id (str): The Surfline spotId the forecast belongs to.
+        payload (dict): The JSON body returned by the forecasts endpoint.
+
+    Returns:
+        pd.DataFrame: The forecast, with ``spotId``, ``run`` and ``timestamp`` columns plus
+            whichever of the surf, swell, wind, tide and weather columns were returned, and
+            ``utc_offset`` (hours to add to UTC for the spot's local time) when the response
+            gives it.
+    """
+    data = payload.get("data") or {}
+    series = []
+
+    rows = []
+    for entry in data.get("wave") or []:
+        surf = entry.get("surf") or {}
+        swells = [swell for swell in entry.get("swells") or [] if swell.get("height")]
+        primary = max(swells, key=lambda swell: swell["height"], default={})
+        rows.append({
+            "timestamp": entry["timestamp"],
+            "surf_min": surf.get("min"),
+            "surf_max": surf.get("max"),
+            "swell_height": primary.get("height"),
+            "swell_period": primary.get("period"),
+            "swell_direction": primary.get("direction"),
+        })
+    series.append(rows)
+
+    series.append([
+        {
+            "timestamp": entry["timestamp"],
+            "wind_speed": entry.get("speed"),
+            "wind_direction": entry.get("direction"),
+            "wind_gust": entry.get("gust"),
+        }
+        for entry in data.get("wind") or []
+    ])
+    # Tides also include HIGH/LOW turning points between the hourly rows; keep the hourly ones.
+    series.append([
+        {"timestamp": entry["timestamp"], "tide_height": entry.get("height")}
+        for entry in data.get("tides") or []
+        if entry.get("type", "NORMAL") == "NORMAL"
+    ])
+    series.append([
+        {"timestamp": entry["timestamp"], "temperature": entry.get("temperature")}
+        for entry in data.get("weather") or []
+    ])
+
+    df = pd.DataFrame({"timestamp": pd.Series(dtype="int64")})
+    for rows in series:
+        if rows:
+            df = df.merge(pd.DataFrame(rows).drop_duplicates("timestamp"), on="timestamp", how="outer")
+    df = df.sort_values("timestamp", ignore_index=True)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s", utc=True)
+
+    associated = payload.get("associated") or {}
+    if associated.get("utcOffset") is not None:
+        df["utc_offset"] = associated["utcOffset"]
+    df.insert(0, "run", associated.get("runInitializationTimestamp"))
+    df.insert(0, "spotId", spot_id)
+    return df
+
+
+async def fetch_forecast(
+    client,
+    spot_id,
+    days=6,
+    interval_hours=1,
+    unit="us",
+    retries=DEFAULT_RETRIES,
+    backoff=DEFAULT_BACKOFF,
+    headers=None,
+    auth=None,
+):
+    """
+    Fetch the raw forecast of one spot, retrying transient failures.
+
+    Forecasts beyond the free horizon need a bearer token; with ``auth`` the request is
+    authenticated, and a 401 discards the token and is retried once with a fresh one.
+
+    Args:
+        client (httpx.AsyncClient, optional): The client to send the request with. None
+            uses the shared client from surfline_http.
+        spot_id (str): The Surfline spotId.
+        days (int): Number of forecast days.
+        interval_hours (int): Forecast interval in hours.
+        unit (str): 'us' for feet, 'uk' for meters.
+        retries (int): Retries after a timeout, connection error or 429/5xx response.
+        backoff (float): Base backoff delay in seconds.
+        headers (dict, optional): Extra request headers.
+        auth (SurflineAuth, optional): Token manager for authenticated requests.
+
+    Returns:
+        dict: The JSON body of the response.
+    """
+    params = {
+        "spotId": spot_id,
+        "days": days,
+        "intervalHours": interval_hours,
+        "maxHeights": True,
+        "unit": unit,
+    }
+    if auth is None:
+        return await surfline_http.get_json(
+            FORECAST_URL, params=params, headers=headers, client=client, retries=retries, backoff=backoff
+        )
+    for attempt in range(2):
+        token = await auth.get_token()
+        try:
+            return await surfline_http.get_json(
+                FORECAST_URL,
+                params=params,
+                headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                client=client,
+                retries=retries,
+                backoff=backoff,
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 401 or attempt == 1:
+                raise
+            auth.invalidate(token)
+
+
+def forecast_location(payload):
+    """Return the (lat, lon) of the spot a forecast response belongs to, or None."""
+    location = (payload.get("associated") or {}).get("location") or {}
+    if location.get("lat") is None or location.get("lon") is None:
+        return None
+    return location["lat"], location["lon"]
+
+
+def forecast_orientation(payload):
+    """
+    Estimate the direction a spot's beach faces from the wind entries of a forecast response.
+
+    Surfline labels each hourly wind as ``Offshore``, ``Onshore`` or ``Cross-shore`` for
+    the spot. Onshore wind comes from the direction the beach faces and offshore wind
+    from the opposite one; the circular mean of those directions is the orientation.
+
+    Args:
+        payload (dict): The JSON body returned by the forecasts endpoint.
+
+    Returns:
+        float | None: Degrees the beach faces, or None if no hour was labelled
+            offshore or onshore.
+    """
+    angles = []
+    for entry in (payload.get("data") or {}).get("wind") or []:
+        direction, kind = entry.get("direction"), (entry.get("directionType") or "").lower()
+        if direction is None or kind not in ("offshore", "onshore"):
+            continue
+        angles.append(np.radians(direction + (180.0 if kind == "offshore" else 0.0)))
+    if not angles:
+        return None
+    return round(float(np.degrees(np.arctan2(np.mean(np.sin(angles)), np.mean(np.cos(angles))))) % 360.0, 1)
+
+
+def forecast_run(payload):
+    """Return the model run (initialization Unix timestamp) of a forecast response, or None."""
+    return (payload.get("associated") or {}).get("runInitializationTimestamp")
+
+
+async def locate_spots(spots, concurrency=DEFAULT_CONCURRENCY, retries=DEFAULT_RETRIES):
+    """
+    Add ``lat``/``lon`` and ``orientation`` to every registered spot that does not have them yet.
+
+    The location comes from the ``associated`` block of a one-day, 3-hour-interval
+    forecast, and the orientation from its wind entries (see forecast_orientation). A
+    spot whose orientation cannot be told is stored with ``orientation`` None, so it is
+    not fetched again.
+
+    Args:
+        spots (SpotRegistry): The spot registry to update.
+        concurrency (int): Maximum number of requests in flight.
+        retries (int): Retries per spot after a transient failure.
+
+    Returns:
+        tuple: The number of spots located, and a dict mapping each failed spotId to its
+            error message.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    missing = [spot for spot in spots if spot.get("lat") is None or spot.get("lon") is None or "orientation" not in spot]
+    located = []
+    failed = {}
+
+    async def locate(spot):
+        try:
+            async with semaphore:
+                # Eight wind entries, so some are likely labelled offshore or onshore
+                payload = await fetch_forecast(None, spot["spotId"], days=1, interval_hours=3, retries=retries)
+        except (httpx.HTTPError, ValueError) as e:
+            return spot, None, str(e)
+        return spot, payload, None
+
+    for task in asyncio.as_completed([locate(spot) for spot in missing]):
+        spot, payload, error = await task
+        location = None if payload is None else forecast_location(payload)
+        if location is None:
+            failed[spot["spotId"]] = error or "No location in the forecast response."
+            continue
+        orientation = spot.get("orientation")
+        if orientation is None:
+            orientation = forecast_orientation(payload)
+        located.append({**spot, "lat": location[0], "lon": location[1], "orientation": orientation})
+
+    spots.update_many(located)
+    return len(located), failed
+
+
+async def fetch_forecasts(
+    spot_ids,
+    days=6,
+    interval_hours=1,
+    unit="us",
+    concurrency=DEFAULT_CONCURRENCY,
+    retries=DEFAULT_RETRIES,
+    store=None,
+    auth=None,
+):
+    """
+    Fetch the forecasts of many spots concurrently.
+
+    Args:
+        spot_ids (Iterable[str]): The Surfline spotIds.
+        days (int): Number of forecast days.
+        interval_hours (int): Forecast interval in hours.
+        unit (str): 'us' for feet, 'uk' for meters. Must be 'us' with a store.
+        concurrency (int): Maximum number of requests in flight.
+        retries (int): Retries per spot after a transient failure.
+        store (ForecastStore, optional): Store to merge each spot's forecast into. A
+            forecast whose response does not name its model run cannot be stored and is
+            reported as failed.
+        auth (SurflineAuth, optional): Token manager for authenticated requests.
+
+    Returns:
+        tuple: A DataFrame with the forecasts of every spot (keyed by the ``spotId``
+            column), and a dict mapping each failed spotId to its error message.
+    """
+    if store is not None and unit != "us":
+        raise ValueError("The forecast store scores its rollups in 'us' units (feet and knots).")
+    semaphore = asyncio.Semaphore(concurrency)
+    frames = []
+    failed = {}
+
+    async def fetch(spot_id):
+        try:
+            async with semaphore:
+                payload = await fetch_forecast(None, spot_id, days, interval_hours, unit, retries, auth=auth)
+        except (httpx.HTTPError, AuthError, ValueError) as e:
+            # ValueError: a 200 whose body is not JSON, e.g. a challenge or HTML error page
+            return spot_id, None, str(e)
+        return spot_id, payload, None
+
+    for task in asyncio.as_completed([fetch(spot_id) for spot_id in dict.fromkeys(spot_ids)]):
+        spot_id, payload, error = await task
+        if error is None and store is not None and forecast_run(payload) is None:
+            error = "No model run in the forecast response."
+        if error is not None:
+            failed[spot_id] = error
+            continue
+        df = forecast_to_dataframe(spot_id, payload)
+        if store is not None:
+            # Arrow work and disk writes; off the event loop so the other fetches keep going
+            await asyncio.to_thread(store.merge, spot_id, df, forecast_run(payload))
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=["spotId", "run", "timestamp"]), failed
+    return pd.concat(frames, ignore_index=True), failed
+
+
+async def refresh_forecasts(
+    spot_ids,
+    store,
+    days=6,
+    interval_hours=1,
+    unit="us",
+    concurrency=DEFAULT_CONCURRENCY,
+    retries=DEFAULT_RETRIES,
+    auth=None,
+    now=None,
+):
+    """
+    Bring the stored forecasts of many spots up to date, fetching only what changed.
+
+    A spot whose latest stored run is so recent that no newer model run can have been
+    published yet is skipped without a request. The others are probed with the
+    smallest forecast request (one day at a 24-hour interval); only if the probe shows
+    a newer run is the full forecast fetched, and only its new or changed rows are
+    merged into the store. A probe that names no model run fails the spot.
+
+    Args:
+        spot_ids (Iterable[str]): The Surfline spotIds.
+        store (ForecastStore): The store to refresh.
+        days (int): Number of forecast days.
+        interval_hours (int): Forecast interval in hours.
+        unit (str): 'us' for feet; the store only takes 'us' units.
+        concurrency (int): Maximum number of spots refreshed at once.
+        retries (int): Retries per request after a transient failure.
+        auth (SurflineAuth, optional): Token manager for authenticated requests.
+        now (float, optional): Current Unix time, for testing.
+
+    Returns:
+        tuple: A dict mapping each refreshed spotId to the number of rows written, a list
+            of the spotIds that were already up to date, and a dict mapping each failed
+            spotId to its error message.
+    """
+    if unit != "us":
+        raise ValueError("The forecast store scores its rollups in 'us' units (feet and knots).")
+    now = time.time() if now is None else now
+    semaphore = asyncio.Semaphore(concurrency)
+    refreshed = {}
+    up_to_date = []
+    failed = {}
+
+    async def refresh(spot_id):
+        latest = store.latest_run(spot_id)
+        if latest is not None and now < latest + MODEL_RUN_INTERVAL + MODEL_RUN_DELAY:
+            return spot_id, None, None
+        try:
+            async with semaphore:
+                if latest is not None:
+                    probe = await fetch_forecast(None, spot_id, 1, 24, unit, retries, auth=auth)
+                    probe_run = forecast_run(probe)
+                    if probe_run is None:
+                        # Without a run there is no telling whether the stored one is current
+                        return spot_id, None, "No model run in the probe response."
+                    if probe_run <= latest:
+                        return spot_id, None, None
+                payload = await fetch_forecast(None, spot_id, days, interval_hours, unit, retries, auth=auth)
+        except (httpx.HTTPError, AuthError, ValueError) as e:
+            # ValueError: a 200 whose body is not JSON, e.g. a challenge or HTML error page
+            return spot_id, None, str(e)
+        return spot_id, payload, None
+
+    for task in asyncio.as_completed([refresh(spot_id) for spot_id in dict.fromkeys(spot_ids)]):
+        spot_id, payload, error = await task
+        if payload is not None and forecast_run(payload) is None:
+            error = "No model run in the forecast response."
+        if error is not None:
+            failed[spot_id] = error
+        elif payload is None:
+            up_to_date.append(spot_id)
+        else:
+            refreshed[spot_id] = await asyncio.to_thread(
+                store.merge, spot_id, forecast_to_dataframe(spot_id, payload), forecast_run(payload)
+            )
+
+    return refreshed, up_to_date, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch Surfline forecasts for many spots at once.")
+    parser.add_argument("spot_ids", nargs="*", help="SpotIds to fetch. Defaults to every spot in spots.json.")
+    parser.add_argument("--days", type=int, default=6)
+    parser.add_argument("--interval-hours", type=int, default=1)
+    parser.add_argument("--unit", default="us", choices=["us", "uk"])
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--store", metavar="DIR", help="Also write the forecasts into a ForecastStore at DIR.")
+    parser.add_argument("--locate", action="store_true", help="Add lat/lon and orientation to the spots in spots.json that lack them.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Only fetch spots with a new model run, merging changed rows into --store.")
+    args = parser.parse_args()
+    if args.refresh and not args.store:
+        parser.error("--refresh requires --store")
+    if args.store and args.unit != "us":
+        parser.error("--store requires --unit us")
+
+    if args.locate:
+        spots = load_spots()
+        located, failed = surfline_http.run(locate_spots(spots, args.concurrency))
+        spots.close()
+        for spot_id, message in failed.items():
+            print(f"Error locating {spot_id}: {message}", file=sys.stderr)
+        print(f"✅ Located {located} spots, {len(failed)} failures.")
+        return 1 if failed else 0
+
+    spot_ids = args.spot_ids or [spot["spotId"] for spot in load_spots()]
+    store = ForecastStore(args.store) if args.store else None
+
+    if args.refresh:
+        refreshed, up_to_date, failed = surfline_http.run(
+            refresh_forecasts(
+                spot_ids, store, args.days, args.interval_hours, args.unit, args.concurrency, auth=default_auth()
+            )
+        )
+        for spot_id, message in failed.items():
+            print(f"Error refreshing {spot_id}: {message}", file=sys.stderr)
+        print(
+            f"✅ Refreshed {len(refreshed)} spots ({sum(refreshed.values())} changed rows), "
+            f"{len(up_to_date)} up to date, {len(failed)} failures."
+        )
+        return 1 if failed else 0
+
+    df, failed = surfline_http.run(
+        fetch_forecasts(
+            spot_ids, args.days, args.interval_hours, args.unit, args.concurrency, store=store, auth=default_auth()
+        )
+    )
+    for spot_id, message in failed.items():
+        print(f"Error fetching {spot_id}: {message}", file=sys.stderr)
+    print(f"✅ Fetched {df['spotId'].nunique()} spots, {len(df)} rows, {len(failed)} failures.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
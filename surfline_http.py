@@ -0,0 +1,236 @@
+import asyncio
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from fetch_guard import backoff_delay
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_PER_HOST = 16
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+USER_AGENT = "Mozilla/5.0 (compatible; Where2Surf/1.0)"
+
+# One client and one set of per-host limits per event loop: httpx clients and asyncio
+# semaphores cannot be shared across loops, and scripts may call asyncio.run repeatedly.
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_HOST_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HostLimiter]" = weakref.WeakKeyDictionary()
+
+
+def create_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    timeout: float | httpx.Timeout = DEFAULT_TIMEOUT,
+    http2: bool | None = None,
+    headers: dict | None = None,
+) -> httpx.AsyncClient:
+    """
+    Create a keep-alive pooled client with the project's defaults.
+
+    Args:
+        max_connections (int): Size of the connection pool.
+        timeout (float | httpx.Timeout): Request timeout in seconds.
+        http2 (bool, optional): Negotiate HTTP/2. Defaults to on when the ``h2``
+            package is installed.
+        headers (dict, optional): Headers sent with every request, on top of the User-Agent.
+
+    Returns:
+        httpx.AsyncClient: The client. The caller is responsible for closing it.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        http2=HTTP2_AVAILABLE if http2 is None else http2,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT, **(headers or {})},
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the client shared by everything running on the current event loop."""
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _CLIENTS[loop] = create_client()
+    return client
+
+
+async def close_client() -> None:
+    """Close the current event loop's shared client, if one was created."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def run(coro):
+    """
+    Run a coroutine from synchronous code, closing the shared client afterwards.
+
+    Args:
+        coro: The coroutine, e.g. ``get_json(url)``.
+
+    Returns:
+        The coroutine's result.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_client()
+
+    return asyncio.run(main())
+
+
+class HostLimiter:
+    """
+    Caps the number of concurrent requests per host.
+
+    Args:
+        per_host (int): Maximum concurrent requests to any one host.
+    """
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST):
+        self.per_host = per_host
+        self._semaphores = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        """Hold one of the ``per_host`` slots of the URL's host for the duration of the block."""
+        async with self._semaphores[urlsplit(str(url)).netloc]:
+            yield
+
+
+def get_host_limiter() -> HostLimiter:
+    """Return the per-host limiter shared by everything running on the current event loop."""
+    loop = asyncio.get_running_loop()
+    limiter = _HOST_LIMITERS.get(loop)
+    if limiter is None:
+        limiter = _HOST_LIMITERS[loop] = HostLimiter()
+    return limiter
+
+
+async def request(
+    method: str,
+    url: str,
+    client: httpx.AsyncClient | None = None,
+    host_limiter: HostLimiter | None = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request, retrying timeouts, connection errors and 429/5xx responses.
+
+    Retries wait with jittered exponential backoff, honouring ``Retry-After`` when the
+    server sends one.
+
+    Args:
+        method (str): The HTTP method.
+        url (str): The URL.
+        client (httpx.AsyncClient, optional): Client to send the request with. Defaults
+            to the shared client.
+        host_limiter (HostLimiter, optional): Per-host concurrency limit. Defaults to the
+            shared limiter.
+        retries (int): Retries after a transient failure.
+        backoff (float): Base backoff delay in seconds.
+        **kwargs: Forwarded to ``httpx.AsyncClient.request`` (params, headers, json, ...).
+
+    Returns:
+        httpx.Response: The final response, already checked with ``raise_for_status``.
+
+    Raises:
+        httpx.HTTPError: If the last attempt failed.
+    """
+    client = client or get_client()
+    host_limiter = host_limiter or get_host_limiter()
+
+    async def attempt():
+        async with host_limiter.limit(url):
+            response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    return await retrying(attempt, retries, backoff)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying: a timeout, a connection error or a 429/5xx response."""
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in RETRY_STATUS_CODES
+
+
+async def retrying(attempt, retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF, retry_on=is_retryable):
+    """
+    Await ``attempt()`` until it succeeds, retrying failures that ``retry_on`` accepts.
+
+    Retries wait with jittered exponential backoff, honouring ``Retry-After`` on
+    retried HTTP status errors.
+
+    Args:
+        attempt: Coroutine function making one attempt, e.g. sending a request.
+        retries (int): Retries after a retryable failure.
+        backoff (float): Base backoff delay in seconds.
+        retry_on: Predicate on the raised exception. Defaults to is_retryable.
+
+    Returns:
+        The result of the first successful attempt.
+
+    Raises:
+        Exception: The last attempt's error, or the first one that is not retryable.
+    """
+    for number in range(retries + 1):
+        try:
+            return await attempt()
+        except Exception as e:
+            if number == retries or not retry_on(e):
+                raise
+            delay = backoff_delay(number, backoff)
+            if isinstance(e, httpx.HTTPStatusError):
+                delay = max(delay, _retry_after(e.response))
+        await asyncio.sleep(delay)
+
+
+async def get_json(url: str, params: dict | None = None, headers: dict | None = None, **kwargs):
+    """
+    GET a URL and decode its JSON body.
+
+    Args:
+        url (str): The URL.
+        params (dict, optional): Query parameters.
+        headers (dict, optional): Extra request headers.
+        **kwargs: Forwarded to request (client, retries, backoff, timeout, ...).
+
+    Returns:
+        The decoded JSON body.
+
+    Raises:
+        httpx.HTTPError: If the request failed.
+        ValueError: If the body is not JSON, e.g. a challenge or HTML error page.
+    """
+    response = await request("GET", url, params=params, headers=headers, **kwargs)
+    return response.json()
+
+
+def _retry_after(response: httpx.Response) -> float:
+    # Only the delay-seconds form; HTTP-date values fall back to the backoff delay
+    try:
+        return min(float(response.headers.get("Retry-After", 0)), 60.0)
+    except ValueError:
+        return 0.0
@@ -0,0 +1,62 @@
+import re
+from typing import NamedTuple
+
+INTENT_CONDITIONS = "conditions"
+INTENT_NEARBY = "nearby"
+
+DAY_PATTERN = re.compile(r"\b(?P<day>today|tonight|tomorrow|in (?P<n>\d{1,2}) days?)\b", re.I)
+COORDINATES_PATTERN = re.compile(r"^\s*(?P<lat>[-+]?\d{1,2}(?:\.\d+)?)\s*,\s*(?P<lon>[-+]?\d{1,3}(?:\.\d+)?)\s*$")
+PLACE = r"(?P<place>(?:[^.?!]|(?<=\d)\.(?=\d))+)"  # Up to the end of the sentence; decimal points allowed
+# "best spot near X", "where should I surf near X", "spots around X", "closest break to X"
+NEARBY_PATTERN = re.compile(
+    r"\b(?:spots?|breaks?|beach(?:es)?|where\b[^.?!]*?\bsurf)\b[^.?!]*?"
+    r"\b(?:near|around|close to|closest to|nearest to)\s+" + PLACE,
+    re.I,
+)
+# "conditions at X tomorrow", "surf report for X", "how are the waves in X today"
+CONDITIONS_PATTERN = re.compile(
+    r"\b(?:conditions|surf|waves|forecast|report|swell)\b[^.?!]*?\b(?:at|for|in)\s+" + PLACE,
+    re.I,
+)
+# Words that follow "in"/"at"/"for" in a request without naming a place ("swell in general")
+PLACE_STOP_WORDS = {"general", "particular", "total", "short", "advance", "detail", "theory"}
+TRAILING_NOISE = re.compile(r"(?:\s+(?:right now|now|please|this week|for me))+\s*$", re.I)
+
+
+class Intent(NamedTuple):
+    kind: str  # INTENT_CONDITIONS or INTENT_NEARBY
+    place: str  # Spot or place name, as written
+    day_offset: int = 0  # 0 for today, 1 for tomorrow, ...
+    lat: float | None = None
+    lon: float | None = None
+
+
+def parse_intent(text: str) -> Intent | None:
+    """
+    Recognize the common structured requests that can be answered without the model.
+
+    Args:
+        text (str): The chat message.
+
+    Returns:
+        Intent | None: The parsed request, or None for anything open-ended.
+    """
+    day_offset = 0
+    day = DAY_PATTERN.search(text)
+    if day is not None:
+        word = day.group("day").lower()
+        day_offset = int(day.group("n")) if day.group("n") else int(word == "tomorrow")
+
+    for kind, pattern in ((INTENT_NEARBY, NEARBY_PATTERN), (INTENT_CONDITIONS, CONDITIONS_PATTERN)):
+        match = pattern.search(text)
+        if match is None:
+            continue
+        place = DAY_PATTERN.sub("", match.group("place"))
+        place = TRAILING_NOISE.sub("", place).strip(" ,;:'\"")
+        if not place or place.lower() in PLACE_STOP_WORDS:
+            continue
+        coordinates = COORDINATES_PATTERN.match(place)
+        if coordinates is not None:
+            return Intent(kind, place, day_offset, float(coordinates.group("lat")), float(coordinates.group("lon")))
+        return Intent(kind, place, day_offset)
+    return None
@@ -0,0 +1,24 @@
+import asyncio
+
+import httpx
+import pytest
+
+import surfline_http
+
+
+@pytest.fixture
+def run_with_transport():
+    """Run a coroutine on a new event loop whose shared HTTP client answers with ``handler``."""
+
+    def run(handler, coro_factory):
+        async def main():
+            loop = asyncio.get_running_loop()
+            surfline_http._CLIENTS[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await coro_factory()
+            finally:
+                await surfline_http.close_client()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,92 @@
+import asyncio
+
+from autogen_core.models import CreateResult, RequestUsage, UserMessage
+
+from context_budget import ContextBudget
+
+
+class WordCountClient:
+    """Counts a token per word and answers every summary request with ``summary``."""
+
+    def __init__(self, summary="summary"):
+        self.summary = summary
+        self.calls = 0
+
+    def count_tokens(self, messages):
+        return sum(len(str(message.content).split()) for message in messages)
+
+    async def create(self, messages, cancellation_token=None):
+        self.calls += 1
+        usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        return CreateResult(finish_reason="stop", content=self.summary, usage=usage, cached=False)
+
+
+def message(words, source="agent"):
+    return UserMessage(content=" ".join(["word"] * words), source=source)
+
+
+def grow(budget, context, steps, words):
+    """Append ``steps`` messages of ``words`` words, fitting the context after each one."""
+    fitted = None
+    for _ in range(steps):
+        context.append(message(words))
+        fitted = asyncio.run(budget.fit(context))
+    return fitted
+
+
+def test_under_budget_context_is_returned_unchanged():
+    client = WordCountClient()
+    budget = ContextBudget(client, "Orchestrator", max_tokens=100, keep_recent=2)
+    context = [message(10, "ledger")]
+    assert grow(budget, context, 5, 10) == context
+    assert client.calls == 0
+
+
+def test_summary_brings_the_context_down_to_the_low_water_mark():
+    client = WordCountClient()
+    budget = ContextBudget(client, "Orchestrator", max_tokens=100, keep_recent=4, low_water=0.5)
+    context = [message(10, "ledger")]
+    fitted = grow(budget, context, 10, 10)
+
+    assert client.calls == 1
+    # Down to the low-water mark, plus the one-word summary
+    assert budget.tokens <= 50 + 1
+    assert fitted[0] is context[0]
+    assert fitted[1].content.endswith("summary")
+    assert fitted[-1] is context[-1]
+
+
+def test_each_summary_frees_at_least_the_low_water_gap():
+    client = WordCountClient()
+    budget = ContextBudget(client, "Orchestrator", max_tokens=100, keep_recent=2, low_water=0.75)
+    context = [message(10, "ledger")]
+    grow(budget, context, 30, 10)
+
+    # 310 tokens in, each summary folding at least 25 of them
+    assert 1 <= client.calls <= (310 - 100) // 25 + 1
+    assert budget.tokens <= 100
+
+
+def test_tail_over_budget_is_shrunk_not_resummarized():
+    client = WordCountClient()
+    budget = ContextBudget(client, "Orchestrator", max_tokens=100, keep_recent=8)
+    context = [message(10, "ledger")]
+    grow(budget, context, 4, 40)
+
+    # keep_recent would keep all four 40-token messages; only the last one fits
+    assert client.calls == 1
+    assert budget.tokens <= 100
+
+
+def test_head_over_budget_costs_no_summary_per_step():
+    client = WordCountClient(summary=" ".join(["fact"] * 90))
+    budget = ContextBudget(client, "Orchestrator", max_tokens=100, keep_recent=1)
+    context = [message(10, "ledger")]
+    grow(budget, context, 5, 30)
+    grow(budget, context, 1, 5)
+    calls = client.calls
+    grow(budget, context, 4, 5)
+
+    # The ledger and the summary alone take 100 tokens
+    assert budget.tokens > 100
+    assert client.calls == calls
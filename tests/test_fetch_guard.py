@@ -0,0 +1,68 @@
+import os
+
+import httpx
+import pytest
+
+from fetch_guard import (
+    PAGE_BLOCKED,
+    PAGE_CHALLENGE,
+    PAGE_OK,
+    SNIFF_BYTES,
+    RejectedPageError,
+    check_response,
+    classify_response,
+)
+from page_cache import PageCache
+from spots import fetch_spot_links
+
+REGION_URL = "https://www.surfline.com/surf-reports-forecasts-cams/algeria/2589581"
+# A real Cloudflare interstitial, saved from the Algeria region page
+with open(os.path.join(os.path.dirname(__file__), "..", "algeria_page.html"), "rb") as f:
+    CHALLENGE_PAGE = f.read()
+REGION_PAGE = b'<html><head><title>Algeria</title></head><body><a href="/surf-report/annaba/5842">A</a></body></html>'
+
+
+def test_saved_challenge_page_is_a_challenge():
+    assert classify_response(403, {}, CHALLENGE_PAGE[:SNIFF_BYTES]) == PAGE_CHALLENGE
+    assert classify_response(200, {}, CHALLENGE_PAGE) == PAGE_CHALLENGE
+
+
+@pytest.mark.parametrize(
+    "status_code, headers, head, verdict",
+    [
+        (200, {}, REGION_PAGE, PAGE_OK),
+        (200, httpx.Headers({"CF-Mitigated": "challenge"}), b"", PAGE_CHALLENGE),
+        (403, {}, b"<html>Forbidden</html>", PAGE_BLOCKED),
+        (429, {}, b"", PAGE_BLOCKED),
+        (200, {}, b"<html><head><title>Attention Required! | Cloudflare</title>", PAGE_BLOCKED),
+        (500, {}, b"Internal Server Error", PAGE_OK),
+        # Markers past the sniffed head are page content, not a challenge
+        (200, {}, b" " * SNIFF_BYTES + b"<title>Just a moment...</title>", PAGE_OK),
+    ],
+)
+def test_classify_response(status_code, headers, head, verdict):
+    assert classify_response(status_code, headers, head) == verdict
+
+
+def test_check_response_raises_for_rejected_pages():
+    check_response(REGION_URL, 200, {}, REGION_PAGE)
+    with pytest.raises(RejectedPageError) as error:
+        check_response(REGION_URL, 403, {}, CHALLENGE_PAGE)
+    assert (error.value.url, error.value.verdict) == (REGION_URL, PAGE_CHALLENGE)
+
+
+def challenge(request):
+    return httpx.Response(403, content=CHALLENGE_PAGE, headers={"Content-Type": "text/html"})
+
+
+def test_challenge_page_is_not_scanned_for_links(run_with_transport):
+    with pytest.raises(RejectedPageError):
+        run_with_transport(challenge, lambda: fetch_spot_links(REGION_URL))
+
+
+def test_challenge_page_is_never_cached(run_with_transport, tmp_path):
+    cache = PageCache(str(tmp_path))
+    with pytest.raises(RejectedPageError):
+        run_with_transport(challenge, lambda: cache.fetch(REGION_URL, retries=1, backoff=0))
+    assert cache.get(REGION_URL) is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+import forecast_cache
+from forecast_cache import MODEL_RUN_DELAY, MODEL_RUN_INTERVAL, ForecastCache, next_model_run
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_760_745_600.0]
+    monkeypatch.setattr(forecast_cache.time, "time", lambda: now[0])
+    return now
+
+
+def counting_fetch(calls, value="forecast", delay=0.0):
+    async def fetch():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+
+    return fetch
+
+
+def test_concurrent_callers_share_one_fetch():
+    cache = ForecastCache()
+    calls = []
+
+    async def main():
+        fetch = counting_fetch(calls, delay=0.01)
+        return await asyncio.gather(*(cache.get("annaba", fetch) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["forecast"] * 10
+    assert calls == ["forecast"]
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 0)
+
+
+def test_fresh_entry_is_a_hit_and_expired_one_is_refetched(clock):
+    cache = ForecastCache(ttl=60)
+    calls = []
+
+    async def get():
+        return await cache.get("annaba", counting_fetch(calls))
+
+    asyncio.run(get())
+    clock[0] += 59
+    asyncio.run(get())
+    assert (len(calls), cache.hits) == (1, 1)
+    clock[0] += 1
+    asyncio.run(get())
+    assert len(calls) == 2
+
+
+def test_entries_expire_at_the_next_model_run(clock):
+    cache = ForecastCache()
+    calls = []
+    asyncio.run(cache.get("annaba", counting_fetch(calls)))
+    clock[0] = next_model_run(clock[0]) - 1
+    asyncio.run(cache.get("annaba", counting_fetch(calls)))
+    clock[0] += 1
+    asyncio.run(cache.get("annaba", counting_fetch(calls)))
+    assert len(calls) == 2
+
+
+def test_next_model_run_is_published_after_the_next_initialization():
+    initialization = 1_760_745_600  # 00:00 UTC
+    assert next_model_run(initialization + MODEL_RUN_DELAY) == initialization + MODEL_RUN_INTERVAL + MODEL_RUN_DELAY
+    assert next_model_run(initialization + MODEL_RUN_DELAY - 1) == initialization + MODEL_RUN_DELAY
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ForecastCache(maxsize=2)
+    calls = []
+
+    async def main():
+        await cache.get("a", counting_fetch(calls, "a"))
+        await cache.get("b", counting_fetch(calls, "b"))
+        await cache.get("a", counting_fetch(calls, "a"))
+        await cache.get("c", counting_fetch(calls, "c"))
+        await cache.get("b", counting_fetch(calls, "b"))
+
+    asyncio.run(main())
+    assert calls == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_failed_fetch_is_not_cached():
+    cache = ForecastCache()
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        raise ValueError("not JSON")
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await cache.get("annaba", fetch)
+
+    asyncio.run(main())
+    assert len(attempts) == 2
+    assert len(cache) == 0
@@ -0,0 +1,63 @@
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast_digest import local_date, local_day_window, summarize_forecast
+from forecast_rollups import best_window
+
+
+def test_local_date_crosses_midnight_before_utc():
+    now = datetime(2026, 10, 18, 20, 0, tzinfo=timezone.utc)
+
+    assert local_date(10, 0, now) == date(2026, 10, 19)
+    assert local_date(-5, 1, now) == date(2026, 10, 19)
+
+
+def test_local_day_window_starts_at_local_midnight():
+    start, end = local_day_window(date(2026, 10, 19), 10)
+
+    assert start == datetime(2026, 10, 18, 14, 0, tzinfo=timezone.utc)
+    assert end == datetime(2026, 10, 19, 14, 0, tzinfo=timezone.utc)
+
+
+def hourly(scores_by_height, wind_speed=5.0):
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2026-10-18", periods=len(scores_by_height), freq="h", tz="UTC"),
+        "surf_min": scores_by_height,
+        "surf_max": scores_by_height,
+        "swell_period": 12.0,
+        "wind_speed": wind_speed,
+        "wind_direction": 0.0,
+        "tide_height": 1.0,
+    })
+
+
+def test_best_window_is_full_length():
+    # A single good hour at the start of the day must not beat three decent ones later
+    scores = np.array([1.0, 0.0, 0.0, 0.0, 0.6, 0.6, 0.6, 0.0])
+
+    assert best_window(scores) == (4, 6, pytest.approx(0.6))
+
+
+def test_best_window_of_a_short_day_is_the_whole_day():
+    assert best_window(np.array([0.2, 0.4])) == (0, 1, pytest.approx(0.3))
+
+
+def test_summary_reports_three_hour_window():
+    days = summarize_forecast(hourly([4.0, 1.0, 1.0, 1.0, 3.5, 3.5, 3.5, 1.0]))
+
+    assert days[0]["best_window"] == "04:00-07:00"
+
+
+def test_meters_are_scored_like_feet():
+    feet = summarize_forecast(hourly([4.0] * 6, wind_speed=10.0))
+    meters = summarize_forecast(hourly([4.0 / 3.28084] * 6, wind_speed=18.52), height_unit="m", speed_unit="kph")
+
+    assert meters[0]["best_score"] == feet[0]["best_score"]
+
+
+def test_unknown_units_are_rejected():
+    with pytest.raises(ValueError):
+        summarize_forecast(hourly([4.0] * 6), height_unit="cubits")
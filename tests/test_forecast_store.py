@@ -0,0 +1,100 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from forecast_store import ForecastStore
+
+RUN = 1_700_000_000
+
+
+def forecast(start, surf_min, hours=6):
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start, periods=hours, freq="h", tz="UTC"),
+        "surf_min": surf_min,
+        "surf_max": [value + 1 for value in surf_min],
+    })
+
+
+def test_read_spots_with_int_and_float_values(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    store.write("a", forecast("2026-10-18", [1, 2, 3, 4, 5, 6]), RUN)
+    store.write("b", forecast("2026-10-18", [0.5, 1.5, 2.5, 3.5, 4.5, 5.5]), RUN)
+
+    df = store.read(["a", "b"])
+
+    assert len(df) == 12
+    assert df["surf_min"].dtype == "float64"
+    assert df.loc[df["spotId"] == "b", "surf_min"].tolist() == [0.5, 1.5, 2.5, 3.5, 4.5, 5.5]
+
+
+def test_merge_runs_with_int_then_float_values(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    store.merge("a", forecast("2026-10-18", [1, 2, 3, 4, 5, 6]), RUN)
+    written = store.merge("a", forecast("2026-10-18", [1, 2, 3.5, 4, 5, 6.5]), RUN + 3600)
+
+    df = store.read(["a"])
+
+    assert written == 2
+    assert store.runs("a") == [RUN, RUN + 3600]
+    assert df["surf_min"].tolist() == [1, 2, 3.5, 4, 5, 6.5]
+
+
+def test_write_rejects_run_that_does_not_combine(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    store.write("a", forecast("2026-10-18", [1, 2, 3, 4, 5, 6]), RUN)
+    bad = forecast("2026-10-18", [1, 2, 3, 4, 5, 6]).assign(surf_min="flat")
+
+    with pytest.raises(pa.ArrowTypeError):
+        store.write("a", bad, RUN + 3600)
+
+    assert store.runs("a") == [RUN]
+    assert len(store.read(["a"])) == 6
+
+
+def test_write_takes_run_from_forecast(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    store.write("a", forecast("2026-10-18", [1, 2, 3, 4, 5, 6]).assign(run=RUN))
+
+    with pytest.raises(ValueError):
+        store.merge("a", forecast("2026-10-18", [2, 3, 4, 5, 6, 7]))
+
+    assert store.runs("a") == [RUN]
+
+
+def test_rollups_follow_merged_runs(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    store.merge("a", forecast("2026-10-18", list(range(48)), hours=48), RUN)
+    store.merge("a", forecast("2026-10-19", [10.0] * 24, hours=24), RUN + 3600)
+
+    daily = store.read_rollup(["a"], 24)
+
+    assert daily["surf_min_min"].tolist() == [0, 10]
+    assert daily["surf_min_max"].tolist() == [23, 10]
+
+
+def test_read_between(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    store.write("a", forecast("2026-10-18", list(range(48)), hours=48), RUN)
+
+    df = store.read(["a"], start="2026-10-19", end="2026-10-19 06:00")
+
+    assert df["surf_min"].tolist() == [24, 25, 26, 27, 28, 29]
+
+
+def test_rollups_bucket_by_local_day(tmp_path):
+    store = ForecastStore(str(tmp_path))
+    # Hawaii, UTC-10: local midnight is 10:00 UTC
+    hawaii = forecast("2026-10-18 10:00", list(range(48)), hours=48).assign(utc_offset=-10)
+    store.merge("a", hawaii, RUN)
+    store.merge("a", forecast("2026-10-19 10:00", [50.0] * 24, hours=24).assign(utc_offset=-10), RUN + 3600)
+
+    daily = store.read_rollup(["a"], 24)
+    half_days = store.summary(["a"], 12)
+
+    assert daily["bucket"].tolist() == [
+        pd.Timestamp("2026-10-18 10:00", tz="UTC"),
+        pd.Timestamp("2026-10-19 10:00", tz="UTC"),
+    ]
+    assert daily["hours"].tolist() == [24, 24]
+    assert daily["surf_min_min"].tolist() == [0, 50]
+    assert half_days["bucket"].dt.hour.tolist() == [10, 22, 10, 22]
@@ -0,0 +1,73 @@
+import httpx
+
+from page_cache import PageCache
+
+URL = "https://www.surfline.com/surf-reports-forecasts-cams/algeria/2589581"
+PAGE = b"<html><head><title>Algeria Surf Reports</title></head><body>" + b"spots " * 1000 + b"</body></html>"
+
+
+def test_server_errors_are_retried(run_with_transport, tmp_path):
+    statuses = [503, 502, 200]
+
+    def handler(request):
+        status = statuses.pop(0)
+        return httpx.Response(status, content=PAGE if status == 200 else b"Bad gateway")
+
+    cache = PageCache(str(tmp_path))
+    page = run_with_transport(handler, lambda: cache.fetch(URL, backoff=0))
+
+    assert (page.status_code, page.changed) == (200, True)
+    assert statuses == []
+    assert cache.get(URL) == PAGE
+
+
+def test_revalidation_uses_the_stored_validators(run_with_transport, tmp_path):
+    sent = []
+
+    def handler(request):
+        sent.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        validators = {"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 06:00:00 GMT"}
+        return httpx.Response(200, content=PAGE, headers=validators)
+
+    cache = PageCache(str(tmp_path))
+    first = run_with_transport(handler, lambda: cache.fetch(URL))
+    # Same page behind a Cloudflare challenge token: same cache entry
+    second = run_with_transport(handler, lambda: cache.fetch(URL + "?__cf_chl_rt_tk=abc"))
+
+    assert "if-none-match" not in sent[0]
+    assert sent[1]["if-none-match"] == '"v1"'
+    assert sent[1]["if-modified-since"] == "Sat, 17 Oct 2026 06:00:00 GMT"
+    assert (first.status_code, first.changed) == (200, True)
+    assert (second.status_code, second.changed, second.content) == (304, False, PAGE)
+
+
+def test_unchanged_bytes_are_not_reported_as_changed(run_with_transport, tmp_path):
+    bodies = [PAGE, PAGE, PAGE.replace(b"spots", b"waves")]
+
+    def handler(request):
+        return httpx.Response(200, content=bodies.pop(0))
+
+    cache = PageCache(str(tmp_path))
+    pages = [run_with_transport(handler, lambda: cache.fetch(URL)) for _ in range(3)]
+
+    assert [page.changed for page in pages] == [True, False, True]
+    assert cache.get(URL) == pages[2].content
+
+
+def test_missing_body_is_fetched_unconditionally(run_with_transport, tmp_path):
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers.get("If-None-Match"))
+        return httpx.Response(200, content=PAGE, headers={"ETag": '"v1"'})
+
+    cache = PageCache(str(tmp_path))
+    run_with_transport(handler, lambda: cache.fetch(URL))
+    for path in tmp_path.glob("*.body"):
+        path.unlink()
+    page = run_with_transport(handler, lambda: cache.fetch(URL))
+
+    assert sent == [None, None]
+    assert page.changed
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from progress_ledger import LedgerParseError, parse_progress_ledger
+
+NAMES = ["UserProxy", "SurflineAgent"]
+
+
+def ledger(**overrides):
+    entries = {
+        "is_request_satisfied": {"reason": "Not yet.", "answer": False},
+        "is_in_loop": {"reason": "No.", "answer": False},
+        "is_progress_being_made": {"reason": "Yes.", "answer": True},
+        "next_speaker": {"reason": "It has the data.", "answer": "SurflineAgent"},
+        "instruction_or_question": {"reason": "Next step.", "answer": "Get the forecast for Annaba."},
+    }
+    entries.update(overrides)
+    return {key: value for key, value in entries.items() if value is not None}
+
+
+def test_plain_json_is_parsed():
+    parsed = parse_progress_ledger(json.dumps(ledger()), NAMES)
+    assert parsed.next_speaker.answer == "SurflineAgent"
+    assert parsed.instruction_or_question.answer == "Get the forecast for Annaba."
+
+
+def test_code_fence_and_trailing_prose_are_ignored():
+    text = f"Here is the ledger:\n```json\n{json.dumps(ledger(), indent=2)}\n```\nLet me know if you need more."
+    assert parse_progress_ledger(text, NAMES).next_speaker.answer == "SurflineAgent"
+    text = f"{json.dumps(ledger())} I picked SurflineAgent because {{it has the data}}."
+    assert parse_progress_ledger(text, NAMES).is_progress_being_made.answer is True
+
+
+def test_bare_values_and_missing_reasons_are_wrapped():
+    parsed = parse_progress_ledger(
+        json.dumps(ledger(is_in_loop=False, next_speaker={"answer": "SurflineAgent"})), NAMES
+    )
+    assert parsed.is_in_loop.answer is False
+    assert parsed.next_speaker.reason == ""
+
+
+def test_one_missing_or_renamed_default_key_is_filled_in():
+    parsed = parse_progress_ledger(json.dumps(ledger(is_in_loop=None, in_loop={"reason": "", "answer": True})), NAMES)
+    assert parsed.is_in_loop.answer is False
+    assert parsed.is_progress_being_made.answer is True
+
+
+def test_missing_required_key_is_an_error():
+    with pytest.raises(LedgerParseError):
+        parse_progress_ledger(json.dumps(ledger(instruction_or_question=None)), NAMES)
+    with pytest.raises(LedgerParseError):
+        parse_progress_ledger(json.dumps(ledger(is_in_loop=None, is_progress_being_made=None)), NAMES)
+
+
+def test_next_speaker_is_matched_case_insensitively():
+    parsed = parse_progress_ledger(json.dumps(ledger(next_speaker={"reason": "", "answer": " surflineagent "})), NAMES)
+    assert parsed.next_speaker.answer == "SurflineAgent"
+
+
+def test_unknown_next_speaker_is_an_error_unless_the_request_is_satisfied():
+    unknown = {"reason": "", "answer": "WebSurfer"}
+    with pytest.raises(LedgerParseError):
+        parse_progress_ledger(json.dumps(ledger(next_speaker=unknown)), NAMES)
+    satisfied = {"reason": "Answered.", "answer": True}
+    parsed = parse_progress_ledger(json.dumps(ledger(next_speaker=unknown, is_request_satisfied=satisfied)), NAMES)
+    assert parsed.is_request_satisfied.answer is True
+
+
+def test_team_of_one_always_gets_its_participant():
+    parsed = parse_progress_ledger(json.dumps(ledger(next_speaker=None)), ["SurflineAgent"])
+    assert parsed.next_speaker.answer == "SurflineAgent"
+
+
+@pytest.mark.parametrize("text", ["", "No ledger today.", "```json\n{\"is_in_loop\": \n```", "[1, 2]"])
+def test_unparseable_replies_are_errors(text):
+    with pytest.raises(LedgerParseError):
+        parse_progress_ledger(text, NAMES)
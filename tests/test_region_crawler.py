@@ -0,0 +1,73 @@
+import asyncio
+from collections import Counter
+
+import httpx
+
+from region_crawler import crawl_regions
+from spot_registry import SpotRegistry
+
+
+def region_page(region, n):
+    # Spot ids unique across regions: the region name in hex, then the spot number
+    prefix = region.encode().hex()
+    links = "".join(f'<a href="/surf-report/{region}-{i}/{prefix}{i:04d}">spot</a>' for i in range(n))
+    return f"<html><body>{links}</body></html>"
+
+
+def crawl(tmp_path, handler, urls, **kwargs):
+    spots = SpotRegistry(str(tmp_path / "spots.json"))
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await crawl_regions(urls, spots, client=client, backoff=0.0, **kwargs)
+
+    try:
+        return asyncio.run(main()), spots
+    finally:
+        spots.close()
+
+
+def test_per_host_limit(tmp_path):
+    in_flight = Counter()
+    peak = Counter()
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, text=region_page(request.url.host[0] + request.url.path.strip("/"), 3))
+
+    urls = [f"https://{host}/region{i}" for host in ("a.example", "b.example") for i in range(10)]
+    (found, failed), spots = crawl(tmp_path, handler, urls, per_host=3)
+
+    assert failed == {}
+    assert len(found) == 20
+    assert len(spots) == 60
+    assert peak == {"a.example": 3, "b.example": 3}
+
+
+def test_errors_are_retried_then_reported(tmp_path):
+    attempts = Counter()
+
+    def handler(request):
+        path = request.url.path
+        attempts[path] += 1
+        if path == "/flaky" and attempts[path] == 1:
+            raise httpx.ConnectError("connection reset")
+        if path == "/down":
+            return httpx.Response(503)
+        if path == "/missing":
+            return httpx.Response(404)
+        if path == "/challenge":
+            return httpx.Response(403, text="<title>Just a moment...</title>")
+        return httpx.Response(200, text=region_page(path.strip("/"), 2))
+
+    urls = [f"https://surf.example/{path}" for path in ("ok", "flaky", "down", "missing", "challenge")]
+    (found, failed), spots = crawl(tmp_path, handler, urls, retries=2)
+
+    assert found == {"https://surf.example/ok": 2, "https://surf.example/flaky": 2}
+    assert set(failed) == {"https://surf.example/down", "https://surf.example/missing", "https://surf.example/challenge"}
+    assert attempts == {"/ok": 1, "/flaky": 2, "/down": 3, "/missing": 1, "/challenge": 3}
+    assert len(spots) == 4
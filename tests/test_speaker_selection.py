@@ -0,0 +1,59 @@
+from autogen_agentchat.messages import TextMessage
+
+from speaker_selection import (
+    RuleBasedSpeakerSelector,
+    SpeakerDecision,
+    agent_answered_rule,
+    user_and_agent_selector,
+)
+
+NAMES = ["UserProxy", "SurflineAgent"]
+
+
+def thread(*messages):
+    return [TextMessage(content=content, source=source) for source, content in messages]
+
+
+def always(speaker, confidence=1.0):
+    return lambda thread, names: SpeakerDecision(speaker, "Go on.", "Always.", confidence)
+
+
+def test_first_confident_rule_decides():
+    selector = RuleBasedSpeakerSelector([always("SurflineAgent", 0.5), always("UserProxy")])
+    assert selector.select([], NAMES).speaker == "UserProxy"
+
+
+def test_unsure_or_unknown_speakers_fall_back_to_the_ledger():
+    assert RuleBasedSpeakerSelector([always("SurflineAgent", 0.5)]).select([], NAMES) is None
+    assert RuleBasedSpeakerSelector([always("WebSurfer")]).select([], NAMES) is None
+
+
+def test_streak_abstains_once_after_max_consecutive():
+    selector = RuleBasedSpeakerSelector([always("SurflineAgent")], max_consecutive=2)
+    decisions = [selector.select([], NAMES) for _ in range(6)]
+    assert [decision is not None for decision in decisions] == [True, True, False, True, True, False]
+
+
+def test_reset_starts_a_new_streak():
+    selector = RuleBasedSpeakerSelector([always("SurflineAgent")], max_consecutive=2)
+    selector.select([], NAMES)
+    selector.select([], NAMES)
+    selector.reset()
+    assert selector.select([], NAMES) is not None
+
+
+def test_agent_answer_goes_back_to_the_user():
+    rule = agent_answered_rule("UserProxy", ["SurflineAgent"])
+    answered = thread(("Orchestrator", "Get the forecast."), ("SurflineAgent", "2-3 ft at Annaba."))
+    assert rule(answered, NAMES).speaker == "UserProxy"
+    # Not an answer to an orchestrator instruction, or an empty one
+    assert rule(thread(("UserProxy", "Hi"), ("SurflineAgent", "2-3 ft.")), NAMES) is None
+    assert rule(thread(("Orchestrator", "Get the forecast."), ("SurflineAgent", " ")), NAMES) is None
+
+
+def test_recognized_user_request_goes_straight_to_the_agent():
+    selector = user_and_agent_selector("UserProxy", "SurflineAgent", matcher=lambda text: "surf" in text)
+    decision = selector.select(thread(("UserProxy", "How is the surf at Annaba?")), NAMES)
+    assert decision.speaker == "SurflineAgent"
+    assert decision.instruction == "How is the surf at Annaba?"
+    assert selector.select(thread(("UserProxy", "Thanks!")), NAMES) is None
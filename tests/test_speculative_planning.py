@@ -0,0 +1,41 @@
+import pytest
+
+from speculative_planning import new_terms, plan_needs_check, revised_plan
+
+TASK = "What is the surf like at Annaba tomorrow?"
+PLAN = "- SurflineAgent: get the forecast for Annaba for tomorrow.\n- Report it to the user."
+FACTS = """1. GIVEN OR VERIFIED FACTS
+- The request is about Annaba, tomorrow.
+2. FACTS TO LOOK UP
+- The surf forecast for Annaba.
+3. FACTS TO DERIVE
+- None.
+4. EDUCATED GUESSES
+- Annaba is in Algeria."""
+
+
+@pytest.mark.parametrize("reply", ["KEEP", " keep. ", "`KEEP`", "**Keep**", ""])
+def test_keep_replies_keep_the_plan(reply):
+    assert revised_plan(reply) is None
+
+
+def test_other_replies_are_the_revised_plan():
+    assert revised_plan("  - Ask SurflineAgent for Oran.\n") == "- Ask SurflineAgent for Oran."
+    assert revised_plan("KEEP the first step, then ask for Oran.") is not None
+
+
+def test_new_terms_ignores_headings_list_numbers_and_known_words():
+    assert new_terms(FACTS, PLAN, TASK) == {"algeria"}
+
+
+def test_new_terms_finds_names_and_numbers():
+    facts = FACTS + "\n- The user is in Oran at 36.9N."
+    assert new_terms(facts, PLAN, TASK) == {"algeria", "oran", "36.9n"}
+
+
+def test_plan_is_only_checked_when_the_facts_add_enough():
+    assert not plan_needs_check(FACTS, PLAN, TASK)
+    facts = FACTS + "\n- The user is actually in Oran; spots: Les Andalouses, Ain El Turck."
+    assert plan_needs_check(facts, PLAN, TASK)
+    # Terms the previous fact sheet already had are not new
+    assert not plan_needs_check(facts, PLAN, TASK, "Oran, Les Andalouses, Ain El Turck")
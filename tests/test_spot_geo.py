@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from spot_geo import SpotGeoIndex, chord_to_km, haversine_km, km_to_chord
+
+
+def random_spots(seed, n=300):
+    rng = random.Random(seed)
+    spots = [
+        {"spotId": f"spot{i}", "lat": rng.uniform(-70, 70), "lon": rng.uniform(-180, 180)}
+        for i in range(n)
+    ]
+    # A cluster on both sides of the antimeridian, e.g. Fiji
+    spots += [
+        {"spotId": f"fiji{i}", "lat": -17 + rng.uniform(-2, 2), "lon": (179 + rng.uniform(0, 2)) % 360 - 180}
+        for i in range(40)
+    ]
+    return spots + [{"spotId": "unlocated"}]
+
+
+def brute_force(spots, lat, lon):
+    located = [spot for spot in spots if "lat" in spot]
+    return sorted((haversine_km(lat, lon, spot["lat"], spot["lon"]), spot["spotId"]) for spot in located)
+
+
+QUERIES = [(36.9, 7.77), (-17.5, 179.9), (-17.5, -179.9), (89.9, 0.0), (0.0, 0.0), (-33.9, 151.3)]
+
+
+@pytest.mark.parametrize("lat, lon", QUERIES)
+def test_nearest_matches_brute_force(lat, lon):
+    spots = random_spots(1)
+    index = SpotGeoIndex(spots)
+    expected = brute_force(spots, lat, lon)[:7]
+
+    nearest = index.nearest(lat, lon, k=7)
+
+    assert [spot.spot["spotId"] for spot in nearest] == [spot_id for _, spot_id in expected]
+    assert [spot.distance_km for spot in nearest] == pytest.approx([distance for distance, _ in expected])
+
+
+@pytest.mark.parametrize("lat, lon", QUERIES)
+def test_within_matches_brute_force(lat, lon):
+    spots = random_spots(2)
+    index = SpotGeoIndex(spots)
+    expected = [spot_id for distance, spot_id in brute_force(spots, lat, lon) if distance <= 1500]
+
+    assert [spot.spot["spotId"] for spot in index.within(lat, lon, 1500)] == expected
+
+
+def test_antimeridian_neighbours_are_found_across_it():
+    spots = [{"spotId": "east", "lat": -17.0, "lon": 179.9}, {"spotId": "far", "lat": -17.0, "lon": 170.0}]
+    index = SpotGeoIndex(spots)
+    nearest = index.nearest(-17.0, -179.9, k=1)[0]
+    assert nearest.spot["spotId"] == "east"
+    assert nearest.distance_km == pytest.approx(haversine_km(-17.0, -179.9, -17.0, 179.9))
+
+
+def test_small_and_empty_indexes():
+    assert SpotGeoIndex([]).nearest(0, 0) == []
+    assert SpotGeoIndex([{"spotId": "unlocated"}]).within(0, 0, 100) == []
+    assert len(SpotGeoIndex(random_spots(3)).nearest(0, 0, k=1000)) == 340
+    assert SpotGeoIndex(random_spots(3)).nearest(0, 0, k=0) == []
+
+
+def test_chord_and_km_round_trip():
+    for km in (0.0, 1.0, 500.0, 10000.0):
+        assert chord_to_km(km_to_chord(km)) == pytest.approx(km)
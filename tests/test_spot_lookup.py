@@ -0,0 +1,57 @@
+from spot_lookup import import_urls, parse_spot_urls
+from spot_registry import JOURNAL_SUFFIX, SpotRegistry
+
+ANNABA = "https://www.surfline.com/surf-report/annaba/584204214e65fad6a7709ce5"
+
+
+def test_parse_spot_urls_reports_rejected_positions():
+    parsed = parse_spot_urls([ANNABA, "https://example.com/annaba", "/surf-report/oran/5842abc", "/surf-report/"])
+
+    assert parsed.names == ["annaba", "oran"]
+    assert parsed.spot_ids == ["584204214e65fad6a7709ce5", "5842abc"]
+    assert parsed.urls == [ANNABA, "/surf-report/oran/5842abc"]
+    assert parsed.rejected == [(1, "https://example.com/annaba"), (3, "/surf-report/")]
+
+
+def test_rejected_urls_keep_their_line_numbers(tmp_path):
+    spots = SpotRegistry(str(tmp_path / "spots.json"))
+    lines = ["# region export\n", "\n", f"{ANNABA}\n", "not a url\n", "   \n", "/surf-report/oran\n"]
+
+    added, duplicates, errors = import_urls(lines, spots)
+
+    assert (added, duplicates) == (1, 0)
+    assert [(line_number, url) for line_number, url, _ in errors] == [(4, "not a url"), (6, "/surf-report/oran")]
+
+
+def test_duplicates_within_the_batch_and_the_registry_are_skipped(tmp_path):
+    spots = SpotRegistry(str(tmp_path / "spots.json"))
+    spots.add({"spotId": "5842abc", "name": "oran", "url": "https://www.surfline.com/surf-report/oran/5842abc"})
+    lines = [
+        ANNABA,
+        "https://www.surfline.com/surf-report/annaba/584204214E65FAD6A7709CE5?view=cam",
+        "/surf-report/annaba/584204214e65fad6a7709ce5/",
+        "/surf-report/oran/5842ABC",
+        "http://surfline.com/surf-report/oran/5842abc",
+    ]
+
+    added, duplicates, errors = import_urls(lines, spots)
+
+    assert (added, duplicates, errors) == (1, 4, [])
+    assert spots.get("584204214E65FAD6A7709CE5")["url"] == ANNABA
+
+
+def test_new_spots_are_committed_with_one_journal_write(tmp_path, monkeypatch):
+    filename = str(tmp_path / "spots.json")
+    spots = SpotRegistry(filename)
+    writes = []
+    append = SpotRegistry._append
+    monkeypatch.setattr(SpotRegistry, "_append", lambda self, batch: (writes.append(len(batch)), append(self, batch)))
+
+    added, _, _ = import_urls([ANNABA, "/surf-report/oran/5842abc", "/surf-report/bejaia/5842def"], spots)
+    spots.close()
+
+    assert added == 3
+    assert writes == [3]
+    with open(filename + JOURNAL_SUFFIX) as f:
+        assert len(f.read().splitlines()) == 1
+    assert [spot["spotId"] for spot in SpotRegistry(filename)] == ["584204214e65fad6a7709ce5", "5842abc", "5842def"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spot_ranking import forecast_arrays, rank_spots, score_forecasts, to_scoring_units
+
+HOURS = pd.date_range("2026-10-18", periods=4, freq="h", tz="UTC")
+
+
+def forecast(spot_id, surf_max, wind_direction=0.0, wind_speed=0.0):
+    return pd.DataFrame({
+        "spotId": spot_id,
+        "timestamp": HOURS[: len(surf_max)],
+        "surf_max": surf_max,
+        "swell_period": 14.0,
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+    })
+
+
+def test_forecast_arrays_pivots_spots_by_hour():
+    arrays = forecast_arrays(
+        pd.concat([forecast("a", [1, 2, 3, 4]), forecast("b", [5, 6])]), [{"spotId": "b", "orientation": 90}]
+    )
+
+    assert list(arrays.spot_ids) == ["a", "b"]
+    assert arrays.wave_height.shape == (2, 4)
+    assert np.isnan(arrays.wave_height[1, 2:]).all()
+    assert np.isnan(arrays.tide).all()
+    assert np.isnan(arrays.orientation[0]) and arrays.orientation[1] == 90
+
+
+def test_wind_term_needs_an_orientation():
+    # A beach facing west (270): wind from the east (90) is offshore, from the west onshore
+    args = ([[4.0], [4.0]], [[14.0], [14.0]], [[20.0], [20.0]], [[90.0], [270.0]])
+    offshore, onshore = score_forecasts(*args, orientation=[270.0, 270.0])[:, 0]
+    assert offshore == pytest.approx(1.0)
+    assert onshore < 0.5
+    unknown = score_forecasts(*args, orientation=[np.nan, np.nan])[:, 0]
+    assert unknown[0] == unknown[1] == score_forecasts(*args)[0, 0]
+
+
+def test_rank_spots_orders_by_best_hour_within_the_window():
+    arrays = forecast_arrays(
+        pd.concat([forecast("small", [1, 2, 2, 2]), forecast("good", [0, 4, 1, 1]), forecast("late", [0, 0, 0, 5])])
+    )
+
+    ranked = rank_spots(arrays, top_n=2)
+    assert [spot.spot_id for spot in ranked] == ["good", "late"]
+    assert ranked[0].timestamp == HOURS[1]
+
+    early = rank_spots(arrays, end=HOURS[3])
+    assert [spot.spot_id for spot in early] == ["good", "small", "late"]
+    assert early[-1].score == 0
+    assert rank_spots(arrays, start=HOURS[3] + pd.Timedelta(hours=1)) == []
+
+
+def test_offshore_spot_outranks_onshore_spot():
+    spots = [{"spotId": "west", "orientation": 270}, {"spotId": "east", "orientation": 90}]
+    df = pd.concat([forecast("west", [4, 4], 90.0, 20.0), forecast("east", [4, 4], 90.0, 20.0)])
+
+    assert [spot.spot_id for spot in rank_spots(forecast_arrays(df, spots))] == ["west", "east"]
+
+
+def test_to_scoring_units_converts_to_feet_and_knots():
+    height, speed = to_scoring_units([1.0], [10.0], "M", "KPH")
+    assert height[0] == pytest.approx(3.28084)
+    assert speed[0] == pytest.approx(5.39957)
+    with pytest.raises(ValueError):
+        to_scoring_units([1.0], [10.0], "furlongs", "kts")
@@ -0,0 +1,80 @@
+import json
+import os
+
+from spot_registry import COMPACTING_SUFFIX, JOURNAL_SUFFIX, SpotRegistry, canonical_url
+
+
+def test_canonical_url_normalizes_host_query_and_slash():
+    assert canonical_url("http://SURFLINE.com/surf-report/annaba/584204214e65fad6a7709ce5/?view=cam") == (
+        "https://www.surfline.com/surf-report/annaba/584204214e65fad6a7709ce5"
+    )
+
+
+def test_canonical_url_keeps_path_case():
+    assert canonical_url("/surf-report/Annaba/584204214e65fad6a7709ce5") != canonical_url(
+        "/surf-report/annaba/584204214e65fad6a7709ce5"
+    )
+
+
+def test_journal_is_replayed_on_load(tmp_path):
+    filename = str(tmp_path / "spots.json")
+    registry = SpotRegistry(filename)
+    registry.add({"spotId": "A1", "url": "/surf-report/a/a1"})
+    registry.update_many([{"spotId": "b1", "name": "B"}, {"spotId": "a1", "name": "A", "url": "/surf-report/a/a1"}])
+    registry.close()
+
+    reloaded = SpotRegistry(filename)
+    assert [spot["spotId"] for spot in reloaded] == ["a1", "b1"]
+    assert reloaded.get("a1")["name"] == "A"
+    assert reloaded.find_url("https://surfline.com/surf-report/a/a1/")["spotId"] == "a1"
+
+
+def test_torn_last_journal_line_is_skipped(tmp_path):
+    filename = str(tmp_path / "spots.json")
+    registry = SpotRegistry(filename)
+    registry.add_many([{"spotId": "a1"}, {"spotId": "b1"}])
+    registry.close()
+    with open(filename + JOURNAL_SUFFIX, "a") as f:
+        f.write('{"spotId": "c1", "na')
+
+    reloaded = SpotRegistry(filename)
+    assert [spot["spotId"] for spot in reloaded] == ["a1", "b1"]
+    reloaded.add({"spotId": "d1"})
+    reloaded.close()
+    assert [spot["spotId"] for spot in SpotRegistry(filename)] == ["a1", "b1", "d1"]
+
+
+def test_load_finishes_an_interrupted_compaction(tmp_path):
+    filename = str(tmp_path / "spots.json")
+    journal = filename + JOURNAL_SUFFIX
+    # Crashed after rotating the journal holding a1, then b1 was journaled after a restart
+    with open(journal + COMPACTING_SUFFIX, "w") as f:
+        f.write(json.dumps({"spotId": "a1"}) + "\n")
+    with open(journal, "w") as f:
+        f.write(json.dumps({"spotId": "b1"}) + "\n")
+
+    registry = SpotRegistry(filename)
+    assert not os.path.exists(journal + COMPACTING_SUFFIX)
+    with open(filename) as f:
+        assert [spot["spotId"] for spot in json.load(f)] == ["a1", "b1"]
+    registry.add({"spotId": "c1"})
+    registry.compact()
+    registry.close()
+    assert [spot["spotId"] for spot in SpotRegistry(filename)] == ["a1", "b1", "c1"]
+
+
+def test_failed_compaction_keeps_its_records_through_the_next_one(tmp_path, monkeypatch):
+    filename = str(tmp_path / "spots.json")
+    write_snapshot = SpotRegistry._write_snapshot
+    monkeypatch.setattr(SpotRegistry, "_write_snapshot", lambda self, snapshot: None)
+    registry = SpotRegistry(filename)
+    registry.add({"spotId": "a1"})
+    registry.compact()
+    with open(filename + JOURNAL_SUFFIX + COMPACTING_SUFFIX, "a") as f:
+        f.write('{"spotId": "torn"')
+    registry.add({"spotId": "b1"})
+    registry.compact()
+    registry.close()
+
+    monkeypatch.setattr(SpotRegistry, "_write_snapshot", write_snapshot)
+    assert [spot["spotId"] for spot in SpotRegistry(filename)] == ["a1", "b1"]
@@ -0,0 +1,61 @@
+import random
+
+import httpx
+
+from spots import SpotLinkScanner, extract_spot_links, fetch_spot_links, iter_spot_links
+
+REGION_URL = "https://www.surfline.com/surf-reports-forecasts-cams/algeria/2589581"
+
+
+def region_page(n=200, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        spot_id = "".join(rng.choice("0123456789abcdef") for _ in range(24))
+        href = f"/surf-report/spot-{i}/{rng.randint(1, 9)}{spot_id}"
+        if i % 7 == 0:
+            href += "?view=cam"
+        quote = "'" if i % 5 == 0 else '"'
+        rows.append(f"<li><a class=\"spot\" href={quote}{href}{quote}>Spot {i}</a></li>")
+        rows.append(f'<a href="/surf-reports-forecasts-cams/region-{i}/{i}">Region {i}</a>')
+    rows.append('<a href="/surf-report/no-id/">Not a spot</a>')
+    return ("<html><body><ul>" + "\n".join(rows) + "</ul></body></html>").encode("utf-8")
+
+
+def chunked(data, seed):
+    rng = random.Random(seed)
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, 2, 7, 64, 500, 4096])
+        yield data[position : position + size]
+        position += size
+
+
+def test_scanner_matches_beautifulsoup_for_any_chunking():
+    page = region_page()
+    expected = extract_spot_links(page.decode("utf-8"))
+
+    assert len(expected) == 200
+    assert list(iter_spot_links([page])) == expected
+    for seed in range(20):
+        assert list(iter_spot_links(chunked(page, seed))) == expected
+
+
+def test_link_split_across_chunks_is_reported_once_complete():
+    scanner = SpotLinkScanner()
+    assert scanner.feed(b'<a href="/surf-report/annaba/584204214e65fad6a77') == []
+    assert scanner.feed(b'09ce5">Annaba</a>') == [
+        "https://www.surfline.com/surf-report/annaba/584204214e65fad6a7709ce5"
+    ]
+    assert scanner.feed(b"</body>") == []
+
+
+def test_fetch_spot_links_streams_the_page(run_with_transport):
+    page = region_page(seed=1)
+
+    def handler(request):
+        return httpx.Response(200, content=page, headers={"Content-Type": "text/html"})
+
+    links = run_with_transport(handler, lambda: fetch_spot_links(REGION_URL))
+
+    assert links == extract_spot_links(page.decode("utf-8"))
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
+
+from forecast_cache import ForecastCache
+from forecast_digest import local_date
+from spot_resolver import SpotResolver
+from surfline_agent import SurflineAgent, SurflineQueryTool
+from surfline_http import DEFAULT_RETRIES
+
+SPOTS = [{"spotId": "annaba", "name": "Annaba", "lat": 36.9, "lon": 7.77, "utcOffset": 1}]
+
+
+def agent_with_spots(monkeypatch):
+    # No saved token or credentials from the environment
+    monkeypatch.setattr("surfline_agent.default_auth", lambda: None)
+    agent = SurflineAgent("SurflineAgent")
+    agent.tools[0] = SurflineQueryTool(cache=ForecastCache(), resolver=SpotResolver(SPOTS))
+    return agent
+
+
+def test_non_json_reply_becomes_an_error_message(run_with_transport, monkeypatch):
+    def handler(request):
+        return httpx.Response(200, text="<html>Just a moment...</html>", headers={"Content-Type": "text/html"})
+
+    agent = agent_with_spots(monkeypatch)
+    message = TextMessage(content="What's the surf like at Annaba?", source="user")
+    response = run_with_transport(handler, lambda: agent.on_messages([message], CancellationToken()))
+
+    assert response.chat_message.content.startswith("Could not fetch the forecast for Annaba")
+
+
+def test_conditions_for_tomorrow_report_only_tomorrow(run_with_transport, monkeypatch):
+    midnight = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    hours = [int((midnight + timedelta(hours=h)).timestamp()) for h in range(-24, 72)]
+    payload = {
+        "associated": {"utcOffset": 10, "runInitializationTimestamp": hours[0]},
+        "data": {"wave": [{"timestamp": t, "surf": {"min": 1, "max": 2}} for t in hours]},
+    }
+
+    def handler(request):
+        return httpx.Response(200, json=payload)
+
+    agent = agent_with_spots(monkeypatch)
+    message = TextMessage(content="What's the surf at Annaba tomorrow?", source="user")
+    response = run_with_transport(handler, lambda: agent.on_messages([message], CancellationToken()))
+
+    lines = response.chat_message.content.splitlines()
+    assert len(lines) == 2
+    assert lines[1].startswith(f"- {local_date(10, 1).isoformat()}:")
+
+
+def test_failed_fetch_is_reported_without_a_second_retry_cycle(run_with_transport, monkeypatch):
+    monkeypatch.setattr("surfline_http.backoff_delay", lambda number, backoff: 0)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    agent = agent_with_spots(monkeypatch)
+    message = TextMessage(content="What's the surf at Annaba tomorrow?", source="user")
+    response = run_with_transport(handler, lambda: agent.on_messages([message], CancellationToken()))
+
+    assert response.chat_message.content.startswith("Could not fetch the forecast for Annaba")
+    assert len(requests) == DEFAULT_RETRIES + 1
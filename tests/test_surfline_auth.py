@@ -0,0 +1,48 @@
+import asyncio
+import itertools
+import time
+
+import httpx
+
+from surfline_auth import TOKEN_URL, SurflineAuth, Token
+from surfline_fetch import fetch_forecast, fetch_forecasts
+
+
+def test_late_401s_for_a_replaced_token_log_in_once(run_with_transport):
+    auth = SurflineAuth(token_file=None)
+    auth._token = Token("stale", time.time() + 3600, "refresh")
+    issued = itertools.count(1)
+    arrivals = itertools.count()
+
+    async def handler(request):
+        if str(request.url) == TOKEN_URL:
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"access_token": f"fresh-{next(issued)}", "expires_in": 3600})
+        if request.headers["Authorization"] == "Bearer stale":
+            # The rejections of the burst's stale-token requests arrive spread out in time
+            await asyncio.sleep(0.005 * next(arrivals))
+            return httpx.Response(401)
+        return httpx.Response(200, json={"data": {}})
+
+    async def burst():
+        return await asyncio.gather(*(fetch_forecast(None, f"spot{i}", auth=auth, retries=0) for i in range(20)))
+
+    results = run_with_transport(handler, burst)
+
+    assert results == [{"data": {}}] * 20
+    assert auth.logins == 1
+    assert auth.token.access_token == "fresh-1"
+
+
+def test_expired_token_without_credentials_fails_the_spot(run_with_transport):
+    auth = SurflineAuth(email="", password="", token_file=None)
+    auth._token = Token("expired", time.time() - 60)
+
+    def handler(request):
+        return httpx.Response(200, json={"data": {}})
+
+    df, failed = run_with_transport(handler, lambda: fetch_forecasts(["a", "b"], auth=auth, retries=0))
+
+    assert df.empty
+    assert set(failed) == {"a", "b"}
+    assert "credentials" in failed["a"]
@@ -0,0 +1,109 @@
+import threading
+
+import httpx
+import pytest
+
+from spot_registry import SpotRegistry
+from surfline_fetch import fetch_forecasts, forecast_orientation, locate_spots, refresh_forecasts
+
+PAYLOAD = {
+    "associated": {"runInitializationTimestamp": 1760745600},
+    "data": {"wave": [{"timestamp": 1760745600, "surf": {"min": 1, "max": 2}}]},
+}
+
+
+def test_non_json_reply_fails_only_its_spot(run_with_transport):
+    def handler(request):
+        if request.url.params["spotId"] == "blocked":
+            return httpx.Response(200, text="<html>Just a moment...</html>", headers={"Content-Type": "text/html"})
+        return httpx.Response(200, json=PAYLOAD)
+
+    df, failed = run_with_transport(handler, lambda: fetch_forecasts(["a", "blocked", "b"], retries=0))
+
+    assert sorted(df["spotId"]) == ["a", "b"]
+    assert list(failed) == ["blocked"]
+
+
+class ThreadRecordingStore:
+    def __init__(self, latest=None):
+        self.latest = latest
+        self.threads = []
+
+    def latest_run(self, spot_id):
+        return self.latest
+
+    def merge(self, spot_id, df, run):
+        self.threads.append(threading.get_ident())
+        return len(df)
+
+
+def test_store_merges_run_off_the_event_loop(run_with_transport):
+    def handler(request):
+        return httpx.Response(200, json=PAYLOAD)
+
+    store = ThreadRecordingStore()
+    df, failed = run_with_transport(handler, lambda: fetch_forecasts(["a", "b"], retries=0, store=store))
+
+    assert not failed
+    assert len(store.threads) == 2
+    assert threading.get_ident() not in store.threads
+
+
+def test_probe_without_a_run_fails_the_spot(run_with_transport):
+    def handler(request):
+        if request.url.params["days"] == "1":
+            return httpx.Response(200, json={"associated": {}, "data": PAYLOAD["data"]})
+        return httpx.Response(200, json=PAYLOAD)
+
+    store = ThreadRecordingStore(latest=1760745600 - 6 * 3600)
+    refreshed, up_to_date, failed = run_with_transport(
+        handler, lambda: refresh_forecasts(["a"], store, retries=0, now=1760745600 + 86400)
+    )
+
+    assert (refreshed, up_to_date) == ({}, [])
+    assert list(failed) == ["a"]
+
+
+def test_refresh_merges_newer_runs_off_the_event_loop(run_with_transport):
+    def handler(request):
+        return httpx.Response(200, json=PAYLOAD)
+
+    store = ThreadRecordingStore(latest=1760745600 - 6 * 3600)
+    refreshed, up_to_date, failed = run_with_transport(
+        handler, lambda: refresh_forecasts(["a"], store, retries=0, now=1760745600 + 86400)
+    )
+
+    assert refreshed == {"a": 1}
+    assert threading.get_ident() not in store.threads
+
+
+def wind(*entries):
+    return {"data": {"wind": [{"direction": direction, "directionType": kind} for direction, kind in entries]}}
+
+
+def test_forecast_orientation_from_offshore_and_onshore_winds():
+    # A beach facing west: offshore wind from around 90, onshore from around 270
+    payload = wind((80, "Offshore"), (100, "Offshore"), (270, "Onshore"), (0, "Cross-shore"))
+    assert forecast_orientation(payload) == pytest.approx(270.0)
+    assert forecast_orientation(wind((350, "Onshore"), (10, "Onshore"))) in (0.0, 360.0)
+    assert forecast_orientation(wind((0, "Cross-shore"))) is None
+
+
+def test_locate_spots_adds_location_and_orientation(run_with_transport, tmp_path):
+    def handler(request):
+        if request.url.params["spotId"] == "inland":
+            return httpx.Response(200, json={"associated": {}, "data": {}})
+        payload = wind((90, "Offshore"), (0, "Cross-shore"))
+        if request.url.params["spotId"] == "calm":
+            payload = wind((0, "Cross-shore"))
+        return httpx.Response(200, json={"associated": {"location": {"lat": 36.9, "lon": 7.8}}, **payload})
+
+    spots = SpotRegistry(str(tmp_path / "spots.json"))
+    spots.add_many([{"spotId": "west"}, {"spotId": "calm"}, {"spotId": "inland"}])
+    located, failed = run_with_transport(handler, lambda: locate_spots(spots, retries=0))
+
+    assert located == 2
+    assert list(failed) == ["inland"]
+    assert spots.get("west")["orientation"] == 270.0
+    assert spots.get("calm")["orientation"] is None
+    assert (spots.get("calm")["lat"], spots.get("calm")["lon"]) == (36.9, 7.8)
@@ -0,0 +1,13 @@
+from surfline_intents import INTENT_CONDITIONS, parse_intent
+
+
+def test_conditions_with_day():
+    intent = parse_intent("What's the surf at Annaba tomorrow?")
+
+    assert intent.kind == INTENT_CONDITIONS
+    assert intent.place == "Annaba"
+    assert intent.day_offset == 1
+
+
+def test_stop_word_is_not_a_place():
+    assert parse_intent("How is the swell in general?") is None